@@ -0,0 +1,225 @@
+"""
+Elitist external Pareto archive, updated incrementally across generations.
+
+The archive keeps a copy of every non-dominated individual found during the run,
+with the objective values it had when it was archived, so the best schedules
+found mid-run are never lost and the final report needs no re-evaluation.
+
+The members are kept sorted by the first objective, so a dominance query only
+scans the members on one side of a binary search: the ones that can dominate a
+candidate (first objective not greater) or that it can dominate (not lower).
+The size can be bounded by crowding (the most crowded member is dropped) or by
+epsilon-dominance (at most one member per epsilon box).
+
+A genotype is archived at most once: with a scenario bank refreshed every
+generation, the surviving parents are re-evaluated with other objective values,
+and the archive keeps the values of the first time a genotype was archived.
+"""
+
+import typing as tp
+import numpy as np
+import numpy.typing as npt
+
+# Local imports
+from model.engine import NUM_OBJECTIVES
+from model.selection import crowding_distances
+
+
+class ParetoArchive:
+    """Bounded archive of the non-dominated individuals (minimization)."""
+
+    max_size: tp.Optional[int]
+    epsilon: tp.Optional[float]
+    _members: tp.List[tp.Any]
+    _objectives: np.ndarray
+    # Genotype key of each member (None if not given) and the set of them
+    _keys: tp.List[tp.Optional[tp.Hashable]]
+    _genotypes: tp.Set[tp.Hashable]
+    __slots__ = (
+        "max_size",
+        "epsilon",
+        "_members",
+        "_objectives",
+        "_keys",
+        "_genotypes",
+    )
+
+    def __init__(
+        self, max_size: tp.Optional[int] = None, epsilon: tp.Optional[float] = None
+    ):
+        """
+        Args:
+            max_size: Maximum number of members. Once exceeded, the member with
+                the lowest crowding distance is dropped.
+            epsilon: If provided, the dominance is checked over boxes of this size
+                (epsilon-dominance), keeping at most one member per box.
+        """
+        if max_size is not None and max_size <= 0:
+            raise ValueError("The size of the archive must be greater than 0")
+        if epsilon is not None and epsilon <= 0:
+            raise ValueError("The epsilon of the archive must be greater than 0")
+        self.max_size = max_size
+        self.epsilon = epsilon
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> tp.Iterator[tp.Tuple[tp.Any, tp.Tuple[float, ...]]]:
+        """Iterate over the (member, objective values) pairs."""
+        for member, objectives in zip(self._members, self._objectives.tolist()):
+            yield member, tuple(objectives)
+
+    @property
+    def members(self) -> tp.List[tp.Any]:
+        """The archived individuals, sorted by their first objective."""
+        return list(self._members)
+
+    @property
+    def objectives(self) -> np.ndarray:
+        """The stored objective values of the members, one row per member."""
+        return self._objectives.copy()
+
+    def clear(self) -> None:
+        """Remove all the members."""
+        self._members = []
+        self._objectives = np.empty((0, NUM_OBJECTIVES))
+        self._keys = []
+        self._genotypes = set()
+
+    def best(self) -> tp.Tuple[tp.Any, tp.Tuple[float, ...]]:
+        """The member with the lexicographically smallest objective values."""
+        if not self._members:
+            raise RuntimeError("The archive is empty")
+        position = int(np.lexsort(self._objectives.T[::-1])[0])
+        return self._members[position], tuple(self._objectives[position].tolist())
+
+    def is_dominated(self, objectives: npt.ArrayLike) -> bool:
+        """Whether a member weakly dominates the objective values (no better
+        in any objective), in the boxes of the epsilon-dominance if enabled.
+        """
+        values = self.__keys(np.asarray(objectives, dtype=np.float64))
+        # Only the members with a first objective not greater can dominate it
+        end = int(
+            np.searchsorted(self.__keys(self._objectives[:, 0]), values[0], "right")
+        )
+        candidates = self.__keys(self._objectives[:end])
+        return bool((candidates <= values).all(axis=1).any())
+
+    def add(
+        self,
+        individual: tp.Any,
+        objectives: npt.ArrayLike,
+        clone: tp.Optional[tp.Callable[[tp.Any], tp.Any]] = None,
+        key: tp.Optional[tp.Hashable] = None,
+    ) -> bool:
+        """Try to archive an individual.
+
+        Args:
+            individual: The individual.
+            objectives: Its objective values.
+            clone: Function to copy the individual if it is archived (e.g.
+                `toolbox.clone`), so later changes do not reach the archive.
+            key: The genotype of the individual. If a member has the same one,
+                the individual is not archived again.
+
+        Returns:
+            bool: Whether the individual was archived.
+        """
+        if key is not None and key in self._genotypes:
+            return False
+        values = np.asarray(objectives, dtype=np.float64)
+        if self.epsilon is not None:
+            if not self.__replace_in_box(values):
+                return False
+        elif self.is_dominated(values):
+            return False
+        # Remove the members that the new one dominates: only the ones with a
+        # first objective not lower can be dominated.
+        keys = self.__keys(values)
+        start = int(
+            np.searchsorted(self.__keys(self._objectives[:, 0]), keys[0], "left")
+        )
+        dominated = (keys <= self.__keys(self._objectives[start:])).all(axis=1)
+        if dominated.any():
+            self.__remove((start + np.flatnonzero(dominated)).tolist())
+        # Insert the new member keeping the order by the first objective
+        position = int(np.searchsorted(self._objectives[:, 0], values[0], "right"))
+        if clone is not None:
+            individual = clone(individual)
+        self._members.insert(position, individual)
+        self._objectives = np.insert(self._objectives, position, values, axis=0)
+        self._keys.insert(position, key)
+        if key is not None:
+            self._genotypes.add(key)
+        if self.max_size is not None and len(self._members) > self.max_size:
+            self.__truncate()
+        return True
+
+    def update(
+        self,
+        individuals: tp.Iterable[tp.Any],
+        clone: tp.Callable[[tp.Any], tp.Any],
+        key: tp.Optional[tp.Callable[[tp.Any], tp.Hashable]] = None,
+    ) -> int:
+        """Archive the non-dominated individuals of a generation.
+
+        Args:
+            individuals: The evaluated individuals.
+            clone: Function to copy the accepted individuals (e.g. `toolbox.clone`).
+            key: Function to get the genotype of an individual, to archive each
+                genotype once.
+
+        Returns:
+            int: The number of archived individuals.
+        """
+        return sum(
+            self.add(ind, ind.objective_value, clone, None if key is None else key(ind))
+            for ind in individuals
+        )
+
+    def __remove(self, positions: tp.Sequence[int]) -> None:
+        """Remove the members at the given positions."""
+        removed = set(positions)
+        for position in removed:
+            self._genotypes.discard(self._keys[position])
+        self._members = [
+            m for position, m in enumerate(self._members) if position not in removed
+        ]
+        self._keys = [
+            k for position, k in enumerate(self._keys) if position not in removed
+        ]
+        self._objectives = np.delete(self._objectives, list(removed), axis=0)
+
+    def __keys(self, values: np.ndarray) -> np.ndarray:
+        """Values used for the dominance: the objectives or their epsilon boxes."""
+        if self.epsilon is None:
+            return values
+        return np.floor(values / self.epsilon)
+
+    def __replace_in_box(self, values: np.ndarray) -> bool:
+        """Epsilon-dominance check. A member in the same box is replaced only if
+        the new individual dominates it or is closer to the corner of the box.
+
+        Returns:
+            bool: Whether the new individual can be archived.
+        """
+        box = self.__keys(values)
+        boxes = self.__keys(self._objectives)
+        same = (boxes == box).all(axis=1)
+        if ((boxes <= box).all(axis=1) & ~same).any():
+            return False
+        if same.any():
+            position = int(np.flatnonzero(same)[0])
+            current = self._objectives[position]
+            corner = box * self.epsilon  # type: ignore
+            dominates = (values <= current).all() and (values < current).any()
+            closer = np.linalg.norm(values - corner) < np.linalg.norm(current - corner)
+            if not (dominates or closer) or (current <= values).all():
+                return False
+            self.__remove([position])
+        return True
+
+    def __truncate(self) -> None:
+        """Drop the most crowded member."""
+        self.__remove([int(np.argmin(crowding_distances(self._objectives)))])
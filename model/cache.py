@@ -0,0 +1,92 @@
+"""
+Memo cache of the deterministic stage of the evaluation, keyed by genotype.
+
+NSGA-II often re-creates identical individuals (e.g. crossover between clones
+or mutations without an effective change). The cache stores the
+`EvaluationPlan` of each genotype, so those individuals only go through the
+stochastic stage. The genotype is encoded as the bytes of the assignment ids of
+the catalogue followed by the expected enrollments, and the least recently used
+plans are evicted once the cache is full.
+
+The compact individuals already hold these ids, so their keys cost a copy of
+two small arrays. The list individuals look up the id of each gene in the
+catalogue, which costs about as much as the plan, so the Solver only enables
+the cache by default for the compact representation.
+"""
+
+import typing as tp
+from collections import OrderedDict
+
+# Local imports
+from model.catalogue import AssignmentCatalogue
+from model.chromosome import Chromosome
+from model.engine import EvaluationPlan
+
+GenotypeKey = bytes
+
+
+def genotype_key(individual: Chromosome, catalogue: AssignmentCatalogue) -> GenotypeKey:
+    """Index-encoded genotype of an individual: the assignment ids followed by
+    the expected enrollments.
+    """
+    genes, enrollments = individual.to_ids(catalogue)
+    return genes.tobytes() + enrollments.tobytes()
+
+
+class PlanCache:
+    """Bounded LRU cache of evaluation plans, with hit and miss counters."""
+
+    maxsize: int
+    hits: int
+    misses: int
+    _plans: "OrderedDict[GenotypeKey, EvaluationPlan]"
+    __slots__ = ("maxsize", "hits", "misses", "_plans")
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Args:
+            maxsize: Maximum number of plans stored.
+        """
+        if maxsize <= 0:
+            raise ValueError("The size of the cache must be greater than 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def __contains__(self, key: GenotypeKey) -> bool:
+        return key in self._plans
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the lookups that were found in the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: GenotypeKey) -> tp.Optional[EvaluationPlan]:
+        """Look up the plan of a genotype, counting the hit or the miss."""
+        plan = self._plans.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._plans.move_to_end(key)
+        return plan
+
+    def put(self, key: GenotypeKey, plan: EvaluationPlan) -> None:
+        """Store the plan of a genotype, evicting the least recently used one."""
+        # The plans are shared between individuals, so they must not change
+        plan.weights.flags.writeable = False
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        if len(self._plans) > self.maxsize:
+            self._plans.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all the plans and reset the counters."""
+        self._plans.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,102 @@
+"""
+Indexed catalogue of the valid assignments.
+
+Each assignment receives an integer id (its position in the catalogue), and the
+ids are grouped in arrays per subject. This way, the individual generator, the
+variation operators and the local search can look up the alternatives for a
+gene in O(1).
+"""
+
+import typing as tp
+import numpy as np
+
+# Local imports
+from model.engine import EncodedChromosome, encode
+from model.types import Assignment
+
+_EMPTY = np.empty(0, dtype=np.int32)
+_EMPTY.flags.writeable = False
+
+
+def _group(keys: tp.Iterable[tp.Hashable]) -> tp.Dict[tp.Any, np.ndarray]:
+    """Group the positions of the keys in read-only arrays."""
+    groups: tp.Dict[tp.Any, tp.List[int]] = {}
+    for idx, key in enumerate(keys):
+        groups.setdefault(key, []).append(idx)
+    index = {}
+    for key, ids in groups.items():
+        array = np.array(ids, dtype=np.int32)
+        array.flags.writeable = False
+        index[key] = array
+    return index
+
+
+class AssignmentCatalogue:
+    """Immutable catalogue of valid assignments.
+
+    The assignments keep the order in which they were given, so sampling from
+    the catalogue is deterministic for a given seed. The lookups ignore the
+    `expected_enrollment` of the assignments.
+    """
+
+    _assignments: tp.Tuple[Assignment, ...]
+    _index: tp.Dict[tuple, int]
+    _by_subject: tp.Dict[str, np.ndarray]
+    _encoding: tp.Optional[EncodedChromosome]
+    __slots__ = (
+        "_assignments",
+        "_index",
+        "_by_subject",
+        "_encoding",
+    )
+
+    def __init__(self, assignments: tp.Iterable[Assignment] = ()):
+        # Remove the duplicates while keeping the order
+        index: tp.Dict[tuple, int] = {}
+        unique = []
+        for asg in assignments:
+            key = asg[:4]
+            if key not in index:
+                index[key] = len(unique)
+                unique.append(asg)
+        self._assignments = tuple(unique)
+        self._index = index
+        # Build the index of the alternatives of each subject
+        self._by_subject = _group(asg.subject.name for asg in unique)
+        self._encoding = None
+
+    def __len__(self) -> int:
+        return len(self._assignments)
+
+    def __iter__(self) -> tp.Iterator[Assignment]:
+        return iter(self._assignments)
+
+    def __getitem__(self, assignment_id: int) -> Assignment:
+        """Get the assignment with the given id."""
+        return self._assignments[assignment_id]
+
+    @property
+    def encoding(self) -> EncodedChromosome:
+        """All the assignments encoded as index arrays, so a chromosome given as
+        assignment ids is encoded by indexing these arrays.
+        """
+        if self._encoding is None:
+            self._encoding = encode(self._assignments)
+        return self._encoding
+
+    def __contains__(self, assignment: object) -> bool:
+        if not isinstance(assignment, Assignment):
+            return False
+        return assignment[:4] in self._index
+
+    def index(self, assignment: Assignment) -> int:
+        """Get the id of an assignment, ignoring its expected enrollment.
+
+        Raises:
+            KeyError: If the assignment is not in the catalogue.
+        """
+        return self._index[assignment[:4]]
+
+    def for_subject(self, subject: str) -> np.ndarray:
+        """Ids of the valid assignments for a subject."""
+        return self._by_subject.get(subject, _EMPTY)
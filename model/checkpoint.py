@@ -0,0 +1,143 @@
+"""
+Checkpoints of a Solver run, to resume it after a crash or a preemption.
+
+A checkpoint stores the state at the end of a generation: the population and
+its fitness values, the random streams, the scenario bank, the front of the
+adaptive sampling, the Pareto archive, the reference point of the telemetry and
+the state of the termination criteria. The chromosomes are stored as
+index-encoded int32 matrices (assignment ids plus enrollments) instead of pickled
+DEAP individuals, so a checkpoint of a whole population takes a few KB and is
+fast to write every few generations.
+
+The file is a NumPy `.npz` archive with the arrays, plus a JSON header with the
+generator and termination states. It is written to a temporary file first and
+then moved over the previous checkpoint, so an interruption never leaves a
+corrupt file.
+"""
+
+import json
+import os
+import typing as tp
+import numpy as np
+
+# Version of the checkpoint format
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint(tp.NamedTuple):
+    """State of a Solver run at the end of a generation."""
+
+    generation: int
+    # Number of assignments of the catalogue, to check the inputs on resume
+    catalogue_size: int
+    # Number of evaluations since the start of the run
+    evaluations: int
+    # Population: (pop, genes) matrices and (pop, 3) fitness and objectives
+    genes: np.ndarray
+    enrollments: np.ndarray
+    fitness: np.ndarray
+    objectives: np.ndarray
+    # State of the random streams (see `RandomStreams.get_state`)
+    streams: tp.Dict[str, tp.Any]
+    # State of the scenario bank (see `ScenarioBank.get_state`), if any
+    bank: tp.Optional[tp.Dict[str, tp.Any]] = None
+    # Reference front of the adaptive sampling, if any
+    front: tp.Optional[np.ndarray] = None
+    # Members of the Pareto archive, if any: ids, enrollments, fitness and
+    # stored objective values
+    archive: tp.Optional[tp.Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = (
+        None
+    )
+    # Reference point of the hypervolumes of the telemetry, if any
+    telemetry_reference: tp.Optional[np.ndarray] = None
+    # State of each termination criterion (see `TerminationCriterion.get_state`)
+    termination: tp.Tuple[tp.Dict[str, tp.Any], ...] = ()
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """Write a checkpoint, replacing the previous one atomically.
+
+    Args:
+        path: The checkpoint file.
+        checkpoint: The state to store.
+    """
+    header: tp.Dict[str, tp.Any] = {
+        "version": CHECKPOINT_VERSION,
+        "generation": checkpoint.generation,
+        "catalogue_size": checkpoint.catalogue_size,
+        "evaluations": checkpoint.evaluations,
+        "streams": checkpoint.streams,
+        "termination": list(checkpoint.termination),
+    }
+    arrays = {
+        "genes": checkpoint.genes.astype(np.int32),
+        "enrollments": checkpoint.enrollments.astype(np.int32),
+        "fitness": checkpoint.fitness,
+        "objectives": checkpoint.objectives,
+    }
+    if checkpoint.bank is not None:
+        header["bank"] = {
+            "rng": checkpoint.bank["rng"],
+            "stale": checkpoint.bank["stale"],
+        }
+        arrays["bank_buffer"] = checkpoint.bank["buffer"]
+    if checkpoint.front is not None:
+        arrays["front"] = checkpoint.front
+    if checkpoint.archive is not None:
+        genes, enrollments, fitness, objectives = checkpoint.archive
+        arrays["archive_genes"] = genes.astype(np.int32)
+        arrays["archive_enrollments"] = enrollments.astype(np.int32)
+        arrays["archive_fitness"] = fitness
+        arrays["archive_objectives"] = objectives
+    if checkpoint.telemetry_reference is not None:
+        arrays["telemetry_reference"] = checkpoint.telemetry_reference
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        np.savez(file, header=np.array(json.dumps(header)), **arrays)
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """Read a checkpoint written by `save_checkpoint`.
+
+    Args:
+        path: The checkpoint file.
+
+    Returns:
+        Checkpoint: The stored state.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data["header"]))
+        if header.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"Unsupported checkpoint version {header.get('version')}."
+                + f" Expected {CHECKPOINT_VERSION}"
+            )
+        bank = None
+        if "bank" in header:
+            bank = dict(header["bank"], buffer=data["bank_buffer"])
+        archive = None
+        if "archive_genes" in data:
+            archive = (
+                data["archive_genes"],
+                data["archive_enrollments"],
+                data["archive_fitness"],
+                data["archive_objectives"],
+            )
+        return Checkpoint(
+            generation=header["generation"],
+            catalogue_size=header["catalogue_size"],
+            evaluations=header["evaluations"],
+            genes=data["genes"],
+            enrollments=data["enrollments"],
+            fitness=data["fitness"],
+            objectives=data["objectives"],
+            streams=header["streams"],
+            bank=bank,
+            front=data["front"] if "front" in data else None,
+            archive=archive,
+            telemetry_reference=data["telemetry_reference"]
+            if "telemetry_reference" in data
+            else None,
+            termination=tuple(header.get("termination", ())),
+        )
@@ -10,13 +10,20 @@ based on the variables:
 """
 
 import typing as tp
-import random
-from dataclasses import dataclass
-from itertools import repeat
+from dataclasses import dataclass, field
+import numpy as np
 
 # Local imports
+from model import engine
+from model.conflicts import ConflictReport
+from model.engine import EncodedChromosome, EvaluationPlan
+from model.incremental import IncrementalEvaluation
 from model.types import Assignment
 
+if tp.TYPE_CHECKING:
+    from model.catalogue import AssignmentCatalogue
+    from model.sampling import AdaptiveSampling
+
 # Weight constants
 W1 = 1.0
 W2 = 1.0
@@ -26,6 +33,8 @@ HARD_PENALTY_WEIGHT = int(1e9)
 NUM_SCENARIOS: int = 10
 NOISE_MEAN = 1.0
 NOISE_STD = 0.1
+# Scenario noise generator used when no stream is given
+_DEFAULT_RNG = np.random.default_rng()
 
 
 @dataclass(slots=True)
@@ -36,32 +45,173 @@ class Chromosome:
     """
 
     assignments: tp.List[Assignment]
+    # Memoized evaluation. It is invalidated each time a gene changes.
+    _plan: tp.Optional[EvaluationPlan] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _objective: tp.Optional[tp.Tuple[float, float, float]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Optional occupancy counters for the incremental evaluation
+    _state: tp.Optional[IncrementalEvaluation] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __str__(self):
         # Define the output format for the chromosome
         output = []
 
-        for idx, assignment in enumerate(self.assignments):
+        for idx, assignment in enumerate(self.decoded()):
             output.append(
                 f"Subject {idx + 1}: Classroom: {assignment.classroom},"
                 + f" Professor: {assignment.professor}, Schedule: {assignment.schedule}"
             )
         return "\n".join(output)
 
-    def __getitem__(self, index: int) -> Assignment:
-        """Allow indexing to get a gene."""
+    @tp.overload
+    def __getitem__(self, index: tp.SupportsIndex) -> Assignment: ...
+
+    @tp.overload
+    def __getitem__(self, index: slice) -> tp.List[Assignment]: ...
+
+    def __getitem__(
+        self, index: tp.SupportsIndex | slice
+    ) -> Assignment | tp.List[Assignment]:
+        """Allow indexing to get a gene (or a list of genes for a slice)."""
         return self.assignments[index]
 
-    def __setitem__(self, index: int, value: Assignment) -> None:
-        """Allow indexing to set a gene."""
+    @tp.overload
+    def __setitem__(self, index: tp.SupportsIndex, value: Assignment) -> None: ...
+
+    @tp.overload
+    def __setitem__(self, index: slice, value: tp.Sequence[Assignment]) -> None: ...
+
+    def __setitem__(self, index: tp.SupportsIndex | slice, value: tp.Any) -> None:
+        """Allow indexing to set a gene (or a slice of genes). This invalidates the
+        cached evaluation, so the DEAP crossover and mutation operators force a new
+        evaluation. If the incremental evaluation is enabled, single genes update
+        its counters.
+        """
         self.assignments[index] = value
+        self._gene_changed(index, value)
+
+    def _gene_changed(self, index: tp.SupportsIndex | slice, value: tp.Any) -> None:
+        """Update the incremental counters and drop the cached evaluation."""
+        if self._state is not None:
+            if isinstance(index, slice):
+                self._state = None
+            else:
+                self._state.apply(int(index), value)
+        self._plan = None
+        self._objective = None
 
     def __len__(self):
         """Returns the number of subjects in the chromosome."""
         return len(self.assignments)
 
+    def decoded(self) -> tp.List[Assignment]:
+        """The genes as a new list of assignments. Modify the chromosome through
+        indexing, so the cached evaluation is invalidated.
+        """
+        return list(self.assignments)
+
+    @classmethod
+    def from_ids(
+        cls,
+        catalogue: "AssignmentCatalogue",
+        genes: tp.Sequence[int],
+        enrollments: tp.Sequence[int],
+    ) -> "Chromosome":
+        """Build a chromosome from assignment ids of the catalogue and enrollments."""
+        return cls(
+            [
+                catalogue[int(gene)]._replace(expected_enrollment=int(value))
+                for gene, value in zip(genes, enrollments)
+            ]
+        )
+
+    def to_ids(
+        self, catalogue: "AssignmentCatalogue"
+    ) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """Encode the genes as (assignment ids, enrollments) int32 arrays."""
+        genes = self.decoded()
+        return (
+            np.array([catalogue.index(asg) for asg in genes], dtype=np.int32),
+            np.array([asg.expected_enrollment for asg in genes], dtype=np.int32),
+        )
+
     # Add the methods to calculate the fitness of the chromosome
     # ========================================================== #
+    def invalidate(self) -> None:
+        """Drop the cached evaluation. Call it after modifying `assignments` directly."""
+        self._plan = None
+        self._objective = None
+        self._state = None
+
+    def enable_incremental(self) -> None:
+        """Keep persistent occupancy counters, so each gene change updates the
+        evaluation plan in O(1)/O(log n) instead of re-scoring the whole chromosome.
+        Useful for local search and mutation-heavy configurations.
+        """
+        if self._state is None:
+            self._state = IncrementalEvaluation(self.decoded(), HARD_PENALTY_WEIGHT)
+
+    def disable_incremental(self) -> None:
+        """Drop the occupancy counters, keeping the current evaluation plan."""
+        if self._state is not None:
+            self._plan = self.evaluation_plan
+            self._state = None
+
+    def conflicting_genes(self) -> tp.List[int]:
+        """Positions of the genes involved in a hard constraint violation."""
+        if self._state is not None:
+            return self._state.conflicts()
+        return IncrementalEvaluation(self.decoded(), HARD_PENALTY_WEIGHT).conflicts()
+
+    @property
+    def conflict_report(self) -> ConflictReport:
+        """Overlapping classes in the same classroom or with the same professor,
+        with the total overlap hours.
+        """
+        rooms, professors = engine.conflict_reports(self.encode())
+        return ConflictReport(
+            rooms.conflicts + professors.conflicts,
+            rooms.overlap_hours + professors.overlap_hours,
+        )
+
+    def encode(self) -> EncodedChromosome:
+        """Encode the chromosome as integer index arrays for the evaluation engine."""
+        return engine.encode(self.assignments)
+
+    @property
+    def evaluation_plan(self) -> EvaluationPlan:
+        """Deterministic stage of the evaluation.
+
+        The hard penalty, the PH durations, the CB ratios and the CC transitions
+        do not depend on the stochastic factor, so they are computed once here and
+        the plan can be sampled as many times as needed.
+        """
+        if self._plan is None:
+            if self._state is not None:
+                self._plan = self._state.plan
+            else:
+                self._plan = EvaluationPlan.from_encoded(
+                    self.encode(), HARD_PENALTY_WEIGHT
+                )
+        return self._plan
+
+    @evaluation_plan.setter
+    def evaluation_plan(self, plan: EvaluationPlan) -> None:
+        """Store a plan computed elsewhere (e.g. by the genotype cache)."""
+        self._plan = plan
+
+    @property
+    def has_plan(self) -> bool:
+        """Whether the evaluation plan of the current genes is available without
+        re-scoring the chromosome.
+        """
+        return self._plan is not None or self._state is not None
+
     @property
     def objective_value(self) -> tp.Tuple[float, float, float]:
         """Calculates the fitness of the chromosome. This is using the objective function.
@@ -71,152 +221,125 @@ class Chromosome:
             - PH: Penalización por incumplimiento de horas consecutivas para la misma materia.
             - CB: Penalización por baja selección de salones grandes para materias con alta matrícula.
 
+        The value is memoized, so repeated reads are free and consistent until a
+        gene changes. Use `reevaluate` to draw new scenarios explicitly.
+
         Returns:
             tuple: (penalty_CC, penalty_PH, penalty_CB)
         """
-        # Define the multiple scenarios here
-        scenarios_result = []
-        # Then, iterate over the number of scenarios provided
-        for _ in repeat(None, NUM_SCENARIOS):
-            # Get the penalties
-            penalty_CC = self.__calculate_CC()
-            penalty_PH = self.__calculate_PH()
-            penalty_CB = self.__calculate_CB()
-
-            # Get the hard penalty from the hard cons
-            hard_penalty = self.__hard_constraints()
-
-            # Apply the defined weights for each penalty
-            weighted_CC = W1 * penalty_CC
-            weighted_PH = W2 * penalty_PH
-            weighted_CB = W3 * penalty_CB
-            # Add it on the scenario
-            scenarios_result.append(
-                (
-                    weighted_CC + hard_penalty,
-                    weighted_PH + hard_penalty,
-                    weighted_CB + hard_penalty,
-                )
-            )
-        # At the end, return the average of the scenarios
-        return (
-            sum([scenario[0] for scenario in scenarios_result]) / NUM_SCENARIOS,
-            sum([scenario[1] for scenario in scenarios_result]) / NUM_SCENARIOS,
-            sum([scenario[2] for scenario in scenarios_result]) / NUM_SCENARIOS,
-        )
+        if self._objective is None:
+            return self.reevaluate()
+        return self._objective
+
+    @objective_value.setter
+    def objective_value(self, values: tp.Tuple[float, float, float]) -> None:
+        """Store objective values computed elsewhere (e.g. in a worker process)."""
+        self._objective = values
+
+    @property
+    def is_evaluated(self) -> bool:
+        """Whether the objective values are already cached."""
+        return self._objective is not None
 
-    def __hard_constraints(self) -> float:
-        """Add the hard constraints to the chromosome.
+    def reevaluate(
+        self,
+        seed: tp.Optional[int | np.random.SeedSequence] = None,
+        *,
+        rng: tp.Optional[np.random.Generator] = None,
+        noise: tp.Optional[np.ndarray] = None,
+        sampling: tp.Optional["AdaptiveSampling"] = None,
+    ) -> tp.Tuple[float, float, float]:
+        """Sample new scenarios for the chromosome and store the result.
+
+        Args:
+            seed: Seed for the scenario noise.
+            rng: Generator for the scenario noise (e.g. the scenarios stream of a run).
+                If neither the seed nor the generator are provided, a module level
+                generator is used.
+            noise: Shared `(num_scenarios, 3, n)` noise multipliers (e.g. from a
+                `model.scenarios.ScenarioBank`). If provided, no noise is drawn.
+            sampling: If provided, the number of scenarios is chosen adaptively
+                (see `model.sampling.AdaptiveSampling`) instead of `NUM_SCENARIOS`.
 
         Returns:
-            float: The total penalty for the hard constraints.
-        """
-        # Dictionaries for grouping by (classroom, day, time) and (professor, day, time)
-        classroom_usage = {}
-        professor_usage = {}
-
-        for assignment in self.assignments:
-            # Key for classroom: (classroom, day, start, end)
-            key_room = (
-                assignment.classroom,
-                assignment.schedule.day,
-                assignment.schedule.start,
-                assignment.schedule.end,
-            )
-            classroom_usage[key_room] = classroom_usage.get(key_room, 0) + 1
-
-            # Key for professor: (professor, day, start, end)
-            key_prof = (
-                assignment.professor,
-                assignment.schedule.day,
-                assignment.schedule.start,
-                assignment.schedule.end,
-            )
-            professor_usage[key_prof] = professor_usage.get(key_prof, 0) + 1
-
-        # Penalize if the same classroom is used in the same time slot more than once
-        hard_penalty = 0.0
-        for count in classroom_usage.values():
-            if count > 1:
-                hard_penalty += (count - 1) * HARD_PENALTY_WEIGHT
-
-        # Penalize if a professor is assigned to more than one class in the same time slot
-        for count in professor_usage.values():
-            if count > 1:
-                hard_penalty += (count - 1) * HARD_PENALTY_WEIGHT
-
-        # Penalize if the capacity of the classroom is insufficient for the subject's enrollment
-        for assignment in self.assignments:
-            if assignment.expected_enrollment > assignment.classroom.capacity:
-                hard_penalty += (
-                    assignment.expected_enrollment - assignment.classroom.capacity
-                ) * HARD_PENALTY_WEIGHT
-            # Penalize if the classroom is too large for the subject's enrollment
-            elif assignment.expected_enrollment < assignment.classroom.capacity * 0.5:
-                hard_penalty += (
-                    assignment.classroom.capacity - assignment.expected_enrollment
-                ) * HARD_PENALTY_WEIGHT
-            # Penalize if the classroom type is different from the subject's type
-            if (
-                assignment.classroom.type != assignment.subject.type
-                and assignment.subject.type.value != "MIX"
-            ):
-                hard_penalty += HARD_PENALTY_WEIGHT
-
-        # Return this hard penalty
-        return hard_penalty
-
-    def __stochastic_factor(self) -> float:
-        """Generate a stochastic factor with a normal distribution (mean 1, std NOISE_STD)."""
-        return random.gauss(NOISE_MEAN, NOISE_STD)
-
-    def __calculate_CC(self) -> float:
-        """CC Penalization: Penalize the consecutive changes of classroom for the same professor.
-        For example, if a professor teaches two consecutive classes and they are assigned to different classrooms,
-        a penalty is added. A stochastic factor is added.
-        """
-        cc_penalty = 0.0
-        # Group assignments by professor and day
-        prof_day = {}
-        for assignment in self.assignments:
-            key = (assignment.professor, assignment.schedule.day)
-            prof_day.setdefault(key, []).append(assignment)
-        for assignments in prof_day.values():
-            # Sort by start time
-            assignments.sort(key=lambda a: a.schedule.start)
-            for i in range(1, len(assignments)):
-                prev = assignments[i - 1]
-                curr = assignments[i]
-                # If the same professor has consecutive assignments on the same day
-                # and uses different classrooms, penalize.
-                if prev.classroom != curr.classroom:
-                    cc_penalty += 1.0 * self.__stochastic_factor()
-        return cc_penalty
-
-    def __calculate_PH(self) -> float:
-        """PH Penalty: Penalizes if the required consecutive hours for the subject are not met.
-        For example, if the block of the subject does not reach 2 consecutive hours.
-        A stochastic factor is added.
-        """
-        ph_penalty = 0.0
-        # Iterate over the assignments to check the duration of the class
-        for assignment in self.assignments:
-            duration = assignment.schedule.end - assignment.schedule.start
-            # If the duration is less than 2 hours, penalize
-            if duration < 2.0:
-                ph_penalty += (2.0 - duration) * self.__stochastic_factor()
-        return ph_penalty
-
-    def __calculate_CB(self) -> float:
-        """CB penalty: Penalizes the low selection of large classrooms for subjects with high enrollment.
-        For example, if a large classroom is assigned to a subject with high demand.
+            tuple: (penalty_CC, penalty_PH, penalty_CB)
         """
-        cb_penalty = 0.0
-        for assignment in self.assignments:
-            # Based on the capacity of the classroom and the time of enrollment
-            # for this assignment, penalize if the classroom is too small
-            if assignment.classroom.capacity < assignment.expected_enrollment:
-                cb_penalty += (
-                    assignment.expected_enrollment / assignment.classroom.capacity
-                ) * self.__stochastic_factor()
-        return cb_penalty
+        if sampling is not None:
+            if rng is None and noise is None:
+                rng = _DEFAULT_RNG if seed is None else np.random.default_rng(seed)
+            self._objective, _ = sampling.evaluate(self.evaluation_plan, rng, noise)
+            return self._objective
+        if noise is not None:
+            self._objective = scenario_objective(self.evaluation_plan, noise)
+            return self._objective
+        if rng is None:
+            rng = _DEFAULT_RNG if seed is None else np.random.default_rng(seed)
+        self._objective = sample_objective(self.evaluation_plan, rng)
+        return self._objective
+
+
+def _average_objective(
+    plan: EvaluationPlan, scenarios: np.ndarray
+) -> tp.Tuple[float, float, float]:
+    """Apply the defined weights for each penalty and average the scenarios."""
+    penalty_CC, penalty_PH, penalty_CB = scenarios.mean(axis=0)
+    return (
+        W1 * float(penalty_CC) + plan.hard_penalty,
+        W2 * float(penalty_PH) + plan.hard_penalty,
+        W3 * float(penalty_CB) + plan.hard_penalty,
+    )
+
+
+def sample_objective(
+    plan: EvaluationPlan,
+    rng: np.random.Generator,
+    num_scenarios: int = NUM_SCENARIOS,
+) -> tp.Tuple[float, float, float]:
+    """Stochastic stage of the evaluation. Samples the noise of every scenario
+    at once and returns the average objective values of the plan.
+
+    Args:
+        plan: The deterministic stage of the evaluation.
+        rng: The generator used to draw the noise.
+        num_scenarios: The number of scenarios to average.
+
+    Returns:
+        tuple: (penalty_CC, penalty_PH, penalty_CB)
+    """
+    return _average_objective(
+        plan, plan.sample(num_scenarios, rng, NOISE_MEAN, NOISE_STD)
+    )
+
+
+def scenario_objective(
+    plan: EvaluationPlan, noise: np.ndarray
+) -> tp.Tuple[float, float, float]:
+    """Stochastic stage of the evaluation under given scenarios (common random
+    numbers), so different plans can be compared on the same draws.
+
+    Args:
+        plan: The deterministic stage of the evaluation.
+        noise: A `(num_scenarios, 3, n)` array of noise multipliers.
+
+    Returns:
+        tuple: (penalty_CC, penalty_PH, penalty_CB)
+    """
+    return _average_objective(plan, plan.score(noise))
+
+
+def expected_objective(plan: EvaluationPlan) -> tp.Tuple[float, float, float]:
+    """Deterministic counterpart of `sample_objective`: the expected objective
+    values of the plan under the noise model.
+
+    Args:
+        plan: The deterministic stage of the evaluation.
+
+    Returns:
+        tuple: (penalty_CC, penalty_PH, penalty_CB)
+    """
+    penalty_CC, penalty_PH, penalty_CB = plan.expected(NOISE_MEAN)
+    return (
+        W1 * float(penalty_CC) + plan.hard_penalty,
+        W2 * float(penalty_PH) + plan.hard_penalty,
+        W3 * float(penalty_CB) + plan.hard_penalty,
+    )
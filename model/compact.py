@@ -0,0 +1,212 @@
+"""
+Compact, array-backed representation of a chromosome.
+
+Instead of a list of `Assignment` NamedTuples (which nest the subject, the
+classroom and the professor with their schedules), the genes are stored as an
+int32 vector of assignment ids plus an int32 vector of enrollments, referencing
+a shared immutable `AssignmentCatalogue`. Cloning an individual copies two small
+arrays, and a population of 10k individuals fits in a few MB.
+
+The genes are decoded on access, so the variation operators and the local search
+work over both representations.
+"""
+
+import copy
+import typing as tp
+import numpy as np
+import numpy.typing as npt
+
+# Local imports
+from model.catalogue import AssignmentCatalogue
+from model.chromosome import Chromosome
+from model.engine import EncodedChromosome
+from model.types import Assignment
+
+
+class CompactChromosome(Chromosome):
+    """Chromosome stored as assignment ids of a shared catalogue.
+
+    It has no `assignments` list: the genes are read with `decoded()` or by
+    indexing, and modified by indexing.
+    """
+
+    _catalogue: AssignmentCatalogue
+    _genes: np.ndarray
+    _enrollments: np.ndarray
+    __slots__ = ("_catalogue", "_genes", "_enrollments")
+
+    def __init__(  # pylint: disable=W0231
+        self,
+        catalogue: AssignmentCatalogue,
+        genes: npt.ArrayLike,
+        enrollments: npt.ArrayLike,
+    ):
+        """
+        Args:
+            catalogue: The shared catalogue of valid assignments.
+            genes: The assignment id of each gene.
+            enrollments: The expected enrollment of each gene.
+        """
+        self._catalogue = catalogue
+        self._genes = np.array(genes, dtype=np.int32)
+        self._enrollments = np.array(enrollments, dtype=np.int32)
+        if self._genes.shape != self._enrollments.shape:
+            raise ValueError("The genes and the enrollments must have the same length")
+        self._plan = None
+        self._objective = None
+        self._state = None
+
+    @classmethod
+    def from_ids(
+        cls,
+        catalogue: AssignmentCatalogue,
+        genes: npt.ArrayLike,
+        enrollments: npt.ArrayLike,
+    ) -> "CompactChromosome":
+        """Build a chromosome from assignment ids of the catalogue and enrollments."""
+        return cls(catalogue, genes, enrollments)
+
+    def to_ids(
+        self, catalogue: AssignmentCatalogue
+    ) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """Encode the genes as (assignment ids, enrollments) int32 arrays."""
+        if catalogue is self._catalogue:
+            return self._genes.copy(), self._enrollments.copy()
+        return Chromosome.to_ids(self, catalogue)
+
+    def decoded(self) -> tp.List[Assignment]:
+        """The genes decoded as a new list of assignments."""
+        return list(self)
+
+    def __decode(self, gene: int, enrollment: int) -> Assignment:
+        """Decode a single gene."""
+        return self._catalogue[int(gene)]._replace(expected_enrollment=int(enrollment))
+
+    @tp.overload
+    def __getitem__(self, index: tp.SupportsIndex) -> Assignment: ...
+
+    @tp.overload
+    def __getitem__(self, index: slice) -> tp.List[Assignment]: ...
+
+    def __getitem__(
+        self, index: tp.SupportsIndex | slice
+    ) -> Assignment | tp.List[Assignment]:
+        """Allow indexing to get a gene (or a list of genes for a slice)."""
+        if isinstance(index, slice):
+            return [
+                self.__decode(gene, value)
+                for gene, value in zip(self._genes[index], self._enrollments[index])
+            ]
+        return self.__decode(self._genes[index], self._enrollments[index])
+
+    @tp.overload
+    def __setitem__(self, index: tp.SupportsIndex, value: Assignment) -> None: ...
+
+    @tp.overload
+    def __setitem__(self, index: slice, value: tp.Sequence[Assignment]) -> None: ...
+
+    def __setitem__(self, index: tp.SupportsIndex | slice, value: tp.Any) -> None:
+        """Allow indexing to set a gene (or a slice of genes of the same length)."""
+        if isinstance(index, slice):
+            genes = [self._catalogue.index(asg) for asg in value]
+            enrollments = [asg.expected_enrollment for asg in value]
+            if len(genes) != len(self._genes[index]):
+                raise ValueError("The compact chromosome can not be resized")
+            self._genes[index] = genes
+            self._enrollments[index] = enrollments
+        else:
+            self._genes[index] = self._catalogue.index(value)
+            self._enrollments[index] = value.expected_enrollment
+        self._gene_changed(index, value)
+
+    def __iter__(self) -> tp.Iterator[Assignment]:
+        """Iterate over the decoded genes."""
+        for gene, value in zip(self._genes, self._enrollments):
+            yield self.__decode(gene, value)
+
+    def __len__(self):
+        """Returns the number of subjects in the chromosome."""
+        return len(self._genes)
+
+    def __eq__(self, other: object) -> bool:
+        """Same genes and enrollments (as the dataclass equality of `Chromosome`)."""
+        if not isinstance(other, CompactChromosome) or type(other) is not type(self):
+            return NotImplemented
+        if other._catalogue is not self._catalogue:
+            return self.decoded() == other.decoded()
+        return np.array_equal(self._genes, other._genes) and np.array_equal(
+            self._enrollments, other._enrollments
+        )
+
+    def __repr__(self) -> str:
+        """Show the decoded genes, as the dataclass repr of `Chromosome`."""
+        return f"{type(self).__qualname__}(assignments={self.decoded()!r})"
+
+    def __deepcopy__(self, memo: dict) -> "CompactChromosome":
+        """Copy the gene arrays, sharing the catalogue and the cached evaluation
+        (the incremental counters are dropped). Extra attributes, such as the
+        DEAP fitness, are deep copied.
+        """
+        clone = object.__new__(type(self))
+        memo[id(self)] = clone
+        clone._catalogue = self._catalogue
+        clone._genes = self._genes.copy()
+        clone._enrollments = self._enrollments.copy()
+        clone._plan = self._plan
+        clone._objective = self._objective
+        clone._state = None
+        for name, value in getattr(self, "__dict__", {}).items():
+            setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+    def __reduce__(self):
+        """Pickle the gene arrays instead of the decoded assignments."""
+        return (
+            _rebuild,
+            (type(self), self._catalogue, self._genes, self._enrollments),
+            getattr(self, "__dict__", None),
+        )
+
+    def __setstate__(self, state: tp.Optional[dict]) -> None:
+        """Restore the extra attributes, such as the DEAP fitness."""
+        if state:
+            self.__dict__.update(state)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the gene arrays."""
+        return self._genes.nbytes + self._enrollments.nbytes
+
+    def encode(self) -> EncodedChromosome:
+        """Encode the chromosome by indexing the encoding of the catalogue."""
+        table = self._catalogue.encoding
+        return EncodedChromosome(
+            subject=table.subject[self._genes],
+            classroom=table.classroom[self._genes],
+            professor=table.professor[self._genes],
+            schedule=table.schedule[self._genes],
+            enrollment=self._enrollments.astype(np.float64),
+            capacities=table.capacities,
+            subject_types=table.subject_types,
+            classroom_types=table.classroom_types,
+            schedules=table.schedules,
+        )
+
+
+def _rebuild(
+    cls: tp.Type[CompactChromosome],
+    catalogue: AssignmentCatalogue,
+    genes: np.ndarray,
+    enrollments: np.ndarray,
+) -> CompactChromosome:
+    """Unpickle a compact chromosome (or a DEAP subclass of it)."""
+    chromosome = object.__new__(cls)
+    CompactChromosome.__init__(chromosome, catalogue, genes, enrollments)
+    return chromosome
+
+
+# Registry of the chromosome representations, by name
+REPRESENTATIONS: tp.Dict[str, tp.Type[Chromosome]] = {
+    "list": Chromosome,
+    "compact": CompactChromosome,
+}
@@ -0,0 +1,147 @@
+"""
+Interval-overlap conflict detection for the hard constraints.
+
+The classes of the same classroom (or the same professor) on the same day are
+treated as intervals, so overlapping but unequal slots (e.g. 8.5-10.5 and
+9-11) are detected too. A sweep line over the intervals sorted by start counts
+as a conflict each interval that starts before the latest end seen in its
+group. This is the number of intervals minus the number of connected blocks of
+the group, so `k` classes in the exact same slot count as `k - 1` conflicts.
+Touching intervals (e.g. 9-11 and 11-13) do not overlap.
+"""
+
+import typing as tp
+import numpy as np
+
+# Local imports
+from model import kernels
+
+
+class ConflictReport(tp.NamedTuple):
+    """Result of the conflict detection."""
+
+    conflicts: int  # Intervals that overlap an earlier interval of their group
+    overlap_hours: float  # Hours with more than one class, per extra class
+
+
+def _sweep(
+    groups: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> tp.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sort the intervals by (group, start) and flag the overlapping ones.
+
+    Returns:
+        tuple: The sort order, the id of the group of each sorted interval and
+            whether each sorted interval (but the first) overlaps an earlier one.
+    """
+    order = np.lexsort((starts, groups))
+    groups, starts, ends = groups[order], starts[order], ends[order]
+    new_group = np.empty(len(groups), dtype=bool)
+    new_group[0] = True
+    np.not_equal(groups[1:], groups[:-1], out=new_group[1:])
+    group_ids = np.cumsum(new_group) - 1
+    # The sweep itself runs in the selected kernels backend
+    overlaps = kernels.active().sorted_overlaps(groups, starts, ends)
+    return order, group_ids, overlaps
+
+
+def detect_conflicts(
+    groups: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> ConflictReport:
+    """Detect the overlapping intervals of each group in O(n log n).
+
+    Args:
+        groups: Integer key of the group (e.g. classroom-day) of each interval.
+        starts: Start of each interval.
+        ends: End of each interval.
+
+    Returns:
+        ConflictReport: The number of conflicts and the overlap hours.
+    """
+    n_intervals = len(groups)
+    if n_intervals == 0:
+        return ConflictReport(0, 0.0)
+    order, group_ids, overlaps = _sweep(groups, starts, ends)
+    starts, ends = starts[order], ends[order]
+    # Overlap hours: sweep the start (+1) and end (-1) events of each group.
+    # Ends go first on ties, so touching intervals do not overlap.
+    times = np.concatenate((starts, ends))
+    deltas = np.concatenate((np.ones(n_intervals), -np.ones(n_intervals)))
+    event_groups = np.concatenate((group_ids, group_ids))
+    events = np.lexsort((deltas, times, event_groups))
+    times, deltas, event_groups = times[events], deltas[events], event_groups[events]
+    return ConflictReport(
+        int(np.count_nonzero(overlaps)),
+        kernels.active().excess_hours(event_groups, times, deltas),
+    )
+
+
+def conflicts_per_owner(
+    owners: np.ndarray,
+    groups: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    n_owners: int,
+) -> np.ndarray:
+    """Count the conflicts of many independent sets of intervals (e.g. the
+    chromosomes of a population) with a single sweep.
+
+    Args:
+        owners: Integer id, in `[0, n_owners)`, of the set of each interval.
+        groups: Integer key of the group (e.g. classroom-day) of each interval.
+        starts: Start of each interval.
+        ends: End of each interval.
+        n_owners: The number of sets.
+
+    Returns:
+        np.ndarray: The number of conflicts of each set.
+    """
+    if len(owners) == 0:
+        return np.zeros(n_owners, dtype=np.int64)
+    keys = owners.astype(np.int64) * (int(groups.max()) + 1) + groups
+    order, _, overlaps = _sweep(keys, starts, ends)
+    return np.bincount(owners[order][1:][overlaps], minlength=n_owners)
+
+
+def count_conflicts(intervals: tp.Iterable[tp.Tuple[float, float]]) -> int:
+    """Count the conflicts of a single group of (start, end) intervals.
+
+    Args:
+        intervals: The intervals of the group, sorted by start.
+
+    Returns:
+        int: The number of intervals that overlap an earlier interval.
+    """
+    conflicts = 0
+    running_end = -np.inf
+    for start, end in intervals:
+        if start < running_end:
+            conflicts += 1
+        running_end = max(running_end, end)
+    return conflicts
+
+
+def overlapping_members(
+    intervals: tp.Iterable[tp.Tuple[float, float]],
+) -> tp.List[int]:
+    """Positions of the intervals of a group that overlap another interval.
+
+    Args:
+        intervals: The intervals of the group, sorted by start.
+
+    Returns:
+        list: The positions of the overlapping intervals.
+    """
+    members: tp.List[int] = []
+    block: tp.List[int] = []
+    running_end = -np.inf
+    for position, (start, end) in enumerate(intervals):
+        if start >= running_end:
+            # A new connected block starts: keep the previous one if it overlapped
+            if len(block) > 1:
+                members.extend(block)
+            block = []
+        block.append(position)
+        running_end = max(running_end, end)
+    if len(block) > 1:
+        members.extend(block)
+    return members
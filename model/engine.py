@@ -0,0 +1,264 @@
+"""
+Array-backed evaluation engine for the chromosomes.
+
+The chromosome is encoded as integer index arrays (subject, classroom, professor,
+schedule) plus the enrollment vector, so the penalties can be computed with NumPy
+instead of Python loops over the `Assignment` NamedTuples. All the scenarios are
+evaluated at once using a `(num_scenarios, n_terms)` noise matrix, where each gene
+contributes one candidate term per soft objective (CC, PH and CB).
+"""
+
+import typing as tp
+import numpy as np
+
+# Local imports
+from model.conflicts import ConflictReport, detect_conflicts
+from model.types import Assignment, SubjectType
+
+# Number of soft objectives handled by the engine (CC, PH, CB)
+NUM_OBJECTIVES = 3
+# Integer codes for the subject types
+TYPE_CODES = {subject_type: code for code, subject_type in enumerate(SubjectType)}
+
+
+class EncodedChromosome(tp.NamedTuple):
+    """Index-encoded representation of a chromosome.
+
+    The gene arrays have one entry per assignment, while the lookup tables
+    are indexed by the ids stored in those arrays.
+    """
+
+    # Gene arrays
+    subject: np.ndarray
+    classroom: np.ndarray
+    professor: np.ndarray
+    schedule: np.ndarray
+    enrollment: np.ndarray
+    # Lookup tables
+    capacities: np.ndarray  # Capacity for each classroom id
+    subject_types: np.ndarray  # Type code for each subject id
+    classroom_types: np.ndarray  # Type code for each classroom id
+    schedules: np.ndarray  # (schedules, 3) matrix with (day, start, end)
+
+    def __len__(self) -> int:
+        return len(self.subject)
+
+
+def encode(assignments: tp.Sequence[Assignment]) -> EncodedChromosome:
+    """Encode a list of assignments as integer index arrays.
+
+    Args:
+        assignments: The genes of the chromosome.
+
+    Returns:
+        EncodedChromosome: The index-encoded chromosome.
+    """
+    # Vocabularies to map each object to its id
+    subjects: dict = {}
+    classrooms: dict = {}
+    professors: dict = {}
+    schedules: dict = {}
+    # Gene ids
+    subject_ids = [
+        subjects.setdefault(asg.subject, len(subjects)) for asg in assignments
+    ]
+    classroom_ids = [
+        classrooms.setdefault(asg.classroom, len(classrooms)) for asg in assignments
+    ]
+    professor_ids = [
+        professors.setdefault(asg.professor, len(professors)) for asg in assignments
+    ]
+    schedule_ids = [
+        schedules.setdefault(asg.schedule, len(schedules)) for asg in assignments
+    ]
+    enrollment = [asg.expected_enrollment for asg in assignments]
+    # Build the lookup tables
+    capacities = np.array([room.capacity for room in classrooms], dtype=np.float64)
+    subject_types = np.array(
+        [TYPE_CODES[subj.type] for subj in subjects], dtype=np.int8
+    )
+    classroom_types = np.array(
+        [TYPE_CODES[room.type] for room in classrooms], dtype=np.int8
+    )
+    schedules_table = np.array(list(schedules), dtype=np.float64).reshape(-1, 3)
+    return EncodedChromosome(
+        subject=np.array(subject_ids, dtype=np.int32),
+        classroom=np.array(classroom_ids, dtype=np.int32),
+        professor=np.array(professor_ids, dtype=np.int32),
+        schedule=np.array(schedule_ids, dtype=np.int32),
+        enrollment=np.array(enrollment, dtype=np.float64),
+        capacities=capacities,
+        subject_types=subject_types,
+        classroom_types=classroom_types,
+        schedules=schedules_table,
+    )
+
+
+def conflict_reports(
+    encoded: EncodedChromosome,
+) -> tp.Tuple[ConflictReport, ConflictReport]:
+    """Detect the overlapping classes per classroom-day and per professor-day.
+
+    Args:
+        encoded: The index-encoded chromosome.
+
+    Returns:
+        tuple: The conflict reports of the classrooms and of the professors.
+    """
+    day = encoded.schedules[encoded.schedule, 0].astype(np.int64)
+    start = encoded.schedules[encoded.schedule, 1]
+    end = encoded.schedules[encoded.schedule, 2]
+    n_days = int(day.max()) + 1 if len(day) else 1
+    return (
+        detect_conflicts(encoded.classroom.astype(np.int64) * n_days + day, start, end),
+        detect_conflicts(encoded.professor.astype(np.int64) * n_days + day, start, end),
+    )
+
+
+def hard_penalty(encoded: EncodedChromosome, weight: float) -> float:
+    """Compute the hard constraints penalty of an encoded chromosome.
+
+    Args:
+        encoded: The index-encoded chromosome.
+        weight: The weight applied to each violation unit.
+
+    Returns:
+        float: The total penalty for the hard constraints.
+    """
+    if len(encoded) == 0:
+        return 0.0
+    # Overlapping classes in the same classroom or with the same professor
+    rooms, professors = conflict_reports(encoded)
+    collisions = rooms.conflicts + professors.conflicts
+    # Capacity violations: too small or too large classrooms
+    capacity = encoded.capacities[encoded.classroom]
+    enrollment = encoded.enrollment
+    over = enrollment > capacity
+    under = ~over & (enrollment < capacity * 0.5)
+    capacity_units = (enrollment - capacity)[over].sum() + (capacity - enrollment)[
+        under
+    ].sum()
+    # Type violations
+    subject_type = encoded.subject_types[encoded.subject]
+    mismatches = np.count_nonzero(
+        (subject_type != encoded.classroom_types[encoded.classroom])
+        & (subject_type != TYPE_CODES[SubjectType.MIX])
+    )
+    return float((collisions + capacity_units + mismatches) * weight)
+
+
+def term_weights(encoded: EncodedChromosome) -> np.ndarray:
+    """Compute the deterministic weight of every soft penalty term.
+
+    Each gene owns one term per objective, so the result is a `(3, n_genes)`
+    matrix where the rows are the CC, PH and CB terms. Terms that do not apply
+    have a weight of zero.
+
+    Args:
+        encoded: The index-encoded chromosome.
+
+    Returns:
+        np.ndarray: The weight of each penalty term.
+    """
+    n_genes = len(encoded)
+    weights = np.zeros((NUM_OBJECTIVES, n_genes), dtype=np.float64)
+    if n_genes == 0:
+        return weights
+    day = encoded.schedules[encoded.schedule, 0]
+    start = encoded.schedules[encoded.schedule, 1]
+    end = encoded.schedules[encoded.schedule, 2]
+    # CC: consecutive classes of the same professor on the same day
+    # that use different classrooms. The sort is stable, so ties on the
+    # start time keep the order of the genes.
+    order = np.lexsort((start, day, encoded.professor))
+    prof_sorted = encoded.professor[order]
+    day_sorted = day[order]
+    room_sorted = encoded.classroom[order]
+    changes = (
+        (prof_sorted[1:] == prof_sorted[:-1])
+        & (day_sorted[1:] == day_sorted[:-1])
+        & (room_sorted[1:] != room_sorted[:-1])
+    )
+    weights[0, order[1:][changes]] = 1.0
+    # PH: blocks shorter than 2 consecutive hours
+    duration = end - start
+    weights[1] = np.where(duration < 2.0, 2.0 - duration, 0.0)
+    # CB: classrooms too small for the expected enrollment
+    capacity = encoded.capacities[encoded.classroom]
+    np.divide(
+        encoded.enrollment,
+        capacity,
+        out=weights[2],
+        where=capacity < encoded.enrollment,
+    )
+    return weights
+
+
+class EvaluationPlan(tp.NamedTuple):
+    """Deterministic stage of the evaluation of a chromosome.
+
+    It holds everything that does not depend on the stochastic factor: the hard
+    penalty and the weight of every soft penalty term (CC transitions, PH missing
+    hours and CB enrollment ratios). The plan is computed once and then only the
+    noise is sampled for each scenario.
+    """
+
+    hard_penalty: float
+    weights: np.ndarray  # (3, n_genes) matrix with the CC, PH and CB terms
+
+    @classmethod
+    def from_encoded(
+        cls, encoded: EncodedChromosome, hard_weight: float
+    ) -> "EvaluationPlan":
+        """Build the plan for an encoded chromosome.
+
+        Args:
+            encoded: The index-encoded chromosome.
+            hard_weight: The weight applied to each hard violation unit.
+        """
+        return cls(hard_penalty(encoded, hard_weight), term_weights(encoded))
+
+    @property
+    def is_feasible(self) -> bool:
+        """Whether the plan has no hard constraint violations."""
+        return self.hard_penalty == 0
+
+    def sample(
+        self,
+        num_scenarios: int,
+        rng: np.random.Generator,
+        noise_mean: float,
+        noise_std: float,
+    ) -> np.ndarray:
+        """Sample the soft penalties for several scenarios at once.
+
+        Args:
+            num_scenarios: The number of scenarios to sample.
+            rng: The generator used to draw the noise.
+            noise_mean: Mean of the multiplicative noise.
+            noise_std: Standard deviation of the multiplicative noise.
+
+        Returns:
+            np.ndarray: A `(num_scenarios, 3)` matrix with the CC, PH and CB penalties.
+        """
+        noise = rng.normal(
+            noise_mean, noise_std, size=(num_scenarios, *self.weights.shape)
+        )
+        return self.score(noise)
+
+    def score(self, noise: np.ndarray) -> np.ndarray:
+        """Soft penalties for given noise multipliers (e.g. common random numbers).
+
+        Args:
+            noise: A `(num_scenarios, 3, n)` array of multipliers, with `n` at
+                least the number of genes. Only the first genes are used.
+
+        Returns:
+            np.ndarray: A `(num_scenarios, 3)` matrix with the CC, PH and CB penalties.
+        """
+        n_genes = self.weights.shape[-1]
+        return np.einsum("skn,kn->sk", noise[..., :n_genes], self.weights)
+
+    def expected(self, noise_mean: float) -> np.ndarray:
+        """Expected soft penalties (CC, PH, CB) under the noise model."""
+        return self.weights.sum(axis=-1) * noise_mean
@@ -0,0 +1,294 @@
+"""
+Run several independent replicas of the Solver for statistical analysis.
+
+Each replica is a seeded `Solver` run. The replicas run across a process pool,
+and each finished replica is streamed to a JSONL results file (its Pareto front,
+its best objective value and its timing) while the mean and standard deviation
+are updated incrementally. A partially completed batch can be resumed from the
+results file.
+"""
+
+import json
+import os
+import time
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+import numpy as np
+
+# Local imports
+from model.chromosome import HARD_PENALTY_WEIGHT
+from model.solver import Solver
+from model.types import Subject, Classroom, Professor, Schedule
+
+
+@dataclass(slots=True, frozen=True)
+class ExperimentConfig:
+    """Parameters of the Solver used for every replica."""
+
+    population_size: int
+    max_generations: int
+    mutation_rate: float
+    solution_noise: float = 0.3
+
+
+class ProblemInputs(tp.NamedTuple):
+    """Inputs of the problem, as given to `Solver.set_inputs`."""
+
+    subjects: tp.Sequence[Subject]
+    classrooms: tp.Sequence[Classroom]
+    professors: tp.Sequence[Professor]
+    schedules: tp.Sequence[Schedule]
+
+
+class ReplicaResult(tp.NamedTuple):
+    """Result of a single replica."""
+
+    replica: int
+    seed: int
+    elapsed: float
+    objective_value: tp.Tuple[float, float, float]
+    pareto_front: tp.List[tp.Tuple[float, float, float]]
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the best solution has no hard constraint violations."""
+        return all(value < HARD_PENALTY_WEIGHT for value in self.objective_value)
+
+    @classmethod
+    def from_json(cls, line: str) -> "ReplicaResult":
+        """Load a result from a line of the results file."""
+        record = json.loads(line)
+        return cls(
+            replica=record["replica"],
+            seed=record["seed"],
+            elapsed=record["elapsed"],
+            objective_value=tuple(record["objective_value"]),  # type: ignore
+            pareto_front=[tuple(values) for values in record["pareto_front"]],  # type: ignore
+        )
+
+    def to_json(self) -> str:
+        """Dump the result as a line of the results file."""
+        return json.dumps(self._asdict())
+
+
+class RunningStats:
+    """Incremental mean and (population) standard deviation using Welford's algorithm."""
+
+    count: int
+    _mean: np.ndarray
+    _m2: np.ndarray
+    __slots__ = ("count", "_mean", "_m2")
+
+    def __init__(self, size: int = 3):
+        self.count = 0
+        self._mean = np.zeros(size)
+        self._m2 = np.zeros(size)
+
+    def push(self, values: tp.Sequence[float]) -> None:
+        """Add a new observation."""
+        self.count += 1
+        delta = np.asarray(values, dtype=np.float64) - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (np.asarray(values, dtype=np.float64) - self._mean)
+
+    @property
+    def mean(self) -> tp.Tuple[float, ...]:
+        """Mean of the observations."""
+        return tuple(float(value) for value in self._mean)
+
+    @property
+    def std(self) -> tp.Tuple[float, ...]:
+        """Standard deviation of the observations."""
+        if self.count == 0:
+            return tuple(0.0 for _ in self._m2)
+        return tuple(float(value) for value in np.sqrt(self._m2 / self.count))
+
+
+class ExperimentSummary(tp.NamedTuple):
+    """Summary of a batch of replicas."""
+
+    mean: tp.Tuple[float, ...]
+    std: tp.Tuple[float, ...]
+    valid_solutions: int
+    invalid_solutions: int
+
+
+def run_replica(
+    config: ExperimentConfig, inputs: ProblemInputs, replica: int, seed: int
+) -> ReplicaResult:
+    """Run a single seeded replica of the Solver.
+
+    Args:
+        config: The parameters of the Solver.
+        inputs: The inputs of the problem.
+        replica: The index of the replica.
+        seed: The seed of the replica.
+
+    Returns:
+        ReplicaResult: The result of the replica.
+    """
+    start = time.perf_counter()
+    solver = Solver(**asdict(config), seed=seed)
+    solver.set_inputs(*inputs)
+    solver.solve(verbose=False)
+    return ReplicaResult(
+        replica=replica,
+        seed=seed,
+        elapsed=time.perf_counter() - start,
+        objective_value=solver.objective_value_result,
+        pareto_front=[ind.objective_value for ind in solver.pareto_front],
+    )
+
+
+def replica_seeds(replicas: int, base_seed: int) -> tp.List[int]:
+    """Independent seeds for each replica, derived from a base seed."""
+    return [
+        int(child.generate_state(1, dtype=np.uint32)[0])
+        for child in np.random.SeedSequence(base_seed).spawn(replicas)
+    ]
+
+
+class ExperimentRunner:
+    """Run N seeded replicas of the Solver across a process pool."""
+
+    _config: ExperimentConfig
+    _inputs: ProblemInputs
+    _workers: tp.Optional[int]
+    _results_path: tp.Optional[str]
+    __slots__ = ("_config", "_inputs", "_workers", "_results_path")
+
+    def __init__(
+        self,
+        config: ExperimentConfig,
+        inputs: ProblemInputs,
+        *,
+        workers: tp.Optional[int] = None,
+        results_path: tp.Optional[str] = None,
+    ):
+        """
+        Args:
+            config: The parameters of the Solver.
+            inputs: The inputs of the problem.
+            workers: Number of processes. If not provided, use all the CPUs.
+                With a single worker, the replicas run in the current process.
+            results_path: Optional JSONL file where each replica is streamed.
+        """
+        if workers is not None and workers <= 0:
+            raise ValueError("The number of workers must be greater than 0")
+        self._config = config
+        self._inputs = inputs
+        self._workers = workers
+        self._results_path = results_path
+
+    def completed(self) -> tp.List[ReplicaResult]:
+        """Load the replicas already stored in the results file."""
+        if self._results_path is None or not os.path.exists(self._results_path):
+            return []
+        results = []
+        with open(self._results_path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    results.append(ReplicaResult.from_json(line))
+                except (json.JSONDecodeError, KeyError):
+                    # The last line could be incomplete if the batch was interrupted
+                    continue
+        return results
+
+    def run(
+        self,
+        replicas: int,
+        *,
+        base_seed: int = 0,
+        resume: bool = False,
+        on_result: tp.Optional[tp.Callable[[ReplicaResult], None]] = None,
+    ) -> ExperimentSummary:
+        """Run the replicas and summarize them.
+
+        Args:
+            replicas: Number of replicas in the batch.
+            base_seed: Seed used to derive the seed of each replica.
+            resume: Skip the replicas already stored in the results file.
+            on_result: Optional callback called with each finished replica.
+
+        Returns:
+            ExperimentSummary: Mean and std of the best objective values and
+                the number of valid and invalid solutions.
+
+        Raises:
+            ValueError: If a stored replica was run with another base seed.
+        """
+        stats = RunningStats()
+        valid_solutions = 0
+        seeds = replica_seeds(replicas, base_seed)
+        # Reload the completed replicas of the batch
+        done: tp.Set[int] = set()
+        if resume:
+            for result in self.completed():
+                if result.replica >= replicas or result.replica in done:
+                    continue
+                if result.seed != seeds[result.replica]:
+                    raise ValueError(
+                        f"The replica {result.replica} of the results file was run"
+                        + f" with seed {result.seed}, but the base seed {base_seed}"
+                        + f" gives {seeds[result.replica]}"
+                    )
+                done.add(result.replica)
+                stats.push(result.objective_value)
+                valid_solutions += result.is_valid
+        pending = [replica for replica in range(replicas) if replica not in done]
+        # Open the results file to stream each replica
+        results_file = None
+        if self._results_path is not None:
+            if resume:
+                self.__drop_partial_line()
+            results_file = open(  # pylint: disable=R1732
+                self._results_path, "a" if resume else "w", encoding="utf-8"
+            )
+        try:
+            for result in self.__iter_results(pending, seeds):
+                stats.push(result.objective_value)
+                valid_solutions += result.is_valid
+                if results_file is not None:
+                    results_file.write(result.to_json() + "\n")
+                    results_file.flush()
+                if on_result is not None:
+                    on_result(result)
+        finally:
+            if results_file is not None:
+                results_file.close()
+        return ExperimentSummary(
+            mean=stats.mean,
+            std=stats.std,
+            valid_solutions=valid_solutions,
+            invalid_solutions=stats.count - valid_solutions,
+        )
+
+    def __drop_partial_line(self) -> None:
+        """Truncate the results file after its last complete line, so the
+        replicas of a resumed batch are not appended to an interrupted write.
+        """
+        if self._results_path is None or not os.path.exists(self._results_path):
+            return
+        with open(self._results_path, "rb+") as file:
+            content = file.read()
+            if content and not content.endswith(b"\n"):
+                file.truncate(content.rfind(b"\n") + 1)
+
+    def __iter_results(
+        self, pending: tp.List[int], seeds: tp.List[int]
+    ) -> tp.Iterator[ReplicaResult]:
+        """Yield the results of the pending replicas as they finish."""
+        if self._workers == 1:
+            for replica in pending:
+                yield run_replica(self._config, self._inputs, replica, seeds[replica])
+            return
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            futures = [
+                executor.submit(
+                    run_replica, self._config, self._inputs, replica, seeds[replica]
+                )
+                for replica in pending
+            ]
+            for future in as_completed(futures):
+                yield future.result()
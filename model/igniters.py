@@ -2,35 +2,107 @@
 Ignite different models and constraints
 """
 
-import random
-from typing import Sequence
+import threading
+from typing import Callable, Dict, Iterable, Optional, Sequence, Type, TypeVar
+import numpy as np
 from deap import base, creator, tools
 
 # Local imports
+from model.catalogue import AssignmentCatalogue
 from model.chromosome import Chromosome
-from model.types import Subject, Professor, Classroom, Schedule, Assignment
+from model.operators import MUTATIONS, CROSSOVERS
+from model.types import (
+    Subject,
+    SubjectType,
+    Professor,
+    Classroom,
+    Schedule,
+    Assignment,
+)
 
+T = TypeVar("T")
+# Range of the expected enrollment drawn for each subject
+ENROLLMENT_RANGE = (10, 30)
+# DEAP classes of the individuals of each chromosome class, created once per
+# process: the Solvers of the islands run as threads share them
+_INDIVIDUAL_CLASSES: Dict[Type[Chromosome], Type[Chromosome]] = {}
+_CREATOR_LOCK = threading.Lock()
 
-def is_schedule_compatible(
-    schedule: Schedule, available_schedules: Sequence[Schedule]
-) -> bool:
-    """
-    Checks if the given schedule fits within any of the available schedules.
-    For each available schedule (from a professor or classroom), it verifies that:
-      - The days match.
-      - The schedule's start and end times are within the available time window.
+
+class AvailabilityModel:
+    """Availability of professors and classrooms precompiled over the global
+    schedule grid. Each professor and classroom gets a boolean mask (a bitset)
+    with the grid schedules they can take, so the valid schedules for a pair
+    come from a single intersection instead of rescanning the availability.
     """
-    for avail in available_schedules:
-        # Define the conditions for the schedule to be compatible
-        conditions = (
-            schedule.day == avail.day,
-            schedule.start >= avail.start,
-            schedule.end <= avail.end,
+
+    schedules: Sequence[Schedule]
+    _day: np.ndarray
+    _start: np.ndarray
+    _end: np.ndarray
+    _professors: dict[Professor, np.ndarray]
+    _classrooms: dict[Classroom, np.ndarray]
+    __slots__ = ("schedules", "_day", "_start", "_end", "_professors", "_classrooms")
+
+    def __init__(self, schedules: Sequence[Schedule]):
+        self.schedules = schedules
+        grid = np.array(schedules, dtype=np.float64).reshape(-1, 3)
+        self._day, self._start, self._end = grid.T
+        self._professors = {}
+        self._classrooms = {}
+
+    def professor_mask(self, professor: Professor) -> np.ndarray:
+        """Grid schedules that fit within any of the professor's available windows."""
+        mask = self._professors.get(professor)
+        if mask is None:
+            mask = np.zeros(len(self.schedules), dtype=bool)
+            for avail in professor.schedules:
+                mask |= (
+                    (self._day == avail.day)
+                    & (self._start >= avail.start)
+                    & (self._end <= avail.end)
+                )
+            self._professors[professor] = mask
+        return mask
+
+    def classroom_mask(self, classroom: Classroom) -> np.ndarray:
+        """Grid schedules that fit within the classroom's time window."""
+        mask = self._classrooms.get(classroom)
+        if mask is None:
+            mask = (self._start >= classroom.start_hour) & (
+                self._end <= classroom.end_hour
+            )
+            self._classrooms[classroom] = mask
+        return mask
+
+    def valid_schedules(self, professor: Professor, classroom: Classroom) -> np.ndarray:
+        """Indexes of the grid schedules available for both the professor and the classroom."""
+        return np.flatnonzero(
+            self.professor_mask(professor) & self.classroom_mask(classroom)
         )
-        if all(conditions):
-            return True
-    # If no compatible schedule is found, return False
-    return False
+
+
+def is_classroom_suitable(subject: Subject, classroom: Classroom) -> bool:
+    """Checks if the classroom could host the subject without violating the hard
+    constraints that do not depend on the schedule:
+      - The classroom type matches the subject type (or the subject is MIX).
+      - Some enrollment in `ENROLLMENT_RANGE` fits the capacity, without using
+        less than half of the classroom.
+    """
+    if subject.type != SubjectType.MIX and classroom.type != subject.type:
+        return False
+    min_enrollment, max_enrollment = ENROLLMENT_RANGE
+    return (
+        classroom.capacity >= min_enrollment
+        and classroom.capacity * 0.5 <= max_enrollment
+    )
+
+
+def _ordered(items: Iterable[T]) -> Sequence[T]:
+    """Give a deterministic order to unordered collections (e.g. sets)."""
+    if isinstance(items, (set, frozenset)):
+        return sorted(items)  # type: ignore
+    return items  # type: ignore
 
 
 def generate_valid_assignments(
@@ -38,7 +110,9 @@ def generate_valid_assignments(
     professors: Sequence[Professor],
     classrooms: Sequence[Classroom],
     schedules: Sequence[Schedule],
-) -> set[Assignment]:
+    *,
+    prune: bool = True,
+) -> AssignmentCatalogue:
     """
     Generates a list of valid Assignment objects based on the combinations of:
       - Each subject.
@@ -51,11 +125,18 @@ def generate_valid_assignments(
         professors (Sequence[Professor]): List of professors.
         classrooms (Sequence[Classroom]): List of classrooms.
         schedules (Sequence[Schedule]): Global list of possible schedules.
+        prune (bool): Skip the classrooms with the wrong type or capacity for the subject.
 
     Returns:
-        List[Assignment]: List of valid assignments.
+        AssignmentCatalogue: Indexed catalogue of valid assignments.
     """
-    valid_assignments: set[Assignment] = set()
+    valid_assignments: list[Assignment] = []
+    # Sets have no stable order, so sort them to keep the catalogue deterministic
+    professors = _ordered(professors)
+    classrooms = _ordered(classrooms)
+    schedules = _ordered(schedules)
+    # Precompile the availability of professors and classrooms over the grid
+    availability = AvailabilityModel(schedules)
 
     for subject in subjects:
         # Initialize the list of professors that can teach the subject
@@ -68,61 +149,59 @@ def generate_valid_assignments(
         classrooms_for_subject = [
             room
             for room in classrooms
+            # Prune the classrooms that would always violate a hard constraint
+            if not prune or is_classroom_suitable(subject, room)
             # if room.name == subject.preffered_classroom
         ]
 
-        # For each combination of professor and classroom, check global schedules
+        # For each combination of professor and classroom, intersect their availability
         for prof in profs_for_subject:
             for room in classrooms_for_subject:
-                for sched in schedules:
-                    conditions = (
-                        # * Verify that the schedule is compatible with the professor and classroom
-                        is_schedule_compatible(sched, prof.schedules),
-                        # Also, verify that the schedule fits within the classroom's time window
-                        sched.start >= room.start_hour,
-                        sched.end <= room.end_hour,
+                for sched_idx in availability.valid_schedules(prof, room):
+                    # Create a new assignment for each valid schedule
+                    assignment = Assignment(
+                        subject=subject,
+                        classroom=room,
+                        professor=prof,
+                        schedule=schedules[sched_idx],
+                        expected_enrollment=0,  # This is going to be modified in the solver
                     )
-
-                    if all(conditions):
-                        # If all conditions are met, create a new assignment
-                        assignment = Assignment(
-                            subject=subject,
-                            classroom=room,
-                            professor=prof,
-                            schedule=sched,
-                            expected_enrollment=0,  # This is going to be modified in the solver
-                        )
-                        valid_assignments.add(assignment)
-    return valid_assignments
+                    valid_assignments.append(assignment)
+    return AssignmentCatalogue(valid_assignments)
 
 
 def individuals_generator(
     subjects: Sequence[Subject],
-    assignments: set[Assignment],
+    assignments: AssignmentCatalogue,
     toolbox: base.Toolbox,
+    rng: np.random.Generator,
 ) -> None:
-    """Initialize the method to generate individuals"""
+    """Initialize the method to generate individuals, drawing from the
+    initialization stream `rng`.
+    """
+    # Look up the valid assignments of each subject once
+    valid_per_subject = []
+    for subj in subjects:
+        valid_for_subj = assignments.for_subject(subj.name)
+        if not len(valid_for_subj):  # pylint: disable=C1802
+            raise ValueError(f"No valid assignment found for subject: {subj.name}")
+        valid_per_subject.append(valid_for_subj)
+    choices = np.array([len(valid) for valid in valid_per_subject])
 
     # Define a function to generate a single individual (Chromosome)
     def __generate_individual() -> Chromosome:
         """Local method to generate a single individual (Chromosome)"""
-        selected_assignments = []
-        for subj in subjects:
-            # Filter the valid assignments for the current subject
-            valid_for_subj = [
-                asg for asg in assignments if asg.subject.name == subj.name
-            ]
-            if not valid_for_subj:
-                raise ValueError(f"No valid assignment found for subject: {subj.name}")
-            # Select a random assignment (can be modified)
-            chosen_assignment = random.choice(valid_for_subj)
-            # To this assignment, we assign a random expected enrollment
-            chosen_assignment = chosen_assignment._replace(
-                expected_enrollment=random.randint(10, 30)
-            )
-            selected_assignments.append(chosen_assignment)
-        # And finally, return the Chromosome
-        return creator.Individual(Chromosome(selected_assignments))  # type: ignore
+        # Draw the choice and the expected enrollment of every subject at once
+        picks = (rng.random(len(choices)) * choices).astype(np.int64)
+        enrollments = rng.integers(
+            ENROLLMENT_RANGE[0], ENROLLMENT_RANGE[1] + 1, size=len(choices)
+        )
+        selected_ids = [
+            valid_for_subj[pick]
+            for valid_for_subj, pick in zip(valid_per_subject, picks)
+        ]
+        # And finally, return the Chromosome (in the registered representation)
+        return toolbox.from_ids(assignments, selected_ids, enrollments)  # type: ignore
 
     # Use the `__generate_individual` function to create individuals
     toolbox.register("individual", __generate_individual)
@@ -135,26 +214,79 @@ def individuals_generator(
     )
 
 
-def evaluator_generator(
-    toolbox: base.Toolbox, mutation_rate: float, alpha: float
-) -> None:
-    """Initialize the method to evaluate each individual"""
+def evaluate_individual(
+    ind: Chromosome, alpha: float, rng: Optional[np.random.Generator] = None
+) -> tuple[float, float, float]:
+    """Evaluate an individual for the DEAP toolbox.
 
-    # Function to evaluate an individual: it should incorporate multi-scenario evaluation for the stochastic model.
-    # Here is a simplified version that returns dummy values.
-    def evaluate_individual(ind: Chromosome) -> tuple[float, float, float]:
-        # From the chromosome, get the fitness
-        # From the objective function, append a random value related to alpha
-        # THIS with the idea to incorporate noise into the evaluation process
-        return tuple(v + random.uniform(-alpha, alpha) for v in ind.objective_value)  # type: ignore
+    It is defined at module level, so it can be sent to the worker processes.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    # From the chromosome, get the fitness
+    # From the objective function, append a random value related to alpha
+    # THIS with the idea to incorporate noise into the evaluation process
+    noise = rng.uniform(-alpha, alpha, size=3)
+    return tuple(v + n for v, n in zip(ind.objective_value, noise.tolist()))  # type: ignore
 
-    toolbox.register("evaluate", evaluate_individual)
+
+def variation_generator(  # pylint: disable=R0913
+    toolbox: base.Toolbox,
+    assignments: AssignmentCatalogue,
+    mutation_rate: float,
+    mutation: str = "shuffle",
+    crossover: str = "two_point",
+    *,
+    rng: np.random.Generator,
+) -> None:
+    """Initialize the crossover and mutation operators, selected by name
+    from `model.operators.CROSSOVERS` and `model.operators.MUTATIONS`.
+    Both draw from the variation stream `rng`.
+    """
     # Registry operators of crossover and mutation
-    toolbox.register("mate", tools.cxTwoPoint)
-    # Mutation: we use mutShuffleIndexes to reorder assignments with a certain probability.
-    toolbox.register("mutate", tools.mutShuffleIndexes, indpb=mutation_rate)
-    toolbox.register("select", tools.selNSGA2)
-
-    # Configure the classes of DEAP for multiobjective (minimization)
-    creator.create("FitnessMulti", base.Fitness, weights=(-1.0, -1.0, -1.0))
-    creator.create("Individual", Chromosome, fitness=creator.FitnessMulti)  # type: ignore
+    toolbox.register("mate", CROSSOVERS[crossover], rng=rng)
+    toolbox.register(
+        "mutate",
+        MUTATIONS[mutation],
+        catalogue=assignments,
+        indpb=mutation_rate,
+        rng=rng,
+    )
+
+
+def individual_class(
+    chromosome_class: Type[Chromosome] = Chromosome,
+) -> Type[Chromosome]:
+    """The DEAP class of the individuals that extend `chromosome_class`, with a
+    multiobjective (minimization) fitness. It is created in `deap.creator` the
+    first time, as `Individual` for `Chromosome` and `CompactIndividual` for
+    `CompactChromosome`, and reused by the next Solvers of the process.
+    """
+    with _CREATOR_LOCK:
+        if chromosome_class not in _INDIVIDUAL_CLASSES:
+            if not hasattr(creator, "FitnessMulti"):
+                creator.create("FitnessMulti", base.Fitness, weights=(-1.0, -1.0, -1.0))
+            name = chromosome_class.__name__.removesuffix("Chromosome") + "Individual"
+            creator.create(name, chromosome_class, fitness=creator.FitnessMulti)  # type: ignore
+            _INDIVIDUAL_CLASSES[chromosome_class] = getattr(creator, name)
+        return _INDIVIDUAL_CLASSES[chromosome_class]
+
+
+def evaluator_generator(
+    toolbox: base.Toolbox,
+    alpha: float,
+    rng: Optional[np.random.Generator] = None,
+    chromosome_class: Type[Chromosome] = Chromosome,
+    select: Callable[..., list] = tools.selNSGA2,
+) -> None:
+    """Initialize the method to evaluate each individual. The evaluation noise
+    is drawn from the generator given to each call (the Solver gives one seeded
+    per individual), or else from `rng` or fresh entropy. The DEAP individuals
+    extend `chromosome_class` (e.g. `model.compact.CompactChromosome`), and they
+    are selected with `select` (e.g. `model.selection.sel_nsga2`).
+    """
+
+    toolbox.register("evaluate", evaluate_individual, alpha=alpha, rng=rng)
+    toolbox.register("select", select)
+    # Build the individuals from catalogue ids, in the class of the representation
+    toolbox.register("from_ids", individual_class(chromosome_class).from_ids)
@@ -0,0 +1,179 @@
+"""
+Incremental (delta) evaluation of a chromosome.
+
+The state keeps the sorted timelines of each classroom and each professor per
+day, with their number of overlapping classes. When a gene changes, only the
+timelines of its old and new positions are updated, so the hard penalty and the
+CC/PH/CB term weights are maintained without re-scoring the whole chromosome.
+"""
+
+import typing as tp
+from bisect import bisect_left, insort
+import numpy as np
+
+# Local imports
+from model.conflicts import count_conflicts, overlapping_members
+from model.engine import EvaluationPlan, NUM_OBJECTIVES
+from model.types import Assignment, SubjectType
+
+
+def gene_hard_units(assignment: Assignment) -> float:
+    """Hard violation units of a single gene (capacity and classroom type)."""
+    units = 0.0
+    capacity = assignment.classroom.capacity
+    enrollment = assignment.expected_enrollment
+    # The capacity of the classroom is insufficient for the subject's enrollment
+    if enrollment > capacity:
+        units += enrollment - capacity
+    # The classroom is too large for the subject's enrollment
+    elif enrollment < capacity * 0.5:
+        units += capacity - enrollment
+    # The classroom type is different from the subject's type
+    if (
+        assignment.classroom.type != assignment.subject.type
+        and assignment.subject.type != SubjectType.MIX
+    ):
+        units += 1
+    return units
+
+
+Timeline = tp.List[tp.Tuple[float, int]]
+
+
+class IncrementalEvaluation:
+    """Persistent occupancy timelines of a chromosome, updated gene by gene.
+
+    It produces the same `EvaluationPlan` as the full evaluation engine.
+    """
+
+    _genes: tp.List[Assignment]
+    _hard_weight: float
+    _room_timelines: tp.Dict[tuple, Timeline]
+    _timelines: tp.Dict[tuple, Timeline]
+    _collisions: int
+    _gene_units: np.ndarray
+    _weights: np.ndarray
+    __slots__ = (
+        "_genes",
+        "_hard_weight",
+        "_room_timelines",
+        "_timelines",
+        "_collisions",
+        "_gene_units",
+        "_weights",
+    )
+
+    def __init__(self, assignments: tp.Sequence[Assignment], hard_weight: float):
+        self._genes = list(assignments)
+        self._hard_weight = hard_weight
+        self._room_timelines = {}
+        self._timelines = {}
+        self._collisions = 0
+        self._gene_units = np.zeros(len(self._genes), dtype=np.float64)
+        self._weights = np.zeros((NUM_OBJECTIVES, len(self._genes)), dtype=np.float64)
+        for idx in range(len(self._genes)):
+            self.__add(idx)
+
+    @property
+    def hard_penalty(self) -> float:
+        """The total penalty for the hard constraints."""
+        return float((self._collisions + self._gene_units.sum()) * self._hard_weight)
+
+    @property
+    def plan(self) -> EvaluationPlan:
+        """The deterministic stage of the evaluation for the current genes."""
+        return EvaluationPlan(self.hard_penalty, self._weights.copy())
+
+    def conflicts(self) -> tp.List[int]:
+        """Positions of the genes involved in a hard constraint violation."""
+        conflicting = set(np.flatnonzero(self._gene_units > 0).tolist())
+        for timelines in (self._room_timelines, self._timelines):
+            for timeline in timelines.values():
+                if len(timeline) > 1:
+                    members = overlapping_members(self.__intervals(timeline))
+                    conflicting.update(timeline[position][1] for position in members)
+        return sorted(conflicting)
+
+    def apply(self, index: int, assignment: Assignment) -> None:
+        """Replace the gene at `index` and update the counters.
+
+        Args:
+            index: The position of the gene.
+            assignment: The new gene.
+        """
+        index = range(len(self._genes))[index]
+        self.__remove(index)
+        self._genes[index] = assignment
+        self.__add(index)
+
+    def __add(self, index: int) -> None:
+        """Add the gene at `index` to the timelines."""
+        gene = self._genes[index]
+        entry = (gene.schedule.start, index)
+        # Overlapping classes in the same classroom
+        room_timeline = self._room_timelines.setdefault(
+            (gene.classroom, gene.schedule.day), []
+        )
+        self._collisions -= count_conflicts(self.__intervals(room_timeline))
+        insort(room_timeline, entry)
+        self._collisions += count_conflicts(self.__intervals(room_timeline))
+        # Overlapping classes of the same professor
+        timeline = self._timelines.setdefault((gene.professor, gene.schedule.day), [])
+        self._collisions -= count_conflicts(self.__intervals(timeline))
+        insort(timeline, entry)
+        self._collisions += count_conflicts(self.__intervals(timeline))
+        self._gene_units[index] = gene_hard_units(gene)
+        # Update the CC terms of the gene and its successor in the professor timeline
+        position = bisect_left(timeline, entry)
+        self.__update_transition(timeline, position)
+        self.__update_transition(timeline, position + 1)
+        # PH: blocks shorter than 2 consecutive hours
+        duration = gene.schedule.end - gene.schedule.start
+        self._weights[1, index] = 2.0 - duration if duration < 2.0 else 0.0
+        # CB: classrooms too small for the expected enrollment
+        capacity = gene.classroom.capacity
+        self._weights[2, index] = (
+            gene.expected_enrollment / capacity
+            if capacity < gene.expected_enrollment
+            else 0.0
+        )
+
+    def __remove(self, index: int) -> None:
+        """Remove the gene at `index` from the timelines."""
+        gene = self._genes[index]
+        entry = (gene.schedule.start, index)
+        for timelines, key in (
+            (self._room_timelines, (gene.classroom, gene.schedule.day)),
+            (self._timelines, (gene.professor, gene.schedule.day)),
+        ):
+            timeline = timelines[key]
+            self._collisions -= count_conflicts(self.__intervals(timeline))
+            position = bisect_left(timeline, entry)
+            del timeline[position]
+            if not timeline:
+                del timelines[key]
+                continue
+            self._collisions += count_conflicts(self.__intervals(timeline))
+            if timelines is self._timelines:
+                # Update the CC term of the successor in the professor timeline
+                self.__update_transition(timeline, position)
+        self._gene_units[index] = 0.0
+        self._weights[:, index] = 0.0
+
+    def __intervals(self, timeline: Timeline) -> tp.Iterator[tp.Tuple[float, float]]:
+        """The (start, end) intervals of a timeline."""
+        return ((start, self._genes[index].schedule.end) for start, index in timeline)
+
+    def __update_transition(self, timeline: Timeline, position: int) -> None:
+        """Update the CC term of the entry at `position` of a timeline: it is
+        penalized if the previous class of the professor uses another classroom.
+        """
+        if position >= len(timeline):
+            return
+        index = timeline[position][1]
+        changes = (
+            position > 0
+            and self._genes[timeline[position - 1][1]].classroom
+            != self._genes[index].classroom
+        )
+        self._weights[0, index] = 1.0 if changes else 0.0
@@ -0,0 +1,394 @@
+"""
+Island model: several NSGA-II populations that evolve in parallel and exchange
+their elite individuals.
+
+Each island is a seeded `Solver` run. Every `interval` generations, each island
+sends copies of its best individuals to another island, chosen by the migration
+topology, and replaces its worst individuals with the ones it receives. As the
+catalogue of assignments is the same in every island, the migrants travel as
+compact index-encoded arrays (assignment ids plus enrollments).
+
+The messages go through a transport with `send(destination, message)` and
+`receive(timeout)` methods. `QueueTransport` works over multiprocessing queues
+(islands as processes) or in-memory queues (islands as threads of the current
+process, a local stand-in to debug the migration). A transport over MPI or
+sockets can be plugged in the same way for multi-node runs.
+
+The exchanges are synchronous: at each migration epoch an island waits for its
+incoming migrants, so a run is reproducible for a given seed.
+"""
+
+import queue
+import time
+import typing as tp
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
+import numpy as np
+
+# Local imports
+from model.archive import ParetoArchive
+from model.experiments import ExperimentConfig, ProblemInputs, replica_seeds
+from model.solver import Solver
+
+# (epoch, assignment ids, enrollments) of the migrants sent in an epoch
+MigrationMessage = tp.Tuple[int, np.ndarray, np.ndarray]
+
+
+def ring_topology(n_islands: int, epoch: int, seed: int) -> np.ndarray:
+    """Each island sends its migrants to the next one."""
+    del epoch, seed
+    return (np.arange(n_islands) + 1) % n_islands
+
+
+def random_topology(n_islands: int, epoch: int, seed: int) -> np.ndarray:
+    """A new random ring at each epoch, drawn from the seed shared by the islands,
+    so each island still receives the migrants of exactly one other island.
+    """
+    order = np.random.default_rng([seed, epoch]).permutation(n_islands)
+    targets = np.empty(n_islands, dtype=np.int64)
+    targets[order] = np.roll(order, -1)
+    return targets
+
+
+# Registry of the migration topologies, by name. Each one maps
+# (n_islands, epoch, seed) to the destination island of each island.
+TOPOLOGIES: tp.Dict[str, tp.Callable[[int, int, int], np.ndarray]] = {
+    "ring": ring_topology,
+    "random": random_topology,
+}
+
+
+class QueueTransport:
+    """Transport over one inbox queue per island. It works with `queue.Queue`
+    (threads), and with multiprocessing or manager queues (processes).
+    """
+
+    island: int
+    _inboxes: tp.Sequence[tp.Any]
+    __slots__ = ("island", "_inboxes")
+
+    def __init__(self, inboxes: tp.Sequence[tp.Any], island: int):
+        """
+        Args:
+            inboxes: The inbox queue of each island.
+            island: The island that owns this end of the transport.
+        """
+        self._inboxes = inboxes
+        self.island = island
+
+    def send(self, destination: int, message: MigrationMessage) -> None:
+        """Put a message in the inbox of the destination island."""
+        self._inboxes[destination].put(message)
+
+    def receive(self, timeout: tp.Optional[float] = None) -> MigrationMessage:
+        """Wait for the next message of the own inbox.
+
+        Raises:
+            queue.Empty: If no message arrives before the timeout.
+        """
+        return self._inboxes[self.island].get(timeout=timeout)
+
+
+class Migration:
+    """Migration settings and state of one island, given to its `Solver`."""
+
+    transport: tp.Any
+    island: int
+    n_islands: int
+    interval: int
+    migrants: int
+    topology: str
+    seed: int
+    timeout: tp.Optional[float]
+    _pending: tp.Dict[int, MigrationMessage]
+    __slots__ = (
+        "transport",
+        "island",
+        "n_islands",
+        "interval",
+        "migrants",
+        "topology",
+        "seed",
+        "timeout",
+        "_pending",
+    )
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        transport: tp.Any,
+        island: int,
+        n_islands: int,
+        *,
+        interval: int = 10,
+        migrants: int = 2,
+        topology: str = "ring",
+        seed: int = 0,
+        timeout: tp.Optional[float] = 600.0,
+    ):
+        """
+        Args:
+            transport: The transport of the messages (see `QueueTransport`).
+            island: Index of the island.
+            n_islands: Total number of islands.
+            interval: Number of generations between migrations.
+            migrants: Number of elite individuals sent at each migration.
+            topology: Name of the migration topology (see `TOPOLOGIES`).
+            seed: Seed of the random topologies, shared by all the islands.
+            timeout: Maximum time, in seconds, to wait for the migrants.
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(
+                f"Unknown topology '{topology}'. Options are: {', '.join(TOPOLOGIES)}"
+            )
+        if interval <= 0:
+            raise ValueError("The migration interval must be greater than 0")
+        if migrants < 0:
+            raise ValueError("The number of migrants must be greater or equal to 0")
+        if not 0 <= island < n_islands:
+            raise ValueError(f"The island must be between 0 and {n_islands - 1}")
+        self.transport = transport
+        self.island = island
+        self.n_islands = n_islands
+        self.interval = interval
+        self.migrants = migrants
+        self.topology = topology
+        self.seed = seed
+        self.timeout = timeout
+        self._pending = {}
+
+    def is_due(self, generation: int) -> bool:
+        """Whether the islands exchange migrants after this generation."""
+        return (
+            self.n_islands > 1 and self.migrants > 0 and generation % self.interval == 0
+        )
+
+    def exchange(
+        self, generation: int, genes: np.ndarray, enrollments: np.ndarray
+    ) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """Send the encoded emigrants and wait for the immigrants of this epoch.
+
+        Args:
+            generation: The current generation.
+            genes: `(migrants, genes)` matrix of assignment ids of the emigrants.
+            enrollments: `(migrants, genes)` matrix of their enrollments.
+
+        Returns:
+            tuple: The assignment ids and enrollments matrices of the immigrants.
+        """
+        epoch = generation // self.interval
+        targets = TOPOLOGIES[self.topology](self.n_islands, epoch, self.seed)
+        self.transport.send(int(targets[self.island]), (epoch, genes, enrollments))
+        # A faster island can already be sending the migrants of the next epoch
+        while epoch not in self._pending:
+            try:
+                message = self.transport.receive(self.timeout)
+            except queue.Empty as error:
+                raise RuntimeError(
+                    f"Island {self.island} received no migrants for epoch {epoch}"
+                ) from error
+            self._pending[message[0]] = message
+        _, genes, enrollments = self._pending.pop(epoch)
+        return genes, enrollments
+
+
+class IslandResult(tp.NamedTuple):
+    """Result of a single island."""
+
+    island: int
+    seed: int
+    elapsed: float
+    objective_value: tp.Tuple[float, float, float]
+    pareto_front: tp.List[tp.Tuple[float, float, float]]
+    # Assignment ids and enrollments of the best individual
+    genes: np.ndarray
+    enrollments: np.ndarray
+
+
+class IslandModelResult(tp.NamedTuple):
+    """Result of an island model run."""
+
+    elapsed: float
+    objective_value: tp.Tuple[float, float, float]
+    # The non-dominated objective values among the fronts of all the islands
+    pareto_front: tp.List[tp.Tuple[float, float, float]]
+    islands: tp.List[IslandResult]
+
+    @property
+    def best(self) -> IslandResult:
+        """The island that found the best objective value."""
+        return min(self.islands, key=lambda result: result.objective_value)
+
+
+def run_island(
+    config: ExperimentConfig,
+    inputs: ProblemInputs,
+    migration: Migration,
+    seed: int,
+    solver_options: tp.Optional[tp.Dict[str, tp.Any]] = None,
+) -> IslandResult:
+    """Run the Solver of one island.
+
+    Args:
+        config: The parameters of the Solver.
+        inputs: The inputs of the problem.
+        migration: The migration settings of the island.
+        seed: The seed of the island.
+        solver_options: Extra keyword arguments of the Solver.
+
+    Returns:
+        IslandResult: The result of the island.
+    """
+    start = time.perf_counter()
+    solver = Solver(
+        **asdict(config), **(solver_options or {}), migration=migration, seed=seed
+    )
+    solver.set_inputs(*inputs)
+    solver.solve(verbose=False)
+    best = min(solver.pareto_front, key=lambda ind: ind.objective_value)
+    genes, enrollments = best.to_ids(solver.assignments)
+    return IslandResult(
+        island=migration.island,
+        seed=seed,
+        elapsed=time.perf_counter() - start,
+        objective_value=solver.objective_value_result,
+        pareto_front=[ind.objective_value for ind in solver.pareto_front],
+        genes=genes,
+        enrollments=enrollments,
+    )
+
+
+class IslandModel:
+    """Run several islands of the Solver that exchange their elite individuals."""
+
+    _config: ExperimentConfig
+    _inputs: ProblemInputs
+    _islands: int
+    _interval: int
+    _migrants: int
+    _topology: str
+    _transport: str
+    _solver_options: tp.Dict[str, tp.Any]
+    __slots__ = (
+        "_config",
+        "_inputs",
+        "_islands",
+        "_interval",
+        "_migrants",
+        "_topology",
+        "_transport",
+        "_solver_options",
+    )
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        config: ExperimentConfig,
+        inputs: ProblemInputs,
+        islands: int = 4,
+        *,
+        interval: int = 10,
+        migrants: int = 2,
+        topology: str = "ring",
+        transport: str = "process",
+        solver_options: tp.Optional[tp.Dict[str, tp.Any]] = None,
+    ):
+        """
+        Args:
+            config: The parameters of the Solver of every island.
+            inputs: The inputs of the problem.
+            islands: Number of islands, each one with its own population.
+            interval: Number of generations between migrations.
+            migrants: Number of elite individuals sent at each migration.
+            topology: Name of the migration topology (see `TOPOLOGIES`).
+            transport: "process" to run each island in its own process, or
+                "local" to run them as threads of the current process.
+            solver_options: Extra keyword arguments of the Solver of every island
+                (e.g. `representation` or `nondominated_sort`).
+        """
+        if islands <= 0:
+            raise ValueError("The number of islands must be greater than 0")
+        if topology not in TOPOLOGIES:
+            raise ValueError(
+                f"Unknown topology '{topology}'. Options are: {', '.join(TOPOLOGIES)}"
+            )
+        if transport not in ("process", "local"):
+            raise ValueError(
+                f"Unknown transport '{transport}'. Options are: process, local"
+            )
+        if migrants >= config.population_size:
+            raise ValueError("The number of migrants must be lower than the population")
+        self._config = config
+        self._inputs = inputs
+        self._islands = islands
+        self._interval = interval
+        self._migrants = migrants
+        self._topology = topology
+        self._transport = transport
+        self._solver_options = dict(solver_options or {})
+
+    def run(self, *, seed: int = 0) -> IslandModelResult:
+        """Run all the islands until their last generation.
+
+        Args:
+            seed: Seed used to derive the seed of each island and the random
+                topologies.
+
+        Returns:
+            IslandModelResult: The merged Pareto front and the result of each island.
+        """
+        start = time.perf_counter()
+        seeds = replica_seeds(self._islands, seed)
+        if self._transport == "local":
+            inboxes: tp.List[tp.Any] = [queue.Queue() for _ in range(self._islands)]
+            results = self.__run_all(
+                ThreadPoolExecutor(max_workers=self._islands), inboxes, seeds, seed
+            )
+        else:
+            with multiprocessing.Manager() as manager:
+                inboxes = [manager.Queue() for _ in range(self._islands)]
+                results = self.__run_all(
+                    ProcessPoolExecutor(max_workers=self._islands), inboxes, seeds, seed
+                )
+        # Merge the fronts of the islands
+        archive = ParetoArchive()
+        for result in results:
+            for objective in result.pareto_front:
+                archive.add(objective, objective)
+        return IslandModelResult(
+            elapsed=time.perf_counter() - start,
+            objective_value=min(result.objective_value for result in results),
+            pareto_front=archive.members,
+            islands=results,
+        )
+
+    def __run_all(
+        self,
+        executor: Executor,
+        inboxes: tp.List[tp.Any],
+        seeds: tp.List[int],
+        seed: int,
+    ) -> tp.List[IslandResult]:
+        """Run one island per worker of the executor (all must run at once, as
+        they wait for each other at each migration).
+        """
+        with executor:
+            futures = [
+                executor.submit(
+                    run_island,
+                    self._config,
+                    self._inputs,
+                    Migration(
+                        QueueTransport(inboxes, island),
+                        island,
+                        self._islands,
+                        interval=self._interval,
+                        migrants=self._migrants,
+                        topology=self._topology,
+                        seed=seed,
+                    ),
+                    seeds[island],
+                    self._solver_options,
+                )
+                for island in range(self._islands)
+            ]
+            return [future.result() for future in futures]
@@ -0,0 +1,125 @@
+"""
+Interchangeable backends for the hot kernels of the conflict detection.
+
+The interval sweeps of `model.conflicts` are the tight loops of the evaluation.
+Each backend implements them over the intervals already sorted by (group, start):
+
+- "numpy": The vectorized implementation. It is the reference and the default.
+- "python": Plain loops, kept as the readable specification of the kernels.
+- "numba": The same loops compiled with Numba, only available if the optional
+  `numba` package is installed.
+
+The backend is selected at runtime with `set_backend` or the `UTCP_KERNELS`
+environment variable (read at import, so the worker processes inherit it).
+"""
+
+import os
+import typing as tp
+import numpy as np
+
+try:
+    import numba  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    numba = None
+
+
+class KernelSet(tp.NamedTuple):
+    """Implementation of the kernels for one backend."""
+
+    # (groups, starts, ends) sorted -> whether each interval but the first
+    # overlaps an earlier interval of its group
+    sorted_overlaps: tp.Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+    # (event groups, times, deltas) sorted -> hours with more than one interval,
+    # per extra interval
+    excess_hours: tp.Callable[[np.ndarray, np.ndarray, np.ndarray], float]
+
+
+def _sorted_overlaps_numpy(
+    groups: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    new_group = np.empty(len(groups), dtype=bool)
+    new_group[0] = True
+    np.not_equal(groups[1:], groups[:-1], out=new_group[1:])
+    group_ids = np.cumsum(new_group) - 1
+    # Running maximum of the end within each group. Each group is shifted above
+    # the previous one, so a single cumulative maximum never crosses groups.
+    origin = starts.min()
+    shift = group_ids * (ends.max() - origin + 1.0)
+    running_end = np.maximum.accumulate(ends - origin + shift)
+    return ~new_group[1:] & (starts[1:] - origin + shift[1:] < running_end[:-1])
+
+
+def _excess_hours_numpy(
+    event_groups: np.ndarray, times: np.ndarray, deltas: np.ndarray
+) -> float:
+    # Each group opens and closes all its intervals, so the depth is back to zero
+    # at the end of each group and a global cumulative sum can be used.
+    excess = np.maximum(np.cumsum(deltas)[:-1] - 1, 0)
+    lengths = np.where(event_groups[1:] == event_groups[:-1], np.diff(times), 0.0)
+    return float((excess * lengths).sum())
+
+
+def _sorted_overlaps_loop(
+    groups: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    overlaps = np.zeros(len(groups) - 1, dtype=np.bool_)
+    running_end = ends[0]
+    for idx in range(1, len(groups)):
+        if groups[idx] != groups[idx - 1]:
+            running_end = ends[idx]
+            continue
+        if starts[idx] < running_end:
+            overlaps[idx - 1] = True
+        if ends[idx] > running_end:
+            running_end = ends[idx]
+    return overlaps
+
+
+def _excess_hours_loop(
+    event_groups: np.ndarray, times: np.ndarray, deltas: np.ndarray
+) -> float:
+    hours = 0.0
+    depth = 0.0
+    for idx in range(len(times) - 1):
+        depth += deltas[idx]
+        if depth > 1.0 and event_groups[idx + 1] == event_groups[idx]:
+            hours += (depth - 1.0) * (times[idx + 1] - times[idx])
+    return hours
+
+
+# Registry of the backends, by name
+BACKENDS: tp.Dict[str, KernelSet] = {
+    "numpy": KernelSet(_sorted_overlaps_numpy, _excess_hours_numpy),
+    "python": KernelSet(_sorted_overlaps_loop, _excess_hours_loop),
+}
+if numba is not None:  # pragma: no cover - optional dependency
+    BACKENDS["numba"] = KernelSet(
+        numba.njit(cache=True)(_sorted_overlaps_loop),
+        numba.njit(cache=True)(_excess_hours_loop),
+    )
+
+_ACTIVE = BACKENDS["numpy"]
+
+
+def set_backend(name: str) -> None:
+    """Select the backend of the kernels.
+
+    Raises:
+        ValueError: If the backend is unknown or its dependency is not installed.
+    """
+    global _ACTIVE  # pylint: disable=W0603
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown or unavailable kernels backend '{name}'."
+            + f" Options are: {', '.join(BACKENDS)}"
+        )
+    _ACTIVE = BACKENDS[name]
+
+
+def active() -> KernelSet:
+    """The kernels of the selected backend."""
+    return _ACTIVE
+
+
+if os.environ.get("UTCP_KERNELS"):
+    set_backend(os.environ["UTCP_KERNELS"])
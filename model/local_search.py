@@ -0,0 +1,173 @@
+"""
+Local search (repair) operators for the memetic phase of the Solver.
+
+They work over the genes involved in hard constraint violations, trying the
+alternatives of the same subject from the catalogue of valid assignments. The
+moves are scored with the incremental evaluation, using the expected objective
+values, so each trial costs O(1)/O(log n). Each operator stops when its
+evaluation budget or its deadline is reached.
+"""
+
+import time
+import typing as tp
+import numpy as np
+
+# Local imports
+from model.catalogue import AssignmentCatalogue
+from model.chromosome import Chromosome, expected_objective
+
+
+def _score(individual: Chromosome) -> float:
+    """Scalar score of an individual: the sum of its expected objective values."""
+    return sum(expected_objective(individual.evaluation_plan))
+
+
+def _candidates(individual: Chromosome) -> tp.List[int]:
+    """Genes to improve: the conflicting genes or, if there are none, all of them."""
+    return individual.conflicting_genes() or list(range(len(individual)))
+
+
+def _random_move(
+    individual: Chromosome,
+    catalogue: AssignmentCatalogue,
+    index: int,
+    rng: np.random.Generator,
+) -> tp.Optional[tp.Tuple[int, tp.Any]]:
+    """Sample an alternative assignment for the gene at `index`.
+
+    Returns:
+        The (assignment id, new gene) pair, or None if there is no alternative.
+    """
+    gene = individual[index]
+    alternatives = catalogue.for_subject(gene.subject.name)
+    if not len(alternatives):  # pylint: disable=C1802
+        return None
+    assignment_id = int(alternatives[rng.integers(len(alternatives))])
+    new_gene = catalogue[assignment_id]._replace(
+        expected_enrollment=gene.expected_enrollment
+    )
+    return assignment_id, new_gene
+
+
+def hill_climbing(
+    individual: Chromosome,
+    catalogue: AssignmentCatalogue,
+    max_evaluations: int,
+    deadline: tp.Optional[float] = None,
+    *,
+    rng: np.random.Generator,
+) -> int:
+    """First-improvement hill climbing over the conflicting genes.
+
+    Args:
+        individual: The individual to improve (modified in place).
+        catalogue: The catalogue of valid assignments.
+        max_evaluations: Maximum number of moves to evaluate.
+        deadline: Optional `time.perf_counter()` value to stop at.
+        rng: The generator of the variation stream.
+
+    Returns:
+        int: The number of evaluations used.
+    """
+    individual.enable_incremental()
+    current = _score(individual)
+    candidates = _candidates(individual)
+    evaluations = 0
+    while evaluations < max_evaluations and (
+        deadline is None or time.perf_counter() < deadline
+    ):
+        index = candidates[rng.integers(len(candidates))]
+        move = _random_move(individual, catalogue, index, rng)
+        if move is None:
+            break
+        old_gene = individual[index]
+        individual[index] = move[1]
+        evaluations += 1
+        score = _score(individual)
+        if score < current:
+            # Accept the move and look again for the conflicting genes
+            current = score
+            candidates = _candidates(individual)
+        else:
+            individual[index] = old_gene
+    individual.disable_incremental()
+    return evaluations
+
+
+def tabu_search(  # pylint: disable=R0914
+    individual: Chromosome,
+    catalogue: AssignmentCatalogue,
+    max_evaluations: int,
+    deadline: tp.Optional[float] = None,
+    *,
+    rng: np.random.Generator,
+    neighbours: int = 8,
+    tenure: int = 10,
+) -> int:
+    """Tabu search over the conflicting genes. Each step evaluates a sample of
+    moves for one gene and applies the best non-tabu one, even if it is worse.
+    A tabu move is still accepted if it improves the best score found. The best
+    individual found is restored at the end.
+
+    Args:
+        individual: The individual to improve (modified in place).
+        catalogue: The catalogue of valid assignments.
+        max_evaluations: Maximum number of moves to evaluate.
+        deadline: Optional `time.perf_counter()` value to stop at.
+        rng: The generator of the variation stream.
+        neighbours: Number of moves sampled at each step.
+        tenure: Number of steps that a (gene, assignment) pair stays tabu.
+
+    Returns:
+        int: The number of evaluations used.
+    """
+    individual.enable_incremental()
+    best_score = _score(individual)
+    best_genes = individual.decoded()
+    tabu: tp.Dict[tp.Tuple[int, int], int] = {}
+    evaluations = 0
+    step = 0
+    while evaluations < max_evaluations and (
+        deadline is None or time.perf_counter() < deadline
+    ):
+        step += 1
+        candidates = _candidates(individual)
+        index = candidates[rng.integers(len(candidates))]
+        old_gene = individual[index]
+        chosen: tp.Optional[tp.Tuple[float, int, tp.Any]] = None
+        for _ in range(min(neighbours, max_evaluations - evaluations)):
+            move = _random_move(individual, catalogue, index, rng)
+            if move is None:
+                break
+            assignment_id, new_gene = move
+            individual[index] = new_gene
+            evaluations += 1
+            score = _score(individual)
+            individual[index] = old_gene
+            is_tabu = tabu.get((index, assignment_id), 0) >= step
+            if (not is_tabu or score < best_score) and (
+                chosen is None or score < chosen[0]
+            ):
+                chosen = (score, assignment_id, new_gene)
+        if chosen is None:
+            break
+        score, assignment_id, new_gene = chosen
+        # Forbid going back to the gene we are leaving for a few steps
+        tabu[(index, catalogue.index(old_gene))] = step + tenure
+        individual[index] = new_gene
+        if score < best_score:
+            best_score = score
+            best_genes = individual.decoded()
+    # Restore the best individual found
+    for index, gene in enumerate(best_genes):
+        if individual[index] != gene:
+            individual[index] = gene
+    individual.disable_incremental()
+    return evaluations
+
+
+# Registry of the local search operators, by name
+LOCAL_SEARCHES: tp.Dict[str, tp.Callable[..., int]] = {
+    "hill_climbing": hill_climbing,
+    "tabu": tabu_search,
+}
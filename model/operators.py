@@ -0,0 +1,214 @@
+"""
+Variation operators that keep the genes feasible.
+
+Each position of a chromosome corresponds to a subject, so the native operators
+only exchange or resample genes for the same subject, taking the alternatives
+from the catalogue of valid assignments. The operators are registered by name,
+so the Solver can select them.
+
+All the operators draw from the `rng` generator they receive (the variation
+stream of the run) instead of the global `random` module, so the DEAP operators
+that were used before are reimplemented here with the same behavior.
+"""
+
+import typing as tp
+import numpy as np
+from deap import base
+
+# Local imports
+from model.catalogue import AssignmentCatalogue
+from model.chromosome import Chromosome
+
+
+def mut_shuffle_indexes(
+    individual: Chromosome,
+    catalogue: AssignmentCatalogue,  # pylint: disable=W0613
+    indpb: float,
+    rng: np.random.Generator,
+) -> tp.Tuple[Chromosome]:
+    """Reorder the assignments with a certain probability (as DEAP `mutShuffleIndexes`).
+    The genes can end up in the position of another subject.
+
+    Args:
+        individual: The individual to mutate.
+        catalogue: The catalogue of valid assignments (unused).
+        indpb: Independent probability for each gene to be moved.
+        rng: The generator of the variation stream.
+
+    Returns:
+        tuple: The mutated individual.
+    """
+    size = len(individual)
+    if size < 2:
+        return (individual,)
+    for idx in np.flatnonzero(rng.random(size) < indpb):
+        swap_idx = int(rng.integers(size - 1))
+        if swap_idx >= idx:
+            swap_idx += 1
+        individual[idx], individual[swap_idx] = individual[swap_idx], individual[idx]
+    return (individual,)
+
+
+def mut_resample_gene(
+    individual: Chromosome,
+    catalogue: AssignmentCatalogue,
+    indpb: float,
+    rng: np.random.Generator,
+) -> tp.Tuple[Chromosome]:
+    """Resample each gene, with probability `indpb`, from the valid assignments
+    of the same subject. The expected enrollment of the gene is kept.
+
+    Args:
+        individual: The individual to mutate.
+        catalogue: The catalogue of valid assignments.
+        indpb: Independent probability for each gene to be resampled.
+        rng: The generator of the variation stream.
+
+    Returns:
+        tuple: The mutated individual.
+    """
+    for idx in np.flatnonzero(rng.random(len(individual)) < indpb):
+        gene = individual[idx]
+        alternatives = catalogue.for_subject(gene.subject.name)
+        if len(alternatives):  # pylint: disable=C1802
+            new_gene = catalogue[alternatives[rng.integers(len(alternatives))]]
+            individual[idx] = new_gene._replace(
+                expected_enrollment=gene.expected_enrollment
+            )
+    return (individual,)
+
+
+def mut_swap_slots(
+    individual: Chromosome,
+    catalogue: AssignmentCatalogue,
+    indpb: float,
+    rng: np.random.Generator,
+) -> tp.Tuple[Chromosome]:
+    """Swap the time slots of two genes, with probability `indpb` for each gene.
+    The swap is only done if both resulting assignments are valid.
+
+    Args:
+        individual: The individual to mutate.
+        catalogue: The catalogue of valid assignments.
+        indpb: Independent probability for each gene to swap its slot.
+        rng: The generator of the variation stream.
+
+    Returns:
+        tuple: The mutated individual.
+    """
+    size = len(individual)
+    if size < 2:
+        return (individual,)
+    for idx in np.flatnonzero(rng.random(size) < indpb):
+        other = int(rng.integers(size - 1))
+        if other >= idx:
+            other += 1
+        gene, other_gene = individual[idx], individual[other]
+        if gene.schedule == other_gene.schedule:
+            continue
+        new_gene = gene._replace(schedule=other_gene.schedule)
+        new_other_gene = other_gene._replace(schedule=gene.schedule)
+        if new_gene in catalogue and new_other_gene in catalogue:
+            individual[idx] = new_gene
+            individual[other] = new_other_gene
+    return (individual,)
+
+
+def cx_two_point(
+    ind1: Chromosome, ind2: Chromosome, rng: np.random.Generator
+) -> tp.Tuple[Chromosome, Chromosome]:
+    """Two point crossover (as DEAP `cxTwoPoint`).
+
+    Args:
+        ind1: The first individual.
+        ind2: The second individual.
+        rng: The generator of the variation stream.
+
+    Returns:
+        tuple: The two individuals.
+    """
+    size = min(len(ind1), len(ind2))
+    if size < 2:
+        return ind1, ind2
+    cxpoint1 = int(rng.integers(1, size + 1))
+    cxpoint2 = int(rng.integers(1, size))
+    if cxpoint2 >= cxpoint1:
+        cxpoint2 += 1
+    else:  # Swap the two cx points
+        cxpoint1, cxpoint2 = cxpoint2, cxpoint1
+    ind1[cxpoint1:cxpoint2], ind2[cxpoint1:cxpoint2] = (
+        ind2[cxpoint1:cxpoint2],
+        ind1[cxpoint1:cxpoint2],
+    )
+    return ind1, ind2
+
+
+def cx_uniform_subject(
+    ind1: Chromosome,
+    ind2: Chromosome,
+    rng: np.random.Generator,
+    indpb: float = 0.5,
+) -> tp.Tuple[Chromosome, Chromosome]:
+    """Uniform crossover per subject. The genes of each subject are exchanged
+    with probability `indpb`, only if both parents have the same subject there.
+
+    Args:
+        ind1: The first individual.
+        ind2: The second individual.
+        rng: The generator of the variation stream.
+        indpb: Independent probability for each subject to be exchanged.
+
+    Returns:
+        tuple: The two individuals.
+    """
+    for idx in np.flatnonzero(rng.random(min(len(ind1), len(ind2))) < indpb):
+        gene1, gene2 = ind1[idx], ind2[idx]
+        if gene1.subject.name == gene2.subject.name:
+            ind1[idx], ind2[idx] = gene2, gene1
+    return ind1, ind2
+
+
+def var_and(
+    population: tp.List[Chromosome],
+    toolbox: base.Toolbox,
+    cxpb: float,
+    mutpb: float,
+    rng: np.random.Generator,
+) -> tp.List[Chromosome]:
+    """Apply crossover and mutation to a copy of the population
+    (as DEAP `algorithms.varAnd`), drawing the decisions from `rng`.
+
+    Args:
+        population: The individuals to vary.
+        toolbox: The toolbox with the `clone`, `mate` and `mutate` operators.
+        cxpb: Probability of mating two consecutive individuals.
+        mutpb: Probability of mutating an individual.
+        rng: The generator of the variation stream.
+
+    Returns:
+        list: The offspring.
+    """
+    offspring = [toolbox.clone(ind) for ind in population]  # type: ignore
+    # Apply crossover and mutation on the offspring
+    mate = rng.random(len(offspring) // 2) < cxpb
+    for pair in np.flatnonzero(mate):
+        i = 2 * pair + 1
+        offspring[i - 1], offspring[i] = toolbox.mate(offspring[i - 1], offspring[i])  # type: ignore
+        del offspring[i - 1].fitness.values, offspring[i].fitness.values
+    for i in np.flatnonzero(rng.random(len(offspring)) < mutpb):
+        (offspring[i],) = toolbox.mutate(offspring[i])  # type: ignore
+        del offspring[i].fitness.values
+    return offspring
+
+
+# Registry of the operators, by name. The mutations receive the individual,
+# the catalogue, the independent probability of each gene and the generator.
+MUTATIONS: tp.Dict[str, tp.Callable[..., tp.Tuple[Chromosome]]] = {
+    "shuffle": mut_shuffle_indexes,
+    "resample": mut_resample_gene,
+    "swap_slots": mut_swap_slots,
+}
+CROSSOVERS: tp.Dict[str, tp.Callable[..., tp.Tuple[Chromosome, Chromosome]]] = {
+    "two_point": cx_two_point,
+    "uniform": cx_uniform_subject,
+}
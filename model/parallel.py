@@ -0,0 +1,213 @@
+"""
+Parallel evaluation of the individuals using a process pool.
+
+Instead of pickling the full `Assignment` NamedTuples of each individual, the
+catalogue of valid assignments is sent once to each worker and the individuals
+travel as compact index-encoded arrays (assignment ids plus enrollments).
+"""
+
+import math
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Local imports
+from model.cache import PlanCache, genotype_key
+from model.catalogue import AssignmentCatalogue
+from model.chromosome import Chromosome
+from model.compact import CompactChromosome
+from model.engine import EvaluationPlan
+from model.rng import RandomStreams
+from model.sampling import AdaptiveSampling
+from model.scenarios import ScenarioBank
+
+# Catalogue of assignments available in each worker process
+_WORKER_CATALOGUE = AssignmentCatalogue()
+
+
+def _init_worker(catalogue: AssignmentCatalogue) -> None:
+    """Store the catalogue of assignments in the worker process."""
+    global _WORKER_CATALOGUE  # pylint: disable=W0603
+    _WORKER_CATALOGUE = catalogue
+
+
+def evaluate_seeded(
+    func: tp.Callable[..., tp.Any],
+    chromosome: Chromosome,
+    seed: np.random.SeedSequence,
+    noise: tp.Optional[np.ndarray] = None,
+    sampling: tp.Optional[AdaptiveSampling] = None,
+) -> tp.Any:
+    """Evaluate an individual from its own seed sequence. Both the scenarios and
+    the evaluation noise are seeded, so the result does not depend on where
+    (or in which worker) the individual is evaluated.
+
+    Args:
+        func: The evaluation function, called with the generator as `rng`.
+        chromosome: The individual to evaluate.
+        seed: The seed sequence of the individual.
+        noise: Shared noise multipliers of a scenario bank, if any.
+        sampling: The adaptive sampling of the scenarios, if any.
+
+    Returns:
+        The result of `func`.
+    """
+    rng = np.random.default_rng(seed)
+    chromosome.reevaluate(rng=rng, noise=noise, sampling=sampling)
+    return func(chromosome, rng=rng)
+
+
+def _evaluate_batch(
+    func: tp.Callable[..., tp.Any],
+    genes: np.ndarray,
+    enrollments: np.ndarray,
+    seeds: tp.Sequence[np.random.SeedSequence],
+    noise: tp.Optional[np.ndarray] = None,
+    sampling: tp.Optional[AdaptiveSampling] = None,
+) -> tp.List[tp.Tuple[tp.Any, tp.Tuple[float, float, float], EvaluationPlan]]:
+    """Decode and evaluate a batch of individuals inside a worker. If the shared
+    `noise` of a scenario bank is given, it is used instead of sampling. The
+    adaptive `sampling` carries the Pareto front of the main process.
+
+    Returns:
+        list: The (func result, objective value, plan) of each individual.
+    """
+    results = []
+    for row, enrollment, seed in zip(genes, enrollments, seeds):
+        chromosome = CompactChromosome(_WORKER_CATALOGUE, row, enrollment)
+        result = evaluate_seeded(func, chromosome, seed, noise, sampling)
+        results.append((result, chromosome.objective_value, chromosome.evaluation_plan))
+    return results
+
+
+class ProcessPoolMap:
+    """`map` implementation for the DEAP toolbox backed by a `ProcessPoolExecutor`.
+
+    The individuals are split in one batch per worker. Each individual receives
+    its own child seed sequence spawned from the random streams of the run, so
+    the results are reproducible for a given seed regardless of the number of
+    workers. The mapped function must accept the generator as `rng` keyword.
+    If a scenario bank or an adaptive sampling are given, their current state
+    is sent with each batch. If a plan cache is given, the individuals with a
+    cached genotype are evaluated in the main process, and the plans computed
+    by the workers are added to the cache.
+    """
+
+    _catalogue: AssignmentCatalogue
+    _workers: int
+    _streams: RandomStreams
+    _bank: tp.Optional[ScenarioBank]
+    _sampling: tp.Optional[AdaptiveSampling]
+    _cache: tp.Optional[PlanCache]
+    _executor: tp.Optional[ProcessPoolExecutor]
+    __slots__ = (
+        "_catalogue",
+        "_workers",
+        "_streams",
+        "_bank",
+        "_sampling",
+        "_cache",
+        "_executor",
+    )
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        catalogue: AssignmentCatalogue,
+        workers: int,
+        streams: RandomStreams,
+        bank: tp.Optional[ScenarioBank] = None,
+        sampling: tp.Optional[AdaptiveSampling] = None,
+        cache: tp.Optional[PlanCache] = None,
+    ):
+        if workers <= 0:
+            raise ValueError("The number of workers must be greater than 0")
+        self._catalogue = catalogue
+        self._workers = workers
+        self._streams = streams
+        self._bank = bank
+        self._sampling = sampling
+        self._cache = cache
+        self._executor = None
+
+    def __enter__(self) -> "ProcessPoolMap":
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            initializer=_init_worker,
+            initargs=(self._catalogue,),
+        )
+        return self
+
+    def __exit__(self, *_) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def encode(self, individual: Chromosome) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """Encode an individual as (assignment ids, enrollments)."""
+        return individual.to_ids(self._catalogue)
+
+    def __call__(  # pylint: disable=R0914
+        self,
+        func: tp.Callable[..., tp.Any],
+        individuals: tp.Iterable[Chromosome],
+    ) -> tp.List[tp.Any]:
+        if self._executor is None:
+            raise RuntimeError(
+                "The process pool is not running. Use it as a context manager."
+            )
+        individuals = list(individuals)
+        if not individuals:
+            return []
+        # Draw the seeds of all the individuals in order
+        seeds = self._streams.spawn(len(individuals))
+        noise = (
+            None
+            if self._bank is None
+            else self._bank.noise(max(len(ind) for ind in individuals))
+        )
+        results: tp.List[tp.Any] = [None] * len(individuals)
+        # Evaluate the cached genotypes here and send the rest to the workers
+        pending = []
+        keys: tp.Dict[int, tp.Any] = {}
+        for position, ind in enumerate(individuals):
+            if self._cache is not None:
+                keys[position] = genotype_key(ind, self._catalogue)
+                plan = self._cache.get(keys[position])
+                if plan is not None:
+                    ind.evaluation_plan = plan
+                    results[position] = evaluate_seeded(
+                        func, ind, seeds[position], noise, self._sampling
+                    )
+                    continue
+            pending.append(position)
+        if not pending:
+            return results
+        # Split the pending individuals in one batch per worker
+        batch_size = math.ceil(len(pending) / self._workers)
+        futures = []
+        for start in range(0, len(pending), batch_size):
+            positions = pending[start : start + batch_size]
+            batch = [self.encode(individuals[pos]) for pos in positions]
+            futures.append(
+                self._executor.submit(
+                    _evaluate_batch,
+                    func,
+                    np.array([genes for genes, _ in batch], dtype=np.int32),
+                    np.array([enrollment for _, enrollment in batch], dtype=np.int32),
+                    [seeds[pos] for pos in positions],
+                    noise,
+                    self._sampling,
+                )
+            )
+        # Collect the results and keep the evaluation computed by the workers
+        pending_iter = iter(pending)
+        for future in futures:
+            for result, objective_value, plan in future.result():
+                position = next(pending_iter)
+                ind = individuals[position]
+                ind.evaluation_plan = plan
+                ind.objective_value = objective_value
+                if self._cache is not None:
+                    self._cache.put(keys[position], plan)
+                results[position] = result
+        return results
@@ -0,0 +1,154 @@
+"""
+Population-level evaluation: a whole generation scored as one tensor.
+
+The individuals are stacked as `(pop, genes)` matrices of assignment ids and
+enrollments, and every deterministic term is computed for all of them at once:
+the classroom and professor overlaps with a single interval sweep (counted per
+individual with `np.bincount`), the CC transitions with one sort over the
+(individual, professor, day, start) segments, and PH/CB with broadcasting.
+With a shared scenario bank, the stochastic stage of all the individuals and
+scenarios is a single `einsum`.
+
+It produces the same plans as `model.engine`, which evaluates one chromosome.
+"""
+
+import typing as tp
+import numpy as np
+
+# Local imports
+from model.catalogue import AssignmentCatalogue
+from model.chromosome import Chromosome, W1, W2, W3
+from model.conflicts import conflicts_per_owner
+from model.engine import EvaluationPlan, NUM_OBJECTIVES, TYPE_CODES
+from model.types import SubjectType
+
+
+def stack_population(
+    individuals: tp.Sequence[Chromosome], catalogue: AssignmentCatalogue
+) -> tp.Tuple[np.ndarray, np.ndarray]:
+    """Stack the individuals as `(pop, genes)` matrices.
+
+    Args:
+        individuals: The individuals, all with the same number of genes.
+        catalogue: The catalogue of valid assignments.
+
+    Returns:
+        tuple: The assignment ids and the enrollments matrices.
+    """
+    encoded = [ind.to_ids(catalogue) for ind in individuals]
+    if len({len(genes) for genes, _ in encoded}) > 1:
+        raise ValueError("All the individuals must have the same number of genes")
+    n_genes = len(encoded[0][0]) if encoded else 0
+    genes = np.array([genes for genes, _ in encoded], dtype=np.int32)
+    enrollments = np.array([values for _, values in encoded], dtype=np.int32)
+    return genes.reshape(-1, n_genes), enrollments.reshape(-1, n_genes)
+
+
+def population_plans(  # pylint: disable=R0914
+    catalogue: AssignmentCatalogue,
+    genes: np.ndarray,
+    enrollments: np.ndarray,
+    hard_weight: float,
+) -> tp.List[EvaluationPlan]:
+    """Deterministic stage of the evaluation of a stacked population.
+
+    Args:
+        catalogue: The catalogue of valid assignments.
+        genes: `(pop, genes)` matrix of assignment ids.
+        enrollments: `(pop, genes)` matrix of expected enrollments.
+        hard_weight: The weight applied to each hard violation unit.
+
+    Returns:
+        list: The evaluation plan of each individual.
+    """
+    n_individuals, n_genes = genes.shape
+    weights = np.zeros((n_individuals, NUM_OBJECTIVES, n_genes), dtype=np.float64)
+    if n_genes == 0:
+        return [EvaluationPlan(0.0, weights[idx]) for idx in range(n_individuals)]
+    table = catalogue.encoding
+    classroom = table.classroom[genes]
+    professor = table.professor[genes]
+    schedule = table.schedule[genes]
+    day = table.schedules[schedule, 0]
+    start = table.schedules[schedule, 1]
+    end = table.schedules[schedule, 2]
+    enrollment = enrollments.astype(np.float64)
+    capacity = table.capacities[classroom]
+    owners = np.repeat(np.arange(n_individuals), n_genes)
+    # Overlapping classes in the same classroom or with the same professor
+    day_ids = day.astype(np.int64).ravel()
+    n_days = int(day_ids.max()) + 1
+    collisions = conflicts_per_owner(
+        owners,
+        classroom.astype(np.int64).ravel() * n_days + day_ids,
+        start.ravel(),
+        end.ravel(),
+        n_individuals,
+    ) + conflicts_per_owner(
+        owners,
+        professor.astype(np.int64).ravel() * n_days + day_ids,
+        start.ravel(),
+        end.ravel(),
+        n_individuals,
+    )
+    # Capacity violations: too small or too large classrooms
+    over = enrollment > capacity
+    under = ~over & (enrollment < capacity * 0.5)
+    capacity_units = np.where(over, enrollment - capacity, 0.0).sum(axis=1) + np.where(
+        under, capacity - enrollment, 0.0
+    ).sum(axis=1)
+    # Type violations
+    subject_type = table.subject_types[table.subject[genes]]
+    mismatches = np.count_nonzero(
+        (subject_type != table.classroom_types[classroom])
+        & (subject_type != TYPE_CODES[SubjectType.MIX]),
+        axis=1,
+    )
+    hard = (collisions + capacity_units + mismatches) * hard_weight
+    # CC: consecutive classes of the same professor on the same day that use
+    # different classrooms. The sort is stable, so the genes keep their order.
+    order = np.lexsort((start.ravel(), day.ravel(), professor.ravel(), owners))
+    owner_sorted = owners[order]
+    prof_sorted = professor.ravel()[order]
+    day_sorted = day.ravel()[order]
+    room_sorted = classroom.ravel()[order]
+    changes = (
+        (owner_sorted[1:] == owner_sorted[:-1])
+        & (prof_sorted[1:] == prof_sorted[:-1])
+        & (day_sorted[1:] == day_sorted[:-1])
+        & (room_sorted[1:] != room_sorted[:-1])
+    )
+    individual, gene = np.divmod(order[1:][changes], n_genes)
+    weights[individual, 0, gene] = 1.0
+    # PH: blocks shorter than 2 consecutive hours
+    duration = end - start
+    weights[:, 1] = np.where(duration < 2.0, 2.0 - duration, 0.0)
+    # CB: classrooms too small for the expected enrollment
+    np.divide(enrollment, capacity, out=weights[:, 2], where=capacity < enrollment)
+    return [
+        EvaluationPlan(float(hard[idx]), weights[idx]) for idx in range(n_individuals)
+    ]
+
+
+def population_objectives(
+    plans: tp.Sequence[EvaluationPlan], noise: np.ndarray
+) -> np.ndarray:
+    """Stochastic stage of a population under shared scenarios (common random
+    numbers), for all the individuals and scenarios at once.
+
+    Args:
+        plans: The evaluation plans, all with the same number of genes.
+        noise: A `(num_scenarios, 3, n)` array of noise multipliers.
+
+    Returns:
+        np.ndarray: A `(pop, 3)` matrix with the (penalty_CC, penalty_PH,
+            penalty_CB) of each individual.
+    """
+    if not plans:
+        return np.empty((0, NUM_OBJECTIVES))
+    weights = np.stack([plan.weights for plan in plans])
+    hard = np.array([plan.hard_penalty for plan in plans])
+    penalties = np.einsum(
+        "skn,pkn->pk", noise[..., : weights.shape[-1]], weights
+    ) / len(noise)
+    return penalties * np.array([W1, W2, W3]) + hard[:, None]
@@ -0,0 +1,76 @@
+"""
+Seeded random streams for a run of the Solver.
+
+Instead of sharing the global `random` state, each run derives independent
+`numpy.random.Generator` streams from a single seed: one for the initialization
+of the population and one for the variation operators. The scenarios and the
+evaluation noise of each evaluated individual are drawn from its own child seed
+sequence, so the results do not depend on whether (and by which worker process)
+the individual is evaluated in parallel.
+"""
+
+import typing as tp
+import numpy as np
+
+
+class RandomStreams:
+    """Independent random streams derived from a single seed."""
+
+    initialization: np.random.Generator
+    variation: np.random.Generator
+    _seed: tp.Optional[int]
+    _scenarios: np.random.SeedSequence
+    __slots__ = (
+        "initialization",
+        "variation",
+        "_seed",
+        "_scenarios",
+    )
+
+    def __init__(self, seed: tp.Optional[int] = None):
+        """
+        Args:
+            seed: Seed of the run. If not provided, fresh entropy is used.
+        """
+        self._seed = seed
+        self.initialization = np.random.default_rng()
+        self.variation = np.random.default_rng()
+        self.reset()
+
+    def reset(self) -> None:
+        """Restart the streams from the seed. The generators are updated in place,
+        so the references held by the toolbox stay valid.
+        """
+        children = np.random.SeedSequence(self._seed).spawn(3)
+        for generator, child in zip((self.initialization, self.variation), children):
+            generator.bit_generator.state = type(generator.bit_generator)(child).state
+        self._scenarios = children[-1]
+
+    def get_state(self) -> tp.Dict[str, tp.Any]:
+        """The state of the streams, as plain (JSON serializable) values."""
+        return {
+            "initialization": self.initialization.bit_generator.state,
+            "variation": self.variation.bit_generator.state,
+            "scenarios": {
+                "entropy": self._scenarios.entropy,
+                "spawn_key": list(self._scenarios.spawn_key),
+                "pool_size": self._scenarios.pool_size,
+                "n_children_spawned": self._scenarios.n_children_spawned,
+            },
+        }
+
+    def set_state(self, state: tp.Dict[str, tp.Any]) -> None:
+        """Restore a state from `get_state`. The generators are updated in place."""
+        self.initialization.bit_generator.state = state["initialization"]
+        self.variation.bit_generator.state = state["variation"]
+        scenarios = state["scenarios"]
+        self._scenarios = np.random.SeedSequence(
+            scenarios["entropy"],
+            spawn_key=tuple(scenarios["spawn_key"]),
+            pool_size=scenarios["pool_size"],
+            n_children_spawned=scenarios["n_children_spawned"],
+        )
+
+    def spawn(self, n_children: int) -> tp.List[np.random.SeedSequence]:
+        """Spawn non-overlapping child seed sequences, one per evaluated individual."""
+        return self._scenarios.spawn(n_children)
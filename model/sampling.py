@@ -0,0 +1,169 @@
+"""
+Adaptive number of scenarios (sequential sampling) for the stochastic evaluation.
+
+Instead of averaging a fixed number of scenarios for every individual, the
+scenarios are drawn in small batches. After each batch, a confidence interval of
+the mean objective values is computed, and the sampling stops early when:
+
+- The individual is infeasible: the hard penalty dominates any noise.
+- The whole interval is dominated by the current Pareto front.
+- The interval is already narrow enough.
+
+Otherwise, the individual is a contender near the front and more scenarios are
+added, up to `max_scenarios`. The noise model of `model.chromosome` is not changed.
+"""
+
+import typing as tp
+from statistics import NormalDist
+import numpy as np
+
+# Local imports
+from model.chromosome import W1, W2, W3, NOISE_MEAN, NOISE_STD
+from model.engine import EvaluationPlan, NUM_OBJECTIVES
+
+# Weight of each objective, to score the scenarios
+_WEIGHTS = np.array([W1, W2, W3], dtype=np.float64)
+
+
+def non_dominated(objectives: np.ndarray) -> np.ndarray:
+    """Rows of a minimization objectives matrix that no other row dominates.
+
+    Args:
+        objectives: A `(n, 3)` matrix of objective values.
+
+    Returns:
+        np.ndarray: The non-dominated rows.
+    """
+    if len(objectives) == 0:
+        return objectives.reshape(0, NUM_OBJECTIVES)
+    less_equal = (objectives[:, None, :] <= objectives[None, :, :]).all(axis=-1)
+    less = (objectives[:, None, :] < objectives[None, :, :]).any(axis=-1)
+    # dominated[j]: some row i is <= in all the objectives and < in one
+    dominated = (less_equal & less).any(axis=0)
+    return objectives[~dominated]
+
+
+class AdaptiveSampling:
+    """Sequential sampling of the scenarios, guided by the current Pareto front."""
+
+    min_scenarios: int
+    batch_size: int
+    max_scenarios: int
+    rel_tolerance: float
+    _z_score: float
+    _front: np.ndarray
+    __slots__ = (
+        "min_scenarios",
+        "batch_size",
+        "max_scenarios",
+        "rel_tolerance",
+        "_z_score",
+        "_front",
+    )
+
+    def __init__(  # pylint: disable=R0913
+        self,
+        min_scenarios: int = 4,
+        batch_size: int = 4,
+        max_scenarios: int = 32,
+        confidence: float = 0.95,
+        rel_tolerance: float = 0.01,
+    ):
+        """
+        Args:
+            min_scenarios: Scenarios drawn before the first check.
+            batch_size: Scenarios added at each step.
+            max_scenarios: Maximum number of scenarios of an individual.
+            confidence: Confidence level of the intervals.
+            rel_tolerance: Stop when the half width of every interval is below
+                this fraction of its mean.
+        """
+        if not 2 <= min_scenarios <= max_scenarios:
+            raise ValueError(
+                "The scenarios must satisfy 2 <= min_scenarios <= max_scenarios"
+            )
+        if batch_size <= 0:
+            raise ValueError("The batch size must be greater than 0")
+        if not 0.0 < confidence < 1.0:
+            raise ValueError("The confidence must be between 0 and 1")
+        self.min_scenarios = min_scenarios
+        self.batch_size = batch_size
+        self.max_scenarios = max_scenarios
+        self.rel_tolerance = rel_tolerance
+        self._z_score = NormalDist().inv_cdf((1.0 + confidence) / 2.0)
+        self._front = np.empty((0, NUM_OBJECTIVES))
+
+    @property
+    def front(self) -> np.ndarray:
+        """Objective values of the current Pareto front."""
+        return self._front
+
+    def update_front(self, objectives: tp.Iterable[tp.Sequence[float]]) -> None:
+        """Set the reference front from the objective values of a population."""
+        self._front = non_dominated(
+            np.array(list(objectives), dtype=np.float64).reshape(-1, NUM_OBJECTIVES)
+        )
+
+    def reset(self) -> None:
+        """Forget the reference front (e.g. at the start of a run)."""
+        self._front = np.empty((0, NUM_OBJECTIVES))
+
+    def evaluate(
+        self,
+        plan: EvaluationPlan,
+        rng: tp.Optional[np.random.Generator] = None,
+        noise: tp.Optional[np.ndarray] = None,
+    ) -> tp.Tuple[tp.Tuple[float, float, float], int]:
+        """Evaluate a plan drawing scenarios until one of the stop rules holds.
+
+        Args:
+            plan: The deterministic stage of the evaluation.
+            rng: The generator used to draw the noise.
+            noise: Shared noise multipliers (common random numbers), with at
+                least `max_scenarios` scenarios. If provided, the scenarios are
+                taken from it in order instead of being drawn.
+
+        Returns:
+            tuple: The (penalty_CC, penalty_PH, penalty_CB) averages and the
+                number of scenarios used.
+        """
+        if noise is None and rng is None:
+            raise ValueError("Either a generator or the shared noise must be provided")
+        batches = []
+        used = 0
+        step = self.min_scenarios
+        while True:
+            step = min(step, self.max_scenarios - used)
+            if noise is not None:
+                batches.append(plan.score(noise[used : used + step]))
+            else:
+                batches.append(plan.sample(step, rng, NOISE_MEAN, NOISE_STD))  # type: ignore
+            used += step
+            scenarios = np.concatenate(batches) * _WEIGHTS + plan.hard_penalty
+            mean = scenarios.mean(axis=0)
+            if used >= self.max_scenarios or self.__can_stop(plan, scenarios, mean):
+                break
+            step = self.batch_size
+        return (float(mean[0]), float(mean[1]), float(mean[2])), used
+
+    def __can_stop(
+        self, plan: EvaluationPlan, scenarios: np.ndarray, mean: np.ndarray
+    ) -> bool:
+        """Whether the scenarios drawn so far are enough for the individual."""
+        # The hard penalty dominates any noise
+        if not plan.is_feasible:
+            return True
+        half_width = (
+            self._z_score * scenarios.std(axis=0, ddof=1) / np.sqrt(len(scenarios))
+        )
+        # Even the best case of the interval is dominated by the front
+        lower = mean - half_width
+        if (
+            len(self._front)
+            and (
+                (self._front <= lower).all(axis=1) & (self._front < lower).any(axis=1)
+            ).any()
+        ):
+            return True
+        # The interval is already narrow enough
+        return bool((half_width <= self.rel_tolerance * np.abs(mean)).all())
@@ -0,0 +1,100 @@
+"""
+Common random numbers (CRN) for the stochastic evaluation.
+
+Instead of drawing fresh noise for each individual, the scenario bank keeps a
+single buffer of noise multipliers that all the individuals share. Individuals
+evaluated with the same bank are compared under the same scenarios, so their
+difference is not blurred by the sampling noise. The buffer is regenerated
+lazily after `refresh()`, e.g. once per generation.
+"""
+
+import typing as tp
+import numpy as np
+
+# Local imports
+from model.engine import NUM_OBJECTIVES
+
+# When the Solver regenerates the scenarios of the bank
+REFRESH_POLICIES: tp.Tuple[str, ...] = ("generation", "run")
+
+
+class ScenarioBank:
+    """Shared buffer of noise multipliers for the scenarios of the evaluation."""
+
+    num_scenarios: int
+    noise_mean: float
+    noise_std: float
+    _rng: np.random.Generator
+    _buffer: np.ndarray
+    _stale: bool
+    __slots__ = (
+        "num_scenarios",
+        "noise_mean",
+        "noise_std",
+        "_rng",
+        "_buffer",
+        "_stale",
+    )
+
+    def __init__(
+        self,
+        num_scenarios: int,
+        rng: np.random.Generator,
+        noise_mean: float,
+        noise_std: float,
+    ):
+        """
+        Args:
+            num_scenarios: Number of scenarios of the bank.
+            rng: The generator used to draw the scenarios.
+            noise_mean: Mean of the multiplicative noise.
+            noise_std: Standard deviation of the multiplicative noise.
+        """
+        if num_scenarios <= 0:
+            raise ValueError("The number of scenarios must be greater than 0")
+        self.num_scenarios = num_scenarios
+        self.noise_mean = noise_mean
+        self.noise_std = noise_std
+        self._rng = rng
+        self._buffer = np.empty((num_scenarios, NUM_OBJECTIVES, 0))
+        self._stale = True
+
+    def refresh(self) -> None:
+        """Discard the current scenarios. New ones are drawn on the next use."""
+        self._stale = True
+
+    def noise(self, n_genes: int) -> np.ndarray:
+        """The `(num_scenarios, 3, n)` noise multipliers, with `n >= n_genes`.
+
+        Args:
+            n_genes: The number of genes of the chromosomes to evaluate.
+
+        Returns:
+            np.ndarray: A read-only view of the shared buffer.
+        """
+        if self._stale or self._buffer.shape[-1] < n_genes:
+            if self._buffer.shape[-1] < n_genes:
+                self._buffer = np.empty((self.num_scenarios, NUM_OBJECTIVES, n_genes))
+            # Regenerate the buffer in place
+            self._buffer.flags.writeable = True
+            self._rng.standard_normal(out=self._buffer)
+            self._buffer *= self.noise_std
+            self._buffer += self.noise_mean
+            self._buffer.flags.writeable = False
+            self._stale = False
+        return self._buffer
+
+    def get_state(self) -> tp.Dict[str, tp.Any]:
+        """The generator state (JSON serializable) and the current scenarios."""
+        return {
+            "rng": self._rng.bit_generator.state,
+            "buffer": self._buffer,
+            "stale": self._stale,
+        }
+
+    def set_state(self, state: tp.Dict[str, tp.Any]) -> None:
+        """Restore a state from `get_state`. The generator is updated in place."""
+        self._rng.bit_generator.state = state["rng"]
+        self._buffer = np.array(state["buffer"], dtype=np.float64)
+        self._buffer.flags.writeable = False
+        self._stale = bool(state["stale"])
@@ -0,0 +1,169 @@
+"""
+NumPy non-dominated sorting and crowding distance for the NSGA-II selection.
+
+DEAP's `sortNondominated` compares the `Fitness` objects pair by pair in Python,
+which becomes the bottleneck for populations of a few hundred individuals. Here
+the dominance relation between the distinct fitness values is computed as a
+boolean matrix (in row blocks) and the fronts are peeled with vectorized
+domination counts, while the crowding distances are computed per objective
+with stable sorts.
+
+The results follow DEAP exactly, including the ties: individuals with equal
+fitness are grouped, the fronts keep the order in which DEAP builds them and the
+crowding sorts are cumulative and stable. So `sel_nsga2` selects the same
+individuals, in the same order, as `deap.tools.selNSGA2`.
+"""
+
+import typing as tp
+import numpy as np
+from deap import tools
+
+# Rows of the dominance matrix computed at once
+_BLOCK_SIZE = 1024
+
+
+def _dominance_matrix(wvalues: np.ndarray) -> np.ndarray:
+    """`dominates[i, j]`: fitness i dominates fitness j (on the weighted values,
+    which are maximized as in DEAP).
+    """
+    n_fits = len(wvalues)
+    dominates = np.empty((n_fits, n_fits), dtype=bool)
+    for start in range(0, n_fits, _BLOCK_SIZE):
+        block = wvalues[start : start + _BLOCK_SIZE, None, :]
+        dominates[start : start + _BLOCK_SIZE] = (block >= wvalues[None]).all(
+            axis=-1
+        ) & (block > wvalues[None]).any(axis=-1)
+    return dominates
+
+
+def nondominated_fronts(
+    wvalues: np.ndarray, k: int, first_front_only: bool = False
+) -> tp.List[np.ndarray]:
+    """Sort the rows of a weighted fitness matrix in non-domination levels.
+
+    Args:
+        wvalues: A `(n, n_objectives)` matrix with the weighted fitness values
+            (DEAP `Fitness.wvalues`, greater is better).
+        k: Stop once at least `k` rows are sorted.
+        first_front_only: Sort only the first front.
+
+    Returns:
+        list: The row indexes of each front, in the order of DEAP.
+    """
+    if k == 0 or len(wvalues) == 0:
+        return []
+    # Group the equal fitness values, by order of first appearance
+    _, first, inverse, sizes = np.unique(
+        wvalues, axis=0, return_index=True, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.reshape(-1)
+    appearance = np.argsort(first, kind="stable")
+    rank_of_unique = np.empty_like(appearance)
+    rank_of_unique[appearance] = np.arange(len(appearance))
+    fit_of_row = rank_of_unique[inverse]
+    sizes = sizes[appearance]
+    rows_of_fit = np.split(np.argsort(fit_of_row, kind="stable"), np.cumsum(sizes)[:-1])
+    dominates = _dominance_matrix(wvalues[first[appearance]])
+    # Number of fitness values that dominate each one
+    counts = dominates.sum(axis=0)
+    current = np.flatnonzero(counts == 0)
+    fronts = [current]
+    n_sorted = int(sizes[current].sum())
+    n_target = min(len(wvalues), k)
+    while not first_front_only and n_sorted < n_target:
+        counts = counts - dominates[current].sum(axis=0)
+        # The fitness values released by this front (their counts reach zero now)
+        released = np.flatnonzero((counts == 0) & (dominates[current].any(axis=0)))
+        if len(released) == 0:
+            break
+        # DEAP appends each one when it processes its last dominator in the
+        # current front, and it visits the dominated values by index.
+        last_dominator = (
+            len(current) - 1 - np.argmax(dominates[current][::-1][:, released], axis=0)
+        )
+        current = released[np.lexsort((released, last_dominator))]
+        fronts.append(current)
+        n_sorted += int(sizes[current].sum())
+    return [
+        np.concatenate([rows_of_fit[fit] for fit in front]).astype(np.int64)
+        for front in fronts
+    ]
+
+
+def crowding_distances(values: np.ndarray) -> np.ndarray:
+    """Crowding distance of the rows of a front, as DEAP `assignCrowdingDist`.
+
+    Args:
+        values: A `(n, n_objectives)` matrix with the fitness values of a front.
+
+    Returns:
+        np.ndarray: The crowding distance of each row.
+    """
+    n_rows, n_objectives = values.shape
+    distances = np.zeros(n_rows)
+    if n_rows == 0:
+        return distances
+    order = np.arange(n_rows)
+    for obj in range(n_objectives):
+        # Each sort starts from the previous order, as DEAP sorts in place
+        order = order[np.argsort(values[order, obj], kind="stable")]
+        distances[order[0]] = np.inf
+        distances[order[-1]] = np.inf
+        low, high = values[order[0], obj], values[order[-1], obj]
+        if high == low:
+            continue
+        norm = n_objectives * float(high - low)
+        distances[order[1:-1]] += (
+            values[order[2:], obj] - values[order[:-2], obj]
+        ) / norm
+    return distances
+
+
+def sort_nondominated(
+    individuals: tp.Sequence[tp.Any], k: int, first_front_only: bool = False
+) -> tp.List[tp.List[tp.Any]]:
+    """Drop-in replacement of DEAP `sortNondominated`."""
+    if not individuals:
+        return []
+    wvalues = np.array([ind.fitness.wvalues for ind in individuals], dtype=np.float64)
+    return [
+        [individuals[row] for row in front]
+        for front in nondominated_fronts(wvalues, k, first_front_only)
+    ]
+
+
+def sel_nsga2(individuals: tp.Sequence[tp.Any], k: int) -> tp.List[tp.Any]:
+    """Drop-in replacement of DEAP `selNSGA2`. It also sets the
+    `fitness.crowding_dist` of the sorted individuals.
+    """
+    fronts = sort_nondominated(individuals, k)
+    chosen: tp.List[tp.Any] = []
+    for position, front in enumerate(fronts):
+        distances = crowding_distances(
+            np.array([ind.fitness.values for ind in front], dtype=np.float64)
+        )
+        for ind, distance in zip(front, distances.tolist()):
+            ind.fitness.crowding_dist = distance
+        if position < len(fronts) - 1:
+            chosen.extend(front)
+            continue
+        remaining = k - len(chosen)
+        if remaining > 0:
+            # Stable sort by decreasing crowding distance, as DEAP
+            order = np.argsort(-distances, kind="stable")
+            chosen.extend(front[idx] for idx in order[:remaining])
+    return chosen
+
+
+class NondominatedSort(tp.NamedTuple):
+    """Selection and sorting functions of a non-dominated sorting backend."""
+
+    select: tp.Callable[..., tp.List[tp.Any]]
+    sort: tp.Callable[..., tp.List[tp.List[tp.Any]]]
+
+
+# Registry of the non-dominated sorting backends, by name
+NONDOMINATED_SORTS: tp.Dict[str, NondominatedSort] = {
+    "deap": NondominatedSort(tools.selNSGA2, tools.sortNondominated),
+    "numpy": NondominatedSort(sel_nsga2, sort_nondominated),
+}
@@ -3,19 +3,47 @@ This module defines the Solver class that integrates the generation of the popul
 the running of the evolutionary optimization, and the retrieval of the result.
 """
 
-from typing import Sequence, Optional
+import time
+from functools import partial
+from typing import TYPE_CHECKING, Sequence, Optional
+import numpy as np
 
 # DEAP imports
-from deap import base, tools, algorithms
+from deap import base
 
 # Local imports
 from model.igniters import (
     generate_valid_assignments,
     individuals_generator,
+    variation_generator,
     evaluator_generator,
 )
-from model.types import Assignment, Subject, Classroom, Professor, Schedule
-from model.chromosome import Chromosome
+from model.cache import PlanCache, genotype_key
+from model.catalogue import AssignmentCatalogue
+from model.checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from model.archive import ParetoArchive
+from model.compact import REPRESENTATIONS
+from model.types import Subject, Classroom, Professor, Schedule
+from model.chromosome import (
+    Chromosome,
+    HARD_PENALTY_WEIGHT,
+    NUM_SCENARIOS,
+    NOISE_MEAN,
+    NOISE_STD,
+)
+from model.local_search import LOCAL_SEARCHES
+from model.operators import CROSSOVERS, MUTATIONS, var_and
+from model.parallel import ProcessPoolMap, evaluate_seeded
+from model.population import population_objectives, population_plans, stack_population
+from model.rng import RandomStreams
+from model.selection import NONDOMINATED_SORTS
+from model.sampling import AdaptiveSampling
+from model.scenarios import REFRESH_POLICIES, ScenarioBank
+from model.telemetry import Telemetry
+from model.termination import RunState, TerminationCriterion
+
+if TYPE_CHECKING:
+    from model.islands import Migration
 
 
 class Solver:
@@ -23,11 +51,34 @@ class Solver:
     the running of the evolutionary optimization, and the retrieval of the result.
     """
 
-    _assignments: set[Assignment]
+    _assignments: AssignmentCatalogue
     _population_size: int
     _max_generations: int
     _mutation_rate: float
     _alpha: float
+    _mutation: str
+    _crossover: str
+    _representation: str
+    _nondominated_sort: str
+    _local_search: Optional[str]
+    _local_search_budget: int
+    _local_search_time: Optional[float]
+    _workers: Optional[int]
+    _scenario_bank: Optional[str]
+    _bank: Optional[ScenarioBank]
+    _sampling: Optional[AdaptiveSampling]
+    _cache: Optional[PlanCache]
+    _vectorized: bool
+    _archive: Optional[ParetoArchive]
+    _migration: Optional["Migration"]
+    _checkpoint_path: Optional[str]
+    _checkpoint_every: int
+    _termination: tuple[TerminationCriterion, ...]
+    _evaluations: int
+    _stop_reason: Optional[str]
+    _telemetry: Optional[Telemetry]
+    _seed: Optional[int]
+    _streams: RandomStreams
     _toolbox: base.Toolbox
     _result: Optional[list]
     __slots__ = (
@@ -36,22 +87,189 @@ class Solver:
         "_mutation_rate",
         "_assignments",
         "_alpha",
+        "_mutation",
+        "_crossover",
+        "_representation",
+        "_nondominated_sort",
+        "_local_search",
+        "_local_search_budget",
+        "_local_search_time",
+        "_workers",
+        "_scenario_bank",
+        "_bank",
+        "_sampling",
+        "_cache",
+        "_vectorized",
+        "_archive",
+        "_migration",
+        "_checkpoint_path",
+        "_checkpoint_every",
+        "_termination",
+        "_evaluations",
+        "_stop_reason",
+        "_telemetry",
+        "_seed",
+        "_streams",
         "_toolbox",
         "_result",
     )
 
-    def __init__(
+    def __init__(  # pylint: disable=R0913
         self,
         population_size: int,
         max_generations: int,
         mutation_rate: float,
         solution_noise: float = 0.3,
+        *,
+        mutation: str = "shuffle",
+        crossover: str = "two_point",
+        representation: str = "list",
+        nondominated_sort: str = "deap",
+        local_search: Optional[str] = None,
+        local_search_budget: int = 200,
+        local_search_time: Optional[float] = None,
+        workers: Optional[int] = None,
+        scenario_bank: Optional[str] = None,
+        adaptive_sampling: Optional[AdaptiveSampling] = None,
+        cache_size: Optional[int] = None,
+        vectorized: bool = False,
+        archive: Optional[ParetoArchive] = None,
+        migration: Optional["Migration"] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 10,
+        termination: Sequence[TerminationCriterion] = (),
+        telemetry: Optional[Telemetry] = None,
+        seed: Optional[int] = None,
     ):
-        self._assignments = set()
+        """
+        Args:
+            population_size: Number of individuals in the population.
+            max_generations: Number of generations to run.
+            mutation_rate: Probability of mutating an individual.
+            solution_noise: Amplitude of the noise added to each evaluation.
+            mutation: Name of the mutation operator (see `model.operators.MUTATIONS`).
+            crossover: Name of the crossover operator (see `model.operators.CROSSOVERS`).
+            representation: Name of the chromosome representation (see
+                `model.compact.REPRESENTATIONS`). The "compact" one stores the
+                genes as assignment ids, so cloning the individuals is cheap.
+            nondominated_sort: Name of the non-dominated sorting backend used by the
+                NSGA-II selection (see `model.selection.NONDOMINATED_SORTS`). The
+                "numpy" one selects the same individuals as DEAP, faster.
+            local_search: Name of the local search run over the offspring of each
+                generation (see `model.local_search.LOCAL_SEARCHES`). Disabled by default.
+            local_search_budget: Maximum number of moves evaluated by the local
+                search in each generation.
+            local_search_time: Optional time budget, in seconds, of the local
+                search in each generation.
+            workers: If provided, evaluate the individuals in a process pool
+                with this number of workers.
+            scenario_bank: If provided, evaluate all the individuals on a shared bank
+                of scenarios (common random numbers) regenerated each "generation"
+                (the population is rescored with the offspring) or once per "run".
+            adaptive_sampling: If provided, the number of scenarios of each individual
+                is chosen by sequential sampling against the current Pareto front,
+                instead of the fixed `NUM_SCENARIOS`.
+            cache_size: Maximum number of genotypes whose deterministic evaluation
+                is kept in the LRU cache (see `model.cache.PlanCache`). Use 0 to
+                disable the cache. By default, 4096 with the "compact"
+                representation and 0 with the "list" one, whose genotypes cost
+                about as much to encode as the plans they save.
+            vectorized: Score each batch of individuals as a whole (see
+                `model.population`) instead of one by one. It runs in the main
+                process, so it can not be combined with `workers`.
+            archive: If provided, every evaluated individual is offered to this
+                Pareto archive, and the results are taken from it (the best
+                schedules found during the run) instead of the final population.
+            migration: If provided, the Solver is an island of an island model
+                (see `model.islands`), and exchanges its elite individuals with
+                the other islands as set by the migration.
+            checkpoint_path: If provided, the state of the run is saved to this
+                file (see `model.checkpoint`), so it can be continued with `resume`.
+            checkpoint_every: Number of generations between checkpoints.
+            termination: Criteria to stop before `max_generations` (see
+                `model.termination`). The run stops as soon as one of them is met.
+            telemetry: If provided, the metrics of each generation (timings,
+                evaluations, cache hit rate, front size, hypervolume...) are
+                emitted to its sinks (see `model.telemetry`).
+            seed: Seed to make the runs reproducible. The initialization and the
+                variation are drawn from independent streams derived from it, and
+                the scenarios and evaluation noise of each individual from its own
+                child seed (see `model.rng.RandomStreams`).
+        """
+        if mutation not in MUTATIONS:
+            raise ValueError(
+                f"Unknown mutation '{mutation}'. Options are: {', '.join(MUTATIONS)}"
+            )
+        if crossover not in CROSSOVERS:
+            raise ValueError(
+                f"Unknown crossover '{crossover}'."
+                + f" Options are: {', '.join(CROSSOVERS)}"
+            )
+        if representation not in REPRESENTATIONS:
+            raise ValueError(
+                f"Unknown representation '{representation}'."
+                + f" Options are: {', '.join(REPRESENTATIONS)}"
+            )
+        if nondominated_sort not in NONDOMINATED_SORTS:
+            raise ValueError(
+                f"Unknown non-dominated sort '{nondominated_sort}'."
+                + f" Options are: {', '.join(NONDOMINATED_SORTS)}"
+            )
+        if local_search is not None and local_search not in LOCAL_SEARCHES:
+            raise ValueError(
+                f"Unknown local search '{local_search}'."
+                + f" Options are: {', '.join(LOCAL_SEARCHES)}"
+            )
+        if workers is not None and workers <= 0:
+            raise ValueError("The number of workers must be greater than 0")
+        if vectorized and workers is not None:
+            raise ValueError(
+                "The vectorized evaluation can not be combined with workers"
+            )
+        if termination and migration is not None:
+            raise ValueError(
+                "The termination criteria can not be combined with a migration,"
+                + " as the islands wait for each other at each migration"
+            )
+        if checkpoint_every <= 0:
+            raise ValueError("The checkpoint interval must be greater than 0")
+        if cache_size is not None and cache_size < 0:
+            raise ValueError("The size of the cache must be greater or equal to 0")
+        if scenario_bank is not None and scenario_bank not in REFRESH_POLICIES:
+            raise ValueError(
+                f"Unknown scenario bank '{scenario_bank}'."
+                + f" Options are: {', '.join(REFRESH_POLICIES)}"
+            )
+        self._assignments = AssignmentCatalogue()
         self._population_size = population_size
         self._max_generations = max_generations
         self._mutation_rate = mutation_rate
         self._alpha = solution_noise
+        self._mutation = mutation
+        self._crossover = crossover
+        self._representation = representation
+        self._nondominated_sort = nondominated_sort
+        self._local_search = local_search
+        self._local_search_budget = local_search_budget
+        self._local_search_time = local_search_time
+        self._workers = workers
+        self._scenario_bank = scenario_bank
+        self._bank = None
+        self._sampling = adaptive_sampling
+        if cache_size is None:
+            cache_size = 4096 if representation == "compact" else 0
+        self._cache = PlanCache(cache_size) if cache_size > 0 else None
+        self._vectorized = vectorized
+        self._archive = archive
+        self._migration = migration
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint_every = checkpoint_every
+        self._termination = tuple(termination)
+        self._evaluations = 0
+        self._stop_reason = None
+        self._telemetry = telemetry
+        self._seed = seed
+        self._streams = RandomStreams(seed)
         self._toolbox = base.Toolbox()
         self._result = None
 
@@ -80,18 +298,70 @@ class Solver:
     def __setup_toolbox(self, subjects: Sequence[Subject]) -> None:
         """Configures the DEAP toolbox.
         The individual generator creates a Chromosome by, for each subject,
-        selecting a valid Assignment from the global set of assignments.
+        selecting a valid Assignment from the catalogue of assignments.
         """
         # Run the individuals creator
-        individuals_generator(subjects, self._assignments, self._toolbox)
+        individuals_generator(
+            subjects, self._assignments, self._toolbox, self._streams.initialization
+        )
         # Run the evaluation creator
-        evaluator_generator(self._toolbox, self._mutation_rate, self._alpha)
+        # The evaluation noise is drawn from the seed of each individual
+        evaluator_generator(
+            self._toolbox,
+            self._alpha,
+            chromosome_class=REPRESENTATIONS[self._representation],
+            select=NONDOMINATED_SORTS[self._nondominated_sort].select,
+        )
+        # Run the variation operators creator
+        variation_generator(
+            self._toolbox,
+            self._assignments,
+            self._mutation_rate,
+            self._mutation,
+            self._crossover,
+            rng=self._streams.variation,
+        )
 
     def solve(self, *, verbose: bool = False) -> None:
         """Runs the evolutionary optimization process using NSGA-II.
         Each individual is a Chromosome built from valid assignments.
         The evaluation function (incorporating scenario simulation) computes the expected penalties.
         """
+        self.__run(verbose)
+
+    def resume(self, path: str, *, verbose: bool = False) -> None:
+        """Continue a run from a checkpoint written by a Solver with the same
+        parameters and inputs (`set_inputs` must be called first).
+
+        Args:
+            path: The checkpoint file.
+            verbose: Print the progress of each generation.
+        """
+        checkpoint = load_checkpoint(path)
+        if checkpoint.catalogue_size != len(self._assignments):
+            raise ValueError(
+                "The checkpoint was written for other inputs:"
+                + f" {checkpoint.catalogue_size} assignments instead of"
+                + f" {len(self._assignments)}"
+            )
+        if len(checkpoint.genes) != self._population_size:
+            raise ValueError(
+                f"The checkpoint has {len(checkpoint.genes)} individuals instead"
+                + f" of the population size {self._population_size}"
+            )
+        if checkpoint.termination and len(checkpoint.termination) != len(
+            self._termination
+        ):
+            raise ValueError(
+                f"The checkpoint has {len(checkpoint.termination)} termination"
+                + f" criteria instead of {len(self._termination)}"
+            )
+        self.__run(verbose, checkpoint)
+
+    def __run(self, verbose: bool, checkpoint: Optional[Checkpoint] = None) -> None:
+        """Set up the state of a run and evolve the population, from the start
+        or from a checkpoint.
+        """
         # Check if we have a valid population size
         if self._population_size <= 0:
             raise ValueError("Population size must be greater than 0")
@@ -100,28 +370,386 @@ class Solver:
             raise ValueError(
                 "No assignments provided. Please create them using the set_inputs() method."
             )
-        # Otherwise... run the solver
-        # Generate initial population
-        population = self._toolbox.population(n=self._population_size)  # type: ignore
-        # Evaluate initial population
-        for ind in population:
-            ind.fitness.values = self._toolbox.evaluate(ind)  # type: ignore
+        # Otherwise... run the solver, restarting the random streams from the seed
+        self._streams.reset()
+        self._bank = (
+            None
+            if self._scenario_bank is None
+            else ScenarioBank(
+                NUM_SCENARIOS
+                if self._sampling is None
+                else self._sampling.max_scenarios,
+                np.random.default_rng(self._streams.spawn(1)[0]),
+                NOISE_MEAN,
+                NOISE_STD,
+            )
+        )
+        if self._sampling is not None:
+            self._sampling.reset()
+        # The genotypes are encoded with the ids of the current catalogue
+        if self._cache is not None:
+            self._cache.clear()
+        if self._archive is not None:
+            self._archive.clear()
+        for criterion in self._termination:
+            criterion.reset()
+        self._evaluations = 0 if checkpoint is None else checkpoint.evaluations
+        self._stop_reason = None
+        if self._telemetry is not None:
+            if checkpoint is None:
+                self._telemetry.start(self._cache)
+            else:
+                self._telemetry.start(
+                    self._cache, checkpoint.generation, checkpoint.telemetry_reference
+                )
+        try:
+            self.__dispatch(verbose, checkpoint)
+        finally:
+            if self._telemetry is not None:
+                self._telemetry.close()
+
+    def __dispatch(self, verbose: bool, checkpoint: Optional[Checkpoint]) -> None:
+        """Evolve the population in this process or with the process pool."""
+        if self._workers is None:
+            self.__evolve(verbose, checkpoint)
+            return
+        # Evaluate the individuals in a process pool using the toolbox map
+        with ProcessPoolMap(
+            self._assignments,
+            self._workers,
+            self._streams,
+            self._bank,
+            self._sampling,
+            self._cache,
+        ) as pool_map:
+            self._toolbox.register("map", pool_map)
+            try:
+                self.__evolve(verbose, checkpoint)
+            finally:
+                self._toolbox.register("map", map)
+
+    def __evaluate(self, individuals: list) -> None:
+        """Evaluate the individuals, in the process pool `map` registered on the
+        toolbox if there are workers.
+        """
+        if self._workers is None:
+            # Seed the scenarios and the evaluation noise of each individual as the
+            # process pool does, so both paths give the same results.
+            noise = (
+                None
+                if self._bank is None or not individuals
+                else self._bank.noise(max(len(ind) for ind in individuals))
+            )
+            seeds = self._streams.spawn(len(individuals))
+            self.__assign_plans(individuals)
+            if self._vectorized and noise is not None and self._sampling is None:
+                # Stochastic stage of all the individuals and scenarios at once
+                objectives = population_objectives(
+                    [ind.evaluation_plan for ind in individuals], noise
+                )
+                fitnesses = []
+                for ind, objective, seed in zip(individuals, objectives, seeds):
+                    ind.objective_value = tuple(objective.tolist())
+                    fitnesses.append(
+                        self._toolbox.evaluate(ind, rng=np.random.default_rng(seed))  # type: ignore
+                    )
+            else:
+                # Without a scenario bank (or with adaptive sampling) each individual
+                # draws its own scenarios, so only the deterministic stage above is
+                # batched and the stochastic stage is sampled one individual at a time.
+                fitnesses = [
+                    evaluate_seeded(
+                        self._toolbox.evaluate,  # type: ignore
+                        ind,
+                        seed,
+                        noise,
+                        self._sampling,
+                    )
+                    for ind, seed in zip(individuals, seeds)
+                ]
+        else:
+            fitnesses = self._toolbox.map(self._toolbox.evaluate, individuals)  # type: ignore
+        for ind, fitness in zip(individuals, fitnesses):
+            ind.fitness.values = fitness
+        self._evaluations += len(individuals)
+        if self._archive is not None:
+            # The re-evaluated parents are archived once, by their genotype
+            self._archive.update(
+                individuals,
+                self._toolbox.clone,  # type: ignore
+                partial(genotype_key, catalogue=self._assignments),
+            )
+
+    def __assign_plans(self, individuals: list) -> None:
+        """Set the deterministic stage of the evaluation: reuse the cached plans
+        and compute the missing ones (for the whole batch at once if vectorized).
+        The individuals that already have a plan are skipped.
+        """
+        if self._cache is None and not self._vectorized:
+            return
+        missing = []
+        for ind in individuals:
+            if ind.has_plan:
+                continue
+            key = None
+            if self._cache is not None:
+                key = genotype_key(ind, self._assignments)
+                plan = self._cache.get(key)
+                if plan is not None:
+                    ind.evaluation_plan = plan
+                    continue
+            missing.append((ind, key))
+        if self._vectorized and missing:
+            genes, enrollments = stack_population(
+                [ind for ind, _ in missing], self._assignments
+            )
+            plans = population_plans(
+                self._assignments, genes, enrollments, HARD_PENALTY_WEIGHT
+            )
+            for (ind, _), plan in zip(missing, plans):
+                ind.evaluation_plan = plan
+        if self._cache is not None:
+            for ind, key in missing:
+                self._cache.put(key, ind.evaluation_plan)
+
+    def __update_front(self, population: list) -> None:
+        """Update the reference front of the adaptive sampling."""
+        if self._sampling is not None:
+            self._sampling.update_front(ind.objective_value for ind in population)
+
+    def __improve(self, offspring: list) -> None:
+        """Run the local search (repair) stage over the offspring, within the
+        evaluation and time budget of the generation.
+        """
+        if self._local_search is None or not offspring:
+            return
+        local_search = LOCAL_SEARCHES[self._local_search]
+        deadline = (
+            None
+            if self._local_search_time is None
+            else time.perf_counter() + self._local_search_time
+        )
+        # Repair the infeasible offspring first, starting from the closest to
+        # feasibility. Their plans come from the cache or the batched evaluation.
+        self.__assign_plans(offspring)
+        candidates = sorted(offspring, key=lambda ind: ind.evaluation_plan.hard_penalty)
+        candidates = [
+            ind for ind in candidates if not ind.evaluation_plan.is_feasible
+        ] or candidates
+        budget = self._local_search_budget
+        per_individual = max(1, budget // len(candidates))
+        for ind in candidates:
+            if budget <= 0 or (
+                deadline is not None and time.perf_counter() >= deadline
+            ):
+                break
+            used = local_search(
+                ind,
+                self._assignments,
+                min(per_individual, budget),
+                deadline,
+                rng=self._streams.variation,
+            )
+            budget -= used
+            self._evaluations += used
+
+    def __migrate(self, generation: int, population: list) -> None:
+        """Send the elite individuals to another island and replace the worst
+        individuals of the population with the received ones.
+        """
+        # The selection sorts the population from the best front to the worst
+        emigrants = population[: self._migration.migrants]  # type: ignore
+        genes, enrollments = stack_population(emigrants, self._assignments)
+        genes, enrollments = self._migration.exchange(  # type: ignore
+            generation, genes, enrollments
+        )
+        immigrants = [
+            self._toolbox.from_ids(self._assignments, row, values)  # type: ignore
+            for row, values in zip(genes, enrollments)
+        ]
+        if not immigrants:
+            return
+        self.__evaluate(immigrants)
+        population[-len(immigrants) :] = immigrants
+
+    def __save_checkpoint(self, generation: int, population: list) -> None:
+        """Save the state of the run at the end of a generation."""
+        genes, enrollments = stack_population(population, self._assignments)
+        archive = None
+        if self._archive is not None:
+            members = self._archive.members
+            archive = (
+                *stack_population(members, self._assignments),
+                np.array([ind.fitness.values for ind in members]).reshape(-1, 3),
+                self._archive.objectives,
+            )
+        save_checkpoint(
+            self._checkpoint_path,  # type: ignore
+            Checkpoint(
+                generation=generation,
+                catalogue_size=len(self._assignments),
+                evaluations=self._evaluations,
+                genes=genes,
+                enrollments=enrollments,
+                fitness=np.array([ind.fitness.values for ind in population]),
+                objectives=np.array([ind.objective_value for ind in population]),
+                streams=self._streams.get_state(),
+                bank=None if self._bank is None else self._bank.get_state(),
+                front=None if self._sampling is None else self._sampling.front,
+                archive=archive,
+                telemetry_reference=None
+                if self._telemetry is None
+                else self._telemetry.reference_point,
+                termination=tuple(
+                    criterion.get_state() for criterion in self._termination
+                ),
+            ),
+        )
+
+    def __restore(self, checkpoint: Checkpoint) -> list:
+        """Restore the state of a run from a checkpoint.
+
+        Returns:
+            list: The population at the end of the checkpoint generation.
+        """
+        self._streams.set_state(checkpoint.streams)
+        if self._bank is not None and checkpoint.bank is not None:
+            self._bank.set_state(checkpoint.bank)
+        if self._sampling is not None and checkpoint.front is not None:
+            self._sampling.update_front(checkpoint.front)
+        if self._archive is not None and checkpoint.archive is not None:
+            genes, enrollments, fitness, objectives = checkpoint.archive
+            for ind, values in zip(
+                self.__decode(genes, enrollments, fitness, objectives), objectives
+            ):
+                self._archive.add(ind, values, key=genotype_key(ind, self._assignments))
+        for criterion, state in zip(self._termination, checkpoint.termination):
+            criterion.set_state(state)
+        return self.__decode(
+            checkpoint.genes,
+            checkpoint.enrollments,
+            checkpoint.fitness,
+            checkpoint.objectives,
+        )
+
+    def __decode(
+        self,
+        genes: np.ndarray,
+        enrollments: np.ndarray,
+        fitness: np.ndarray,
+        objectives: np.ndarray,
+    ) -> list:
+        """Build the evaluated individuals stored in a checkpoint."""
+        individuals = []
+        for row, values, fitness_values, objective in zip(
+            genes, enrollments, fitness, objectives
+        ):
+            ind = self._toolbox.from_ids(self._assignments, row, values)  # type: ignore
+            ind.objective_value = tuple(objective.tolist())
+            ind.fitness.values = tuple(fitness_values.tolist())
+            individuals.append(ind)
+        return individuals
+
+    def __should_stop(self, generation: int, population: list) -> bool:
+        """Check the termination criteria at the end of a generation."""
+        if not self._termination:
+            return False
+        state = RunState(
+            generation,
+            self._evaluations,
+            np.array([ind.objective_value for ind in population], dtype=np.float64),
+        )
+        # Update every criterion, so their incremental state stays current
+        met = [
+            type(criterion).__name__
+            for criterion in self._termination
+            if criterion.should_stop(state)
+        ]
+        if met:
+            self._stop_reason = met[0]
+        return bool(met)
+
+    def __evolve(self, verbose: bool, checkpoint: Optional[Checkpoint] = None) -> None:
+        """Run the NSGA-II generations loop, from the start or from a checkpoint."""
+        start = time.perf_counter()
+        if checkpoint is None:
+            # Generate initial population
+            population = self._toolbox.population(n=self._population_size)  # type: ignore
+            # Evaluate initial population
+            self.__evaluate(population)
+            self.__update_front(population)
+            first_generation = 1
+            if self._telemetry is not None:
+                elapsed = time.perf_counter() - start
+                self._telemetry.record(
+                    0,
+                    population,
+                    elapsed=elapsed,
+                    evaluations=self._evaluations,
+                    total_evaluations=self._evaluations,
+                    timings=(0.0, 0.0, elapsed, 0.0),
+                )
+        else:
+            population = self.__restore(checkpoint)
+            first_generation = checkpoint.generation + 1
         # Evolution loop
-        for gen in range(1, self._max_generations + 1):
-            offspring = algorithms.varAnd(
-                population, self._toolbox, cxpb=0.7, mutpb=self._mutation_rate
+        for gen in range(first_generation, self._max_generations + 1):
+            evaluations = self._evaluations
+            # Timestamps of the stages, for the telemetry
+            began = time.perf_counter()
+            offspring = var_and(
+                population,
+                self._toolbox,
+                cxpb=0.7,
+                mutpb=self._mutation_rate,
+                rng=self._streams.variation,
             )
-            for ind in offspring:
-                ind.fitness.values = self._toolbox.evaluate(ind)  # type: ignore
+            varied = time.perf_counter()
+            self.__improve(offspring)
+            improved = time.perf_counter()
+            if self._scenario_bank == "generation":
+                # Draw new scenarios and rescore the parents on them too
+                self._bank.refresh()  # type: ignore
+                self.__evaluate(population + offspring)
+            else:
+                self.__evaluate(offspring)
+            evaluated = time.perf_counter()
             population = self._toolbox.select(  # type: ignore
                 population + offspring, k=self._population_size
             )
+            self.__update_front(population)
+            selected = time.perf_counter()
+            if self._migration is not None and self._migration.is_due(gen):
+                self.__migrate(gen, population)
+            if self._telemetry is not None:
+                self._telemetry.record(
+                    gen,
+                    population,
+                    elapsed=time.perf_counter() - start,
+                    evaluations=self._evaluations - evaluations,
+                    total_evaluations=self._evaluations,
+                    timings=(
+                        varied - began,
+                        improved - varied,
+                        evaluated - improved,
+                        selected - evaluated,
+                    ),
+                )
             if verbose:
                 print(
                     f"Generation {gen} completed. Best objective value: {min(ind.objective_value for ind in population)}"
                 )
+            if self._checkpoint_path is not None and gen % self._checkpoint_every == 0:
+                self.__save_checkpoint(gen, population)
+            if self.__should_stop(gen, population):
+                break
+        else:
+            self._stop_reason = "max_generations"
+        if self._archive is not None:
+            self._result = self._archive.members
+            return
         # Extract the Pareto front (first non-dominated front)
-        self._result = tools.sortNondominated(
+        self._result = NONDOMINATED_SORTS[self._nondominated_sort].sort(
             population, k=len(population), first_front_only=True
         )[0]
 
@@ -138,6 +766,49 @@ class Solver:
         print(f"Final Objective Value: {chromosome.objective_value}")
         return chromosome
 
+    @property
+    def assignments(self) -> AssignmentCatalogue:
+        """The catalogue of valid assignments built by `set_inputs`."""
+        return self._assignments
+
+    @property
+    def telemetry(self) -> Optional[Telemetry]:
+        """The telemetry of the run, with its sinks."""
+        return self._telemetry
+
+    @property
+    def evaluations(self) -> int:
+        """Number of evaluations of the last run."""
+        return self._evaluations
+
+    @property
+    def stop_reason(self) -> Optional[str]:
+        """Why the last run stopped: "max_generations" or the name of the met
+        termination criterion.
+        """
+        return self._stop_reason
+
+    @property
+    def plan_cache(self) -> Optional[PlanCache]:
+        """The genotype cache of the evaluation plans, with its hit and miss counters."""
+        return self._cache
+
+    @property
+    def archive(self) -> Optional[ParetoArchive]:
+        """The Pareto archive of the run, with the stored objective values."""
+        return self._archive
+
+    @property
+    def pareto_front(self) -> list[Chromosome]:
+        """Retrieve the Pareto front (first non-dominated front) of the final population,
+        or the members of the archive if there is one.
+        """
+        if self._result is None:
+            raise RuntimeError(
+                "Solver has not been run yet. Please call solve() first."
+            )
+        return list(self._result)
+
     @property
     def objective_value_result(self) -> tuple[float, float, float]:
         """Retrieve the objective values of the evolutionary optimization."""
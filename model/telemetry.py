@@ -0,0 +1,342 @@
+"""
+Per-generation telemetry of a Solver run.
+
+At the end of each generation, the Solver reports its timings and counters to
+a `Telemetry`, which adds the population statistics (feasible fraction, front
+size, hypervolume, cache hit rate) and emits a `GenerationMetrics` record to
+its sinks:
+
+- `MemorySink`: Keeps the records in a list.
+- `JsonlSink`: Streams one JSON line per generation.
+- `CsvSink`: Streams one CSV row per generation.
+- `CallbackSink`: Calls a function with each record.
+
+Without a telemetry, the Solver only takes a few timestamps per generation, so
+the overhead when it is disabled is negligible.
+"""
+
+import csv
+import json
+import math
+import os
+import typing as tp
+import numpy as np
+
+# Local imports
+from model.cache import PlanCache
+from model.chromosome import HARD_PENALTY_WEIGHT
+from model.sampling import non_dominated
+from model.termination import hypervolume
+
+
+class GenerationMetrics(tp.NamedTuple):
+    """Metrics of a generation. The generation 0 is the initial population."""
+
+    generation: int
+    # Time since the start of the run, in seconds
+    elapsed: float
+    # Evaluations of this generation and since the start of the run
+    evaluations: int
+    total_evaluations: int
+    # Time spent in each stage of the generation, in seconds
+    vary_time: float
+    local_search_time: float
+    evaluate_time: float
+    select_time: float
+    # Hit rate of the plan cache in this generation (NaN without lookups)
+    cache_hit_rate: float
+    # Fraction of the population without hard constraint violations
+    feasible_fraction: float
+    # Size and hypervolume of the first front, normalized by the reference point
+    front_size: int
+    hypervolume: float
+
+
+class MemorySink:
+    """Keep the records in memory."""
+
+    records: tp.List[GenerationMetrics]
+    __slots__ = ("records",)
+
+    def __init__(self):
+        self.records = []
+
+    def open(self, resume_generation: tp.Optional[int] = None) -> None:
+        """Start a run, forgetting the records of the previous one, or those
+        after the checkpoint if the run is resumed.
+        """
+        if resume_generation is None:
+            self.records = []
+        else:
+            self.records = [
+                metrics
+                for metrics in self.records
+                if metrics.generation <= resume_generation
+            ]
+
+    def write(self, metrics: GenerationMetrics) -> None:
+        """Store a record."""
+        self.records.append(metrics)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class JsonlSink:
+    """Stream the records to a JSONL file, one line per generation."""
+
+    path: str
+    _file: tp.Optional[tp.TextIO]
+    __slots__ = ("path", "_file")
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: The JSONL file. It is overwritten by each run, unless resumed.
+        """
+        self.path = path
+        self._file = None
+
+    def open(self, resume_generation: tp.Optional[int] = None) -> None:
+        """Open the file. If the run is resumed, keep the lines up to the
+        checkpoint, as the later generations are going to be run again.
+        """
+        kept = []
+        if resume_generation is not None and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        if json.loads(line)["generation"] <= resume_generation:
+                            kept.append(line)
+                    except (json.JSONDecodeError, KeyError):
+                        # The last line could be incomplete if the run crashed
+                        continue
+        self._file = open(self.path, "w", encoding="utf-8")  # pylint: disable=R1732
+        self._file.writelines(kept)
+
+    def write(self, metrics: GenerationMetrics) -> None:
+        """Write a record as a JSON line."""
+        if self._file is None:
+            raise RuntimeError("The sink is not open")
+        # NaN is not valid JSON, so the missing values are written as null
+        record = {
+            name: None if isinstance(value, float) and math.isnan(value) else value
+            for name, value in metrics._asdict().items()
+        }
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class CsvSink:
+    """Stream the records to a CSV file, with a header row."""
+
+    path: str
+    _file: tp.Optional[tp.TextIO]
+    _writer: tp.Any
+    __slots__ = ("path", "_file", "_writer")
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: The CSV file. It is overwritten by each run, unless resumed.
+        """
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def open(self, resume_generation: tp.Optional[int] = None) -> None:
+        """Open the file. If the run is resumed, keep the rows up to the
+        checkpoint, as the later generations are going to be run again.
+        """
+        kept = []
+        if resume_generation is not None and os.path.exists(self.path):
+            with open(self.path, encoding="utf-8", newline="") as file:
+                # Skip the header, and the last row if the run crashed writing it
+                for row in list(csv.reader(file))[1:]:
+                    if (
+                        len(row) == len(GenerationMetrics._fields)
+                        and int(row[0]) <= resume_generation
+                    ):
+                        kept.append(row)
+        self._file = open(  # pylint: disable=R1732
+            self.path, "w", encoding="utf-8", newline=""
+        )
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(GenerationMetrics._fields)
+        self._writer.writerows(kept)
+
+    def write(self, metrics: GenerationMetrics) -> None:
+        """Write a record as a CSV row."""
+        if self._file is None:
+            raise RuntimeError("The sink is not open")
+        self._writer.writerow(metrics)
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+class CallbackSink:
+    """Call a function with each record (e.g. to feed a progress bar)."""
+
+    callback: tp.Callable[[GenerationMetrics], None]
+    __slots__ = ("callback",)
+
+    def __init__(self, callback: tp.Callable[[GenerationMetrics], None]):
+        self.callback = callback
+
+    def open(self, resume_generation: tp.Optional[int] = None) -> None:
+        """Nothing to prepare."""
+
+    def write(self, metrics: GenerationMetrics) -> None:
+        """Call the function with the record."""
+        self.callback(metrics)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+class Telemetry:
+    """Collect the metrics of each generation and emit them to the sinks."""
+
+    sinks: tp.Tuple[tp.Any, ...]
+    reference: tp.Optional[np.ndarray]
+    _reference: tp.Optional[np.ndarray]
+    _cache: tp.Optional[PlanCache]
+    _cache_counts: tp.Tuple[int, int]
+    __slots__ = ("sinks", "reference", "_reference", "_cache", "_cache_counts")
+
+    def __init__(
+        self,
+        sinks: tp.Sequence[tp.Any],
+        reference: tp.Optional[tp.Sequence[float]] = None,
+    ):
+        """
+        Args:
+            sinks: Where the records are emitted, with
+                `open(resume_generation)`, `write(metrics)` and `close()` methods
+                (e.g. `MemorySink`).
+            reference: Reference point of the hypervolume. If not provided, it
+                is set to 1.1 times the worst objective values of the first
+                recorded population, so the hypervolumes of a run are comparable.
+        """
+        self.sinks = tuple(sinks)
+        self.reference = (
+            None if reference is None else np.asarray(reference, dtype=np.float64)
+        )
+        self._reference = self.reference
+        self._cache = None
+        self._cache_counts = (0, 0)
+
+    def start(
+        self,
+        cache: tp.Optional[PlanCache] = None,
+        resume_generation: tp.Optional[int] = None,
+        reference: tp.Optional[np.ndarray] = None,
+    ) -> None:
+        """Open the sinks at the start of a run.
+
+        Args:
+            cache: The plan cache of the run, if any, to report its hit rate.
+            resume_generation: The generation of the checkpoint, if the run is
+                resumed. The records after it are dropped from the sinks.
+            reference: The reference point of the resumed run (see
+                `reference_point`), so its hypervolumes stay comparable.
+        """
+        self._reference = (
+            self.reference
+            if reference is None
+            else np.asarray(reference, dtype=np.float64)
+        )
+        self._cache = cache
+        self._cache_counts = (0, 0) if cache is None else (cache.hits, cache.misses)
+        for sink in self.sinks:
+            sink.open(resume_generation)
+
+    @property
+    def reference_point(self) -> tp.Optional[np.ndarray]:
+        """The reference point of the hypervolumes of the current run, once set."""
+        return self._reference
+
+    def close(self) -> None:
+        """Close the sinks at the end of a run."""
+        for sink in self.sinks:
+            sink.close()
+
+    def record(  # pylint: disable=R0913
+        self,
+        generation: int,
+        population: tp.Sequence[tp.Any],
+        *,
+        elapsed: float,
+        evaluations: int,
+        total_evaluations: int,
+        timings: tp.Tuple[float, float, float, float],
+    ) -> GenerationMetrics:
+        """Emit the metrics of a generation.
+
+        Args:
+            generation: The generation.
+            population: The population at the end of the generation.
+            elapsed: Time since the start of the run.
+            evaluations: Evaluations of this generation.
+            total_evaluations: Evaluations since the start of the run.
+            timings: Time of the vary, local search, evaluate and select stages.
+
+        Returns:
+            GenerationMetrics: The emitted record.
+        """
+        objectives = np.array(
+            [ind.objective_value for ind in population], dtype=np.float64
+        ).reshape(-1, 3)
+        front = non_dominated(objectives)
+        if self._reference is None and len(objectives):
+            worst = objectives.max(axis=0)
+            self._reference = np.where(worst > 0.0, worst * 1.1, 1.0)
+        volume = (
+            0.0
+            if self._reference is None
+            else hypervolume(front / self._reference, np.ones(3))
+        )
+        metrics = GenerationMetrics(
+            generation=generation,
+            elapsed=elapsed,
+            evaluations=evaluations,
+            total_evaluations=total_evaluations,
+            vary_time=timings[0],
+            local_search_time=timings[1],
+            evaluate_time=timings[2],
+            select_time=timings[3],
+            cache_hit_rate=self.__cache_hit_rate(),
+            feasible_fraction=float(
+                (objectives < HARD_PENALTY_WEIGHT).all(axis=1).mean()
+            )
+            if len(objectives)
+            else 0.0,
+            front_size=len(front),
+            hypervolume=volume,
+        )
+        for sink in self.sinks:
+            sink.write(metrics)
+        return metrics
+
+    def __cache_hit_rate(self) -> float:
+        """Hit rate of the cache since the previous record."""
+        if self._cache is None:
+            return math.nan
+        hits = self._cache.hits - self._cache_counts[0]
+        misses = self._cache.misses - self._cache_counts[1]
+        self._cache_counts = (self._cache.hits, self._cache.misses)
+        if hits + misses == 0:
+            return math.nan
+        return hits / (hits + misses)
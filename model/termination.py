@@ -0,0 +1,233 @@
+"""
+Termination criteria to stop the generations loop before `max_generations`.
+
+After each generation, the Solver passes the state of the run to each criterion
+and stops as soon as one of them is met. The criteria keep a small incremental
+state, so checking them costs little compared with a generation, and the
+checkpoints store it to resume a run:
+
+- `HypervolumeStagnation`: The hypervolume of the front has not improved over a
+  window of generations.
+- `TimeBudget`: A wall-clock budget is exhausted.
+- `EvaluationBudget`: A maximum number of evaluations is reached.
+- `FeasibleFront`: The front has no hard constraint violations.
+"""
+
+import time
+import typing as tp
+from abc import ABC, abstractmethod
+import numpy as np
+
+# Local imports
+from model.chromosome import HARD_PENALTY_WEIGHT
+from model.sampling import non_dominated
+
+
+class RunState(tp.NamedTuple):
+    """State of a run at the end of a generation."""
+
+    generation: int
+    # Number of evaluations since the start of the run
+    evaluations: int
+    # `(pop, 3)` objective values of the population
+    objectives: np.ndarray
+
+
+class TerminationCriterion(ABC):
+    """Base class of the termination criteria."""
+
+    __slots__ = ()
+
+    def reset(self) -> None:
+        """Forget the state of the previous run (called at the start of a run)."""
+
+    def get_state(self) -> tp.Dict[str, tp.Any]:
+        """The incremental state, as a JSON-serializable dict for the checkpoints."""
+        return {}
+
+    def set_state(self, state: tp.Dict[str, tp.Any]) -> None:
+        """Restore a state from `get_state`."""
+
+    @abstractmethod
+    def should_stop(self, state: RunState) -> bool:
+        """Whether the run should stop after this generation."""
+
+
+def hypervolume(front: np.ndarray, reference: np.ndarray) -> float:
+    """Hypervolume dominated by a 3-objective front (minimization) up to a
+    reference point. The front is swept by the last objective, adding the 2D
+    area of the points seen so far between consecutive levels.
+
+    Args:
+        front: A `(n, 3)` matrix of objective values.
+        reference: The reference point.
+
+    Returns:
+        float: The hypervolume.
+    """
+    points = front[(front < reference).all(axis=1)]
+    if len(points) == 0:
+        return 0.0
+    points = points[np.argsort(points[:, 2], kind="stable")]
+    levels = np.append(points[1:, 2], reference[2]) - points[:, 2]
+    volume = 0.0
+    for position, depth in enumerate(levels.tolist()):
+        if depth <= 0.0:
+            continue
+        # Area dominated in the first two objectives by the points seen so far
+        seen = points[: position + 1, :2]
+        seen = seen[np.argsort(seen[:, 0], kind="stable")]
+        lowest = np.minimum.accumulate(seen[:, 1])
+        widths = np.append(seen[1:, 0], reference[0]) - seen[:, 0]
+        volume += float((widths * (reference[1] - lowest)).sum()) * depth
+    return volume
+
+
+class HypervolumeStagnation(TerminationCriterion):
+    """Stop when the hypervolume of the front has improved less than `tolerance`
+    over the last `window` generations.
+
+    The fronts are compared with an anchor: the last front that improved the
+    hypervolume by at least `tolerance`. The objectives are normalized to the
+    bounding box of the anchor, so the comparison adapts to the scale of the
+    objectives, which changes by orders of magnitude once the hard constraints
+    are solved. The box and the hypervolume of the anchor are kept, so each
+    generation computes a single hypervolume.
+    """
+
+    window: int
+    tolerance: float
+    # Generation, bounding box (low corner and span) and hypervolume of the anchor
+    _generation: int
+    _low: tp.Optional[np.ndarray]
+    _span: tp.Optional[np.ndarray]
+    _volume: float
+    __slots__ = ("window", "tolerance", "_generation", "_low", "_span", "_volume")
+
+    def __init__(self, window: int = 20, tolerance: float = 1e-3):
+        """
+        Args:
+            window: Number of generations without improvement before stopping.
+            tolerance: Minimum improvement of the normalized hypervolume (the
+                box of the anchor has a volume of 1) over the window.
+        """
+        if window <= 0:
+            raise ValueError("The window must be greater than 0")
+        self.window = window
+        self.tolerance = tolerance
+        self.reset()
+
+    def reset(self) -> None:
+        self._generation = 0
+        self._low = None
+        self._span = None
+        self._volume = 0.0
+
+    def should_stop(self, state: RunState) -> bool:
+        front = non_dominated(state.objectives)
+        if self._low is None or self._span is None:
+            self.__anchor(state.generation, front)
+            return False
+        volume = hypervolume(
+            (front - self._low) / self._span, np.full(front.shape[1], 1.1)
+        )
+        if volume - self._volume >= self.tolerance:
+            self.__anchor(state.generation, front)
+            return False
+        return state.generation - self._generation >= self.window
+
+    def __anchor(self, generation: int, front: np.ndarray) -> None:
+        """Take the front as the new anchor of the comparisons."""
+        low, high = front.min(axis=0), front.max(axis=0)
+        self._generation = generation
+        self._low = low
+        # A single value in an objective is scaled by its own magnitude
+        self._span = np.where(high > low, high - low, np.maximum(np.abs(high), 1.0))
+        self._volume = hypervolume(
+            (front - self._low) / self._span, np.full(front.shape[1], 1.1)
+        )
+
+    def get_state(self) -> tp.Dict[str, tp.Any]:
+        if self._low is None or self._span is None:
+            return {}
+        return {
+            "generation": self._generation,
+            "low": self._low.tolist(),
+            "span": self._span.tolist(),
+            "volume": self._volume,
+        }
+
+    def set_state(self, state: tp.Dict[str, tp.Any]) -> None:
+        self.reset()
+        if state:
+            self._generation = state["generation"]
+            self._low = np.array(state["low"], dtype=np.float64)
+            self._span = np.array(state["span"], dtype=np.float64)
+            self._volume = state["volume"]
+
+
+class TimeBudget(TerminationCriterion):
+    """Stop once the wall-clock time since the start of the run exceeds a budget.
+
+    A resumed run keeps the time spent before its checkpoint.
+    """
+
+    seconds: float
+    _start: float
+    __slots__ = ("seconds", "_start")
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: The time budget of the run, in seconds.
+        """
+        if seconds <= 0:
+            raise ValueError("The time budget must be greater than 0")
+        self.seconds = seconds
+        self._start = time.perf_counter()
+
+    def reset(self) -> None:
+        self._start = time.perf_counter()
+
+    def should_stop(self, state: RunState) -> bool:
+        return time.perf_counter() - self._start >= self.seconds
+
+    def get_state(self) -> tp.Dict[str, tp.Any]:
+        return {"elapsed": time.perf_counter() - self._start}
+
+    def set_state(self, state: tp.Dict[str, tp.Any]) -> None:
+        self._start = time.perf_counter() - state["elapsed"]
+
+
+class EvaluationBudget(TerminationCriterion):
+    """Stop once the number of evaluations reaches a budget."""
+
+    max_evaluations: int
+    __slots__ = ("max_evaluations",)
+
+    def __init__(self, max_evaluations: int):
+        """
+        Args:
+            max_evaluations: The evaluation budget of the run, counting the
+                evaluations of the population, the offspring and the local search.
+        """
+        if max_evaluations <= 0:
+            raise ValueError("The evaluation budget must be greater than 0")
+        self.max_evaluations = max_evaluations
+
+    def should_stop(self, state: RunState) -> bool:
+        return state.evaluations >= self.max_evaluations
+
+
+class FeasibleFront(TerminationCriterion):
+    """Stop once the front has no hard constraint violations.
+
+    The hard penalty is added to every objective, so a feasible individual
+    dominates all the infeasible ones: the front is feasible as soon as the
+    population has a single feasible individual.
+    """
+
+    __slots__ = ()
+
+    def should_stop(self, state: RunState) -> bool:
+        return bool((state.objectives < HARD_PENALTY_WEIGHT).all(axis=1).any())
@@ -17,7 +17,7 @@ def print_calendar_view(chromosome: Chromosome) -> None:
     """
     # Order the assignments by (day, start)
     sorted_assignments = sorted(
-        chromosome.assignments, key=lambda asg: (asg.schedule.day, asg.schedule.start)
+        chromosome.decoded(), key=lambda asg: (asg.schedule.day, asg.schedule.start)
     )
 
     print("=== Calendar View ===")
@@ -51,7 +51,7 @@ def to_latex_table(chromosome: Chromosome) -> str:
     """
     # Order assignments by (day, start)
     sorted_assignments = sorted(
-        chromosome.assignments, key=lambda asg: (asg.schedule.day, asg.schedule.start)
+        chromosome.decoded(), key=lambda asg: (asg.schedule.day, asg.schedule.start)
     )
 
     # Build table content
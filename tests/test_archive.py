@@ -0,0 +1,101 @@
+"""Dominance, truncation, epsilon boxes and genotypes of the Pareto archive."""
+
+import numpy as np
+import pytest
+
+# Local imports
+from model.archive import ParetoArchive
+from model.cache import genotype_key
+from model.solver import Solver
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import ALL_SCHEDULES
+from thesis_problem.data.subjects import SUBJECTS
+
+
+def _rows(archive: ParetoArchive) -> list:
+    return sorted(map(tuple, archive.objectives.tolist()))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_archive_keeps_the_non_dominated_points(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    points = rng.random((200, 3))
+    archive = ParetoArchive()
+    for position, point in enumerate(points):
+        archive.add(position, point)
+    dominated = [
+        ((points <= point).all(axis=1) & (points < point).any(axis=1)).any()
+        for point in points
+    ]
+    assert _rows(archive) == sorted(map(tuple, points[~np.array(dominated)].tolist()))
+    # The members are kept with their objective values, sorted by the first one
+    for member, objectives in archive:
+        assert objectives == tuple(points[member].tolist())
+    assert np.all(np.diff(archive.objectives[:, 0]) >= 0)
+
+
+def test_archive_rejects_dominated_and_equal_points() -> None:
+    archive = ParetoArchive()
+    assert archive.add("a", (1.0, 1.0, 1.0))
+    assert not archive.add("b", (1.0, 1.0, 1.0))
+    assert not archive.add("c", (1.0, 2.0, 1.0))
+    assert archive.add("d", (0.0, 2.0, 1.0))
+    # A point that dominates both replaces them
+    assert archive.add("e", (0.0, 1.0, 1.0))
+    assert archive.members == ["e"]
+    assert archive.best() == ("e", (0.0, 1.0, 1.0))
+
+
+def test_truncation_drops_the_most_crowded_member() -> None:
+    archive = ParetoArchive(max_size=3)
+    for name, point in (
+        ("first", (0.0, 4.0, 0.0)),
+        ("crowded", (1.0, 3.0, 0.0)),
+        ("middle", (1.1, 2.9, 0.0)),
+        ("last", (4.0, 0.0, 0.0)),
+    ):
+        archive.add(name, point)
+    assert archive.members == ["first", "middle", "last"]
+
+
+def test_epsilon_boxes_keep_one_member() -> None:
+    archive = ParetoArchive(epsilon=1.0)
+    assert archive.add("a", (0.5, 0.5, 0.5))
+    # Same box, neither dominating nor closer to the corner of the box
+    assert not archive.add("b", (0.2, 0.9, 0.9))
+    # Same box and closer to the corner: it replaces the member
+    assert archive.add("c", (0.1, 0.1, 0.1))
+    assert archive.members == ["c"]
+    # A dominated box, although the point itself is not dominated
+    assert not archive.add("d", (1.5, 0.05, 0.05))
+    # A box that is not dominated
+    assert archive.add("e", (-0.5, 2.0, 2.0))
+    assert archive.members == ["e", "c"]
+    assert len(archive) == 2
+
+
+def test_genotypes_are_archived_once() -> None:
+    archive = ParetoArchive()
+    assert archive.add("a", (1.0, 2.0, 3.0), key="a")
+    # Re-evaluated with other values: the first ones are kept
+    assert not archive.add("a", (0.0, 0.0, 0.0), key="a")
+    assert _rows(archive) == [(1.0, 2.0, 3.0)]
+    # Once dropped, the genotype can be archived again
+    assert archive.add("b", (0.0, 1.0, 1.0), key="b")
+    assert archive.members == ["b"]
+    assert archive.add("a", (-1.0, 5.0, 5.0), key="a")
+    assert archive.members == ["a", "b"]
+    archive.clear()
+    assert archive.add("b", (0.0, 1.0, 1.0), key="b")
+
+
+def test_solver_archives_each_genotype_once() -> None:
+    solver = Solver(
+        20, 20, 0.1, seed=1, scenario_bank="generation", archive=ParetoArchive()
+    )
+    solver.set_inputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES)
+    solver.solve()
+    assert solver.archive is not None
+    keys = [genotype_key(ind, solver.assignments) for ind in solver.archive.members]
+    assert len(keys) == len(set(keys))
@@ -0,0 +1,76 @@
+"""Genotype keys and the default plan cache of each representation."""
+
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model.cache import genotype_key
+from model.compact import REPRESENTATIONS
+from model.igniters import generate_valid_assignments
+from model.solver import Solver
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import ALL_SCHEDULES
+from thesis_problem.data.subjects import SUBJECTS
+
+CATALOGUE = generate_valid_assignments(SUBJECTS, PROFESSORS, CLASSROOMS, ALL_SCHEDULES)
+
+
+def test_genotype_key_is_the_same_in_every_representation() -> None:
+    rng = np.random.default_rng(0)
+    genes = [int(rng.choice(CATALOGUE.for_subject(s.name))) for s in SUBJECTS]
+    enrollments = rng.integers(10, 31, size=len(genes)).tolist()
+    keys = {
+        genotype_key(cls.from_ids(CATALOGUE, genes, enrollments), CATALOGUE)
+        for cls in REPRESENTATIONS.values()
+    }
+    assert len(keys) == 1
+    # Another enrollment gives another key
+    changed = REPRESENTATIONS["compact"].from_ids(
+        CATALOGUE, genes, [enrollments[0] + 1, *enrollments[1:]]
+    )
+    assert genotype_key(changed, CATALOGUE) not in keys
+
+
+@pytest.mark.parametrize(
+    "representation, cache_size, expected",
+    (
+        ("compact", None, 4096),
+        ("list", None, None),
+        ("list", 128, 128),
+        ("compact", 0, None),
+    ),
+)
+def test_default_plan_cache(
+    representation: str, cache_size: tp.Optional[int], expected: tp.Optional[int]
+) -> None:
+    solver = Solver(10, 1, 0.1, representation=representation, cache_size=cache_size)
+    if expected is None:
+        assert solver.plan_cache is None
+    else:
+        assert solver.plan_cache is not None
+        assert solver.plan_cache.maxsize == expected
+
+
+@pytest.mark.parametrize("representation", sorted(REPRESENTATIONS))
+def test_local_search_with_batched_plans(representation: str) -> None:
+    """The offspring plans are set before the local search sorts them, from the
+    cache or the batched evaluation, without changing the run.
+    """
+    fronts = []
+    for vectorized in (False, True):
+        solver = Solver(
+            20,
+            5,
+            0.1,
+            seed=3,
+            representation=representation,
+            local_search="tabu",
+            local_search_budget=20,
+            vectorized=vectorized,
+        )
+        solver.set_inputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES)
+        solver.solve()
+        fronts.append(sorted(ind.objective_value for ind in solver.pareto_front))
+    assert fronts[0] == fronts[1]
@@ -0,0 +1,87 @@
+"""A run resumed from a checkpoint must end as the same uninterrupted run."""
+
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model.archive import ParetoArchive
+from model.checkpoint import load_checkpoint
+from model.sampling import AdaptiveSampling
+from model.solver import Solver
+from model.termination import HypervolumeStagnation
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import ALL_SCHEDULES
+from thesis_problem.data.subjects import SUBJECTS
+
+CONFIGURATIONS: tp.Dict[str, tp.Callable[[], tp.Dict[str, tp.Any]]] = {
+    "list": lambda: {},
+    "compact": lambda: {"representation": "compact", "nondominated_sort": "numpy"},
+    "scenario_bank": lambda: {"scenario_bank": "generation"},
+    "sampling_archive": lambda: {
+        "adaptive_sampling": AdaptiveSampling(),
+        "archive": ParetoArchive(),
+    },
+    "local_search": lambda: {"local_search": "tabu", "local_search_budget": 20},
+}
+
+
+def _solver(generations: int, configuration: str, **kwargs: tp.Any) -> Solver:
+    solver = Solver(
+        20, generations, 0.1, seed=5, **CONFIGURATIONS[configuration](), **kwargs
+    )
+    solver.set_inputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES)
+    return solver
+
+
+def _front(solver: Solver) -> tp.List[tp.Tuple[float, float, float]]:
+    return sorted(ind.objective_value for ind in solver.pareto_front)
+
+
+@pytest.mark.parametrize("configuration", sorted(CONFIGURATIONS))
+def test_resume_matches_uninterrupted_run(tmp_path, configuration: str) -> None:
+    path = str(tmp_path / "run.npz")
+    straight = _solver(12, configuration)
+    straight.solve()
+    # The interrupted run stops right after its checkpoint of the generation 6
+    _solver(6, configuration, checkpoint_path=path, checkpoint_every=3).solve()
+    assert load_checkpoint(path).generation == 6
+    resumed = _solver(12, configuration)
+    resumed.resume(path)
+    assert resumed.objective_value_result == straight.objective_value_result
+    assert _front(resumed) == _front(straight)
+    assert resumed.evaluations == straight.evaluations
+    if straight.archive is not None:
+        assert resumed.archive is not None
+        np.testing.assert_array_equal(
+            resumed.archive.objectives, straight.archive.objectives
+        )
+
+
+def test_resume_checks_the_population_size(tmp_path) -> None:
+    path = str(tmp_path / "run.npz")
+    _solver(3, "list", checkpoint_path=path, checkpoint_every=3).solve()
+    solver = Solver(10, 6, 0.1, seed=5)
+    solver.set_inputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES)
+    with pytest.raises(ValueError, match="individuals"):
+        solver.resume(path)
+
+
+def test_resume_keeps_the_termination_state(tmp_path) -> None:
+    path = str(tmp_path / "run.npz")
+
+    def solver(generations: int, **kwargs: tp.Any) -> Solver:
+        criterion = HypervolumeStagnation(window=3, tolerance=1e-2)
+        return _solver(generations, "list", termination=(criterion,), **kwargs)
+
+    straight = solver(30)
+    straight.solve()
+    assert straight.stop_reason == "HypervolumeStagnation"
+    # The anchor of the criterion is older than the checkpoint
+    solver(16, checkpoint_path=path, checkpoint_every=8).solve()
+    resumed = solver(30)
+    resumed.resume(path)
+    assert resumed.stop_reason == "HypervolumeStagnation"
+    assert resumed.evaluations == straight.evaluations
+    assert _front(resumed) == _front(straight)
@@ -0,0 +1,83 @@
+"""
+The conflict report of a chromosome must count the overlap hours of the classes
+of each classroom and professor, as a brute-force sweep over every hour boundary.
+"""
+
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model.compact import REPRESENTATIONS
+from model.igniters import ENROLLMENT_RANGE, generate_valid_assignments
+from model.types import Assignment
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import generate_schedules
+from thesis_problem.data.subjects import SUBJECTS
+
+# Blocks of 1, 2 and 3 hours, so the classes can partially overlap
+SCHEDULES = sorted(
+    {schedule for size in (1, 2, 3) for schedule in generate_schedules(size)}
+)
+CATALOGUE = generate_valid_assignments(
+    SUBJECTS, PROFESSORS, CLASSROOMS, SCHEDULES, prune=False
+)
+
+
+def _overlap_hours(genes: tp.Sequence[Assignment]) -> tp.Tuple[int, float, bool]:
+    """Conflicts and hours with more than one class (per extra class) of each
+    classroom-day and professor-day, and whether two classes overlap partially.
+    """
+    conflicts, hours, partial = 0, 0.0, False
+    for owner in ("classroom", "professor"):
+        groups: tp.Dict[tp.Any, tp.List[tp.Tuple[float, float]]] = {}
+        for gene in genes:
+            key = (getattr(gene, owner), gene.schedule.day)
+            groups.setdefault(key, []).append((gene.schedule.start, gene.schedule.end))
+        for intervals in groups.values():
+            intervals.sort()
+            # A class conflicts if it starts before an earlier class ends
+            running_end, previous = -np.inf, None
+            for start, end in intervals:
+                conflicts += start < running_end
+                partial |= start < running_end and (start, end) != previous
+                running_end, previous = max(running_end, end), (start, end)
+            bounds = sorted({time for interval in intervals for time in interval})
+            for low, high in zip(bounds, bounds[1:]):
+                running = sum(start <= low and high <= end for start, end in intervals)
+                hours += max(running - 1, 0) * (high - low)
+    return conflicts, hours, partial
+
+
+@pytest.mark.parametrize("representation", sorted(REPRESENTATIONS))
+@pytest.mark.parametrize("seed", (0, 1, 2))
+def test_conflict_report_overlap_hours(representation: str, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    partial = False
+    for _ in range(20):
+        genes = [
+            int(rng.choice(CATALOGUE.for_subject(subject.name))) for subject in SUBJECTS
+        ]
+        enrollments = rng.integers(
+            ENROLLMENT_RANGE[0], ENROLLMENT_RANGE[1] + 1, size=len(genes)
+        ).tolist()
+        chromosome = REPRESENTATIONS[representation].from_ids(
+            CATALOGUE, genes, enrollments
+        )
+        report = chromosome.conflict_report
+        conflicts, hours, overlaps = _overlap_hours(chromosome.decoded())
+        assert report.conflicts == conflicts
+        assert report.overlap_hours == pytest.approx(hours)
+        partial |= overlaps
+    assert partial
+
+
+def test_is_evaluated() -> None:
+    genes = [int(CATALOGUE.for_subject(subject.name)[0]) for subject in SUBJECTS]
+    chromosome = REPRESENTATIONS["list"].from_ids(CATALOGUE, genes, [20] * len(genes))
+    assert not chromosome.is_evaluated
+    chromosome.reevaluate(0)
+    assert chromosome.is_evaluated
+    chromosome[0] = chromosome[0]._replace(expected_enrollment=21)
+    assert not chromosome.is_evaluated
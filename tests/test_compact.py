@@ -0,0 +1,51 @@
+"""Equality, repr, copies and pickling of the compact chromosomes."""
+
+import copy
+import pickle
+import typing as tp
+import numpy as np
+
+# Local imports
+from model.chromosome import Chromosome
+from model.compact import CompactChromosome
+from model.igniters import generate_valid_assignments
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import ALL_SCHEDULES
+from thesis_problem.data.subjects import SUBJECTS
+
+CATALOGUE = generate_valid_assignments(SUBJECTS, PROFESSORS, CLASSROOMS, ALL_SCHEDULES)
+
+
+def _ids(seed: int) -> tp.Tuple[tp.List[int], tp.List[int]]:
+    """Random assignment ids and enrollments, with a gene per subject."""
+    rng = np.random.default_rng(seed)
+    genes = [
+        int(rng.choice(CATALOGUE.for_subject(subject.name))) for subject in SUBJECTS
+    ]
+    return genes, rng.integers(10, 31, size=len(genes)).tolist()
+
+
+def test_equality() -> None:
+    first = CompactChromosome(CATALOGUE, *_ids(0))
+    assert first == CompactChromosome(CATALOGUE, *_ids(0))
+    assert first != CompactChromosome(CATALOGUE, *_ids(1))
+    assert first == copy.deepcopy(first)
+    assert first == pickle.loads(pickle.dumps(first))
+    # The same genes over another catalogue are decoded to compare them
+    other = generate_valid_assignments(SUBJECTS, PROFESSORS, CLASSROOMS, ALL_SCHEDULES)
+    assert first == CompactChromosome.from_ids(other, *first.to_ids(other))
+    # Changing a gene (here, its enrollment) breaks the equality
+    changed = copy.deepcopy(first)
+    changed[0] = changed[0]._replace(
+        expected_enrollment=changed[0].expected_enrollment + 1
+    )
+    assert first != changed
+    # Both representations are different classes, as with any dataclass
+    assert first != Chromosome.from_ids(CATALOGUE, *_ids(0))
+
+
+def test_repr() -> None:
+    compact = CompactChromosome(CATALOGUE, *_ids(0))
+    as_list = Chromosome.from_ids(CATALOGUE, *_ids(0))
+    assert repr(compact) == repr(as_list).replace("Chromosome", "CompactChromosome", 1)
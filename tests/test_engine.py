@@ -0,0 +1,192 @@
+"""
+The evaluation plan must give the objective values of the original per-scenario
+loop of `Chromosome.objective_value`, reproduced here as the reference: the
+hard penalty recomputed in every scenario, and one stochastic factor drawn for
+each CC transition, PH block and CB ratio.
+"""
+
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model import engine
+from model.chromosome import (
+    HARD_PENALTY_WEIGHT,
+    W1,
+    W2,
+    W3,
+    Chromosome,
+    expected_objective,
+    scenario_objective,
+)
+from model.compact import REPRESENTATIONS
+from model.igniters import ENROLLMENT_RANGE, generate_valid_assignments
+from model.types import Assignment
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import generate_schedules
+from thesis_problem.data.subjects import SUBJECTS
+
+# Catalogues of aligned blocks of 1 and 2 hours, so the classes of a classroom
+# or a professor either share the exact slot or do not overlap, as the legacy
+# hard constraints assumed. Without pruning, they have classrooms of the wrong
+# type too.
+CATALOGUES = {
+    block_size: generate_valid_assignments(
+        SUBJECTS, PROFESSORS, CLASSROOMS, generate_schedules(block_size), prune=False
+    )
+    for block_size in (1, 2)
+}
+# Factor of the term of an objective (0: CC, 1: PH, 2: CB) owned by a gene
+Factor = tp.Callable[[int, int], float]
+
+
+def _legacy_hard_penalty(assignments: tp.Sequence[Assignment]) -> float:
+    classroom_usage: tp.Dict[tp.Any, int] = {}
+    professor_usage: tp.Dict[tp.Any, int] = {}
+    for asg in assignments:
+        slot = (asg.schedule.day, asg.schedule.start, asg.schedule.end)
+        key_room = (asg.classroom, *slot)
+        classroom_usage[key_room] = classroom_usage.get(key_room, 0) + 1
+        key_prof = (asg.professor, *slot)
+        professor_usage[key_prof] = professor_usage.get(key_prof, 0) + 1
+    penalty = 0.0
+    for count in (*classroom_usage.values(), *professor_usage.values()):
+        if count > 1:
+            penalty += (count - 1) * HARD_PENALTY_WEIGHT
+    for asg in assignments:
+        if asg.expected_enrollment > asg.classroom.capacity:
+            penalty += (
+                asg.expected_enrollment - asg.classroom.capacity
+            ) * HARD_PENALTY_WEIGHT
+        elif asg.expected_enrollment < asg.classroom.capacity * 0.5:
+            penalty += (
+                asg.classroom.capacity - asg.expected_enrollment
+            ) * HARD_PENALTY_WEIGHT
+        if asg.classroom.type != asg.subject.type and asg.subject.type.value != "MIX":
+            penalty += HARD_PENALTY_WEIGHT
+    return penalty
+
+
+def _legacy_scenario(
+    assignments: tp.Sequence[Assignment], factor: Factor
+) -> tp.Tuple[float, float, float]:
+    penalty_cc = 0.0
+    prof_day: tp.Dict[tp.Any, tp.List[tp.Tuple[int, Assignment]]] = {}
+    for position, asg in enumerate(assignments):
+        prof_day.setdefault((asg.professor, asg.schedule.day), []).append(
+            (position, asg)
+        )
+    for genes in prof_day.values():
+        genes.sort(key=lambda gene: gene[1].schedule.start)
+        for (_, prev), (position, curr) in zip(genes, genes[1:]):
+            if prev.classroom != curr.classroom:
+                penalty_cc += 1.0 * factor(0, position)
+    penalty_ph = 0.0
+    penalty_cb = 0.0
+    for position, asg in enumerate(assignments):
+        duration = asg.schedule.end - asg.schedule.start
+        if duration < 2.0:
+            penalty_ph += (2.0 - duration) * factor(1, position)
+        if asg.classroom.capacity < asg.expected_enrollment:
+            penalty_cb += (asg.expected_enrollment / asg.classroom.capacity) * factor(
+                2, position
+            )
+    hard_penalty = _legacy_hard_penalty(assignments)
+    return (
+        W1 * penalty_cc + hard_penalty,
+        W2 * penalty_ph + hard_penalty,
+        W3 * penalty_cb + hard_penalty,
+    )
+
+
+def _legacy_objective(
+    assignments: tp.Sequence[Assignment], noise: np.ndarray
+) -> np.ndarray:
+    """Average of the legacy scenarios, with the factors taken from `noise`."""
+    return np.mean(
+        [
+            _legacy_scenario(
+                assignments, lambda k, position, s=s: float(noise[s, k, position])
+            )
+            for s in range(len(noise))
+        ],
+        axis=0,
+    )
+
+
+def _chromosomes(
+    representation: str, block_size: int, seed: int, count: int = 20
+) -> tp.List[Chromosome]:
+    """Random chromosomes, with a gene per subject."""
+    catalogue = CATALOGUES[block_size]
+    rng = np.random.default_rng(seed)
+    chromosomes = []
+    for _ in range(count):
+        genes = [
+            int(rng.choice(catalogue.for_subject(subject.name))) for subject in SUBJECTS
+        ]
+        enrollments = rng.integers(
+            ENROLLMENT_RANGE[0], ENROLLMENT_RANGE[1] + 1, size=len(genes)
+        ).tolist()
+        chromosomes.append(
+            REPRESENTATIONS[representation].from_ids(catalogue, genes, enrollments)
+        )
+    return chromosomes
+
+
+@pytest.mark.parametrize("representation", sorted(REPRESENTATIONS))
+@pytest.mark.parametrize("block_size", sorted(CATALOGUES))
+@pytest.mark.parametrize("seed", (0, 1, 2))
+def test_plan_matches_legacy_objective(
+    representation: str, block_size: int, seed: int
+) -> None:
+    rng = np.random.default_rng(seed)
+    for chromosome in _chromosomes(representation, block_size, seed):
+        genes = chromosome.decoded()
+        plan = chromosome.evaluation_plan
+        assert plan.hard_penalty == _legacy_hard_penalty(genes)
+        noise = rng.normal(1.0, 0.1, size=(10, 3, len(genes)))
+        np.testing.assert_allclose(
+            scenario_objective(plan, noise),
+            _legacy_objective(genes, noise),
+            rtol=1e-12,
+        )
+        np.testing.assert_allclose(
+            expected_objective(plan),
+            _legacy_objective(genes, np.ones((1, 3, len(genes)))),
+            rtol=1e-12,
+        )
+
+
+def test_chromosomes_cover_every_term() -> None:
+    """The random chromosomes have conflicts, type mismatches and every soft
+    term, so the comparison above checks all of them.
+    """
+    chromosomes = [
+        chromosome
+        for block_size in CATALOGUES
+        for chromosome in _chromosomes("list", block_size, 0)
+    ]
+    conflicts = sum(
+        rooms.conflicts + professors.conflicts
+        for rooms, professors in (
+            engine.conflict_reports(chromosome.encode()) for chromosome in chromosomes
+        )
+    )
+    mismatches = sum(
+        asg.classroom.type != asg.subject.type and asg.subject.type.value != "MIX"
+        for chromosome in chromosomes
+        for asg in chromosome.decoded()
+    )
+    terms = np.sum(
+        [
+            (chromosome.evaluation_plan.weights > 0).sum(axis=1)
+            for chromosome in chromosomes
+        ],
+        axis=0,
+    )
+    assert conflicts > 0
+    assert mismatches > 0
+    assert (terms > 0).all()
@@ -0,0 +1,40 @@
+"""Resume of an interrupted batch of replicas from its results file."""
+
+import pytest
+
+# Local imports
+from model.experiments import (
+    ExperimentConfig,
+    ExperimentRunner,
+    ReplicaResult,
+    replica_seeds,
+)
+from thesis_problem.data.synthetic import SyntheticConfig, generate_instance
+
+CONFIG = ExperimentConfig(population_size=6, max_generations=2, mutation_rate=0.1)
+INPUTS = generate_instance(SyntheticConfig(seed=0).scaled(0.3))
+
+
+def _runner(path: str) -> ExperimentRunner:
+    return ExperimentRunner(CONFIG, INPUTS, workers=1, results_path=path)
+
+
+def test_resume_drops_partial_line(tmp_path) -> None:
+    path = str(tmp_path / "results.jsonl")
+    _runner(path).run(2)
+    # Interrupt the write of the third replica halfway through its line
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"replica": 2, "seed": ')
+    summary = _runner(path).run(3, resume=True)
+    with open(path, encoding="utf-8") as file:
+        results = [ReplicaResult.from_json(line) for line in file]
+    assert sorted(result.replica for result in results) == [0, 1, 2]
+    assert [result.seed for result in sorted(results)] == replica_seeds(3, 0)
+    assert summary == _runner(str(tmp_path / "straight.jsonl")).run(3)
+
+
+def test_resume_with_another_base_seed(tmp_path) -> None:
+    path = str(tmp_path / "results.jsonl")
+    _runner(path).run(2, base_seed=0)
+    with pytest.raises(ValueError, match="base seed"):
+        _runner(path).run(3, base_seed=1, resume=True)
@@ -0,0 +1,61 @@
+"""
+The catalogue built from the availability masks must hold the same assignments
+as the original filter of every (subject, professor, classroom, schedule)
+combination, reproduced here as the reference.
+"""
+
+import typing as tp
+import pytest
+
+# Local imports
+from model.igniters import generate_valid_assignments, is_classroom_suitable
+from model.types import Assignment, Schedule
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import generate_schedules
+from thesis_problem.data.subjects import SUBJECTS
+
+
+def is_schedule_compatible(
+    schedule: Schedule, available_schedules: tp.Sequence[Schedule]
+) -> bool:
+    """Whether the schedule fits within any of the available schedules."""
+    return any(
+        schedule.day == avail.day
+        and schedule.start >= avail.start
+        and schedule.end <= avail.end
+        for avail in available_schedules
+    )
+
+
+def _legacy_assignments(
+    schedules: tp.Sequence[Schedule], prune: bool
+) -> tp.Set[Assignment]:
+    valid = set()
+    for subject in SUBJECTS:
+        for prof in PROFESSORS:
+            if subject.name not in prof.subjects:
+                continue
+            for room in CLASSROOMS:
+                if prune and not is_classroom_suitable(subject, room):
+                    continue
+                for sched in schedules:
+                    if (
+                        is_schedule_compatible(sched, prof.schedules)
+                        and sched.start >= room.start_hour
+                        and sched.end <= room.end_hour
+                    ):
+                        valid.add(Assignment(subject, room, prof, sched, 0))
+    return valid
+
+
+@pytest.mark.parametrize("prune", (True, False))
+@pytest.mark.parametrize("block_size", (1, 2, 3))
+def test_catalogue_matches_legacy_filter(block_size: int, prune: bool) -> None:
+    schedules = generate_schedules(block_size)
+    catalogue = generate_valid_assignments(
+        SUBJECTS, PROFESSORS, CLASSROOMS, schedules, prune=prune
+    )
+    expected = _legacy_assignments(schedules, prune)
+    assert len(catalogue) == len(expected)
+    assert set(catalogue) == expected
@@ -0,0 +1,93 @@
+"""
+The incremental evaluation must keep the same plan as a full evaluation of the
+chromosome after every single-gene change, including classes that partially
+overlap in a classroom or for a professor.
+"""
+
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model.chromosome import HARD_PENALTY_WEIGHT, Chromosome
+from model.compact import REPRESENTATIONS
+from model.engine import EvaluationPlan
+from model.igniters import ENROLLMENT_RANGE, generate_valid_assignments
+from model.incremental import gene_hard_units
+from model.types import Assignment
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import generate_schedules
+from thesis_problem.data.subjects import SUBJECTS
+
+# Blocks of 1, 2 and 3 hours, so the classes can partially overlap
+SCHEDULES = sorted(
+    {schedule for size in (1, 2, 3) for schedule in generate_schedules(size)}
+)
+CATALOGUE = generate_valid_assignments(
+    SUBJECTS, PROFESSORS, CLASSROOMS, SCHEDULES, prune=False
+)
+
+
+def _random_gene(subject: str, rng: np.random.Generator) -> Assignment:
+    """A random assignment of the subject, with a random enrollment."""
+    gene = CATALOGUE[int(rng.choice(CATALOGUE.for_subject(subject)))]
+    enrollment = int(rng.integers(ENROLLMENT_RANGE[0], ENROLLMENT_RANGE[1] + 1))
+    return gene._replace(expected_enrollment=enrollment)
+
+
+def _conflicting_genes(genes: tp.Sequence[Assignment]) -> tp.List[int]:
+    """Genes with a hard violation of their own, or overlapping another class of
+    their classroom or professor, comparing every pair.
+    """
+    conflicting = {idx for idx, gene in enumerate(genes) if gene_hard_units(gene)}
+    for i, first in enumerate(genes):
+        for j in range(i + 1, len(genes)):
+            second = genes[j]
+            if (
+                first.schedule.day == second.schedule.day
+                and (
+                    first.classroom == second.classroom
+                    or first.professor == second.professor
+                )
+                and first.schedule.start < second.schedule.end
+                and second.schedule.start < first.schedule.end
+            ):
+                conflicting.update((i, j))
+    return sorted(conflicting)
+
+
+def _assert_same_plan(chromosome: Chromosome) -> None:
+    full = EvaluationPlan.from_encoded(chromosome.encode(), HARD_PENALTY_WEIGHT)
+    incremental = chromosome.evaluation_plan
+    assert incremental.hard_penalty == pytest.approx(full.hard_penalty)
+    np.testing.assert_allclose(incremental.weights, full.weights, atol=1e-12)
+
+
+@pytest.mark.parametrize("representation", sorted(REPRESENTATIONS))
+@pytest.mark.parametrize("seed", (0, 1, 2))
+def test_incremental_matches_full_evaluation(representation: str, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    ids, enrollments = Chromosome(
+        [_random_gene(subject.name, rng) for subject in SUBJECTS]
+    ).to_ids(CATALOGUE)
+    chromosome = REPRESENTATIONS[representation].from_ids(
+        CATALOGUE, ids.tolist(), enrollments.tolist()
+    )
+    chromosome.enable_incremental()
+    _assert_same_plan(chromosome)
+    for _ in range(200):
+        index = int(rng.integers(len(chromosome)))
+        if rng.random() < 0.3:
+            # Move the class to the slot of another gene, to force overlaps
+            other = chromosome[int(rng.integers(len(chromosome)))]
+            candidate = chromosome[index]._replace(schedule=other.schedule)
+            if candidate not in CATALOGUE:
+                continue
+            chromosome[index] = candidate
+        else:
+            chromosome[index] = _random_gene(chromosome[index].subject.name, rng)
+        _assert_same_plan(chromosome)
+        assert chromosome.conflicting_genes() == _conflicting_genes(
+            chromosome.decoded()
+        )
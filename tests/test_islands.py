@@ -0,0 +1,93 @@
+"""Migration topologies, epoch buffering and transports of the island model."""
+
+import queue
+import numpy as np
+import pytest
+
+# Local imports
+from model.experiments import ExperimentConfig, ProblemInputs
+from model.islands import (
+    IslandModel,
+    Migration,
+    QueueTransport,
+    random_topology,
+    ring_topology,
+)
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import ALL_SCHEDULES
+from thesis_problem.data.subjects import SUBJECTS
+
+CONFIG = ExperimentConfig(population_size=10, max_generations=6, mutation_rate=0.1)
+INPUTS = ProblemInputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES)
+
+
+def _is_single_cycle(targets: np.ndarray) -> bool:
+    """Following the destinations from the island 0 visits every island."""
+    island, visited = 0, set()
+    while island not in visited:
+        visited.add(island)
+        island = int(targets[island])
+    return island == 0 and len(visited) == len(targets)
+
+
+def test_ring_topology() -> None:
+    np.testing.assert_array_equal(ring_topology(4, 3, 7), [1, 2, 3, 0])
+    np.testing.assert_array_equal(ring_topology(1, 0, 0), [0])
+
+
+@pytest.mark.parametrize("n_islands", (2, 3, 5))
+def test_random_topology_is_a_ring(n_islands: int) -> None:
+    rings = [random_topology(n_islands, epoch, 11) for epoch in range(20)]
+    for epoch, targets in enumerate(rings):
+        assert _is_single_cycle(targets)
+        # The islands draw the same ring from the shared seed
+        np.testing.assert_array_equal(targets, random_topology(n_islands, epoch, 11))
+    if n_islands > 3:
+        assert len({tuple(targets.tolist()) for targets in rings}) > 1
+
+
+def _message(epoch: int) -> tuple:
+    return epoch, np.full((1, 2), epoch), np.full((1, 2), 10 + epoch)
+
+
+def test_exchange_buffers_the_next_epochs() -> None:
+    inboxes = [queue.Queue(), queue.Queue()]
+    migration = Migration(
+        QueueTransport(inboxes, 0), 0, 2, interval=5, migrants=1, timeout=0.1
+    )
+    # The other island is faster: its migrants of the epoch 2 arrive first
+    inboxes[0].put(_message(2))
+    inboxes[0].put(_message(1))
+    genes, enrollments = migration.exchange(5, np.zeros((1, 2)), np.zeros((1, 2)))
+    np.testing.assert_array_equal(genes, [[1, 1]])
+    np.testing.assert_array_equal(enrollments, [[11, 11]])
+    # The emigrants went to the other island
+    assert inboxes[1].get_nowait()[0] == 1
+    # The buffered epoch is taken without waiting
+    genes, _ = migration.exchange(10, np.zeros((1, 2)), np.zeros((1, 2)))
+    np.testing.assert_array_equal(genes, [[2, 2]])
+    with pytest.raises(RuntimeError, match="epoch 3"):
+        migration.exchange(15, np.zeros((1, 2)), np.zeros((1, 2)))
+
+
+@pytest.mark.parametrize("topology", ("ring", "random"))
+def test_local_and_process_transports_match(topology: str) -> None:
+    results = [
+        IslandModel(
+            CONFIG,
+            INPUTS,
+            3,
+            interval=2,
+            migrants=2,
+            topology=topology,
+            transport=transport,
+        ).run(seed=4)
+        for transport in ("local", "process")
+    ]
+    local, process = results
+    assert local.objective_value == process.objective_value
+    assert sorted(local.pareto_front) == sorted(process.pareto_front)
+    for first, second in zip(local.islands, process.islands):
+        assert first.objective_value == second.objective_value
+        np.testing.assert_array_equal(first.genes, second.genes)
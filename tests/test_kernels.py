@@ -0,0 +1,92 @@
+"""
+Every kernels backend must give the same conflicts as a plain Python sweep of
+each group, on seeded random intervals with ties, nested and touching intervals.
+"""
+
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model import kernels
+from model.conflicts import conflicts_per_owner, count_conflicts, detect_conflicts
+
+BACKENDS = [
+    "python",
+    "numpy",
+    pytest.param(
+        "numba",
+        marks=pytest.mark.skipif(
+            "numba" not in kernels.BACKENDS, reason="numba is not installed"
+        ),
+    ),
+]
+SEEDS = (0, 1, 2, 3, 4)
+
+
+def _intervals(
+    seed: int, n_intervals: int = 2000
+) -> tp.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Seeded (groups, starts, ends) on a half-hour grid, so ties are common."""
+    rng = np.random.default_rng(seed)
+    groups = rng.integers(0, max(1, n_intervals // 8), size=n_intervals)
+    starts = rng.integers(14, 40, size=n_intervals) / 2.0
+    ends = starts + rng.integers(1, 6, size=n_intervals) / 2.0
+    return groups, starts, ends
+
+
+def _by_group(
+    groups: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> tp.Dict[int, tp.List[tp.Tuple[float, float]]]:
+    """The (start, end) intervals of each group, sorted by start."""
+    members: tp.Dict[int, tp.List[tp.Tuple[float, float]]] = {}
+    for group, start, end in zip(groups.tolist(), starts.tolist(), ends.tolist()):
+        members.setdefault(group, []).append((start, end))
+    return {group: sorted(intervals) for group, intervals in members.items()}
+
+
+def _overlap_hours(intervals: tp.List[tp.Tuple[float, float]]) -> float:
+    """Hours with more than one interval, per extra interval, between each pair
+    of consecutive boundaries.
+    """
+    bounds = sorted({bound for interval in intervals for bound in interval})
+    hours = 0.0
+    for low, high in zip(bounds, bounds[1:]):
+        depth = sum(1 for start, end in intervals if start <= low and high <= end)
+        hours += max(depth - 1, 0) * (high - low)
+    return hours
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch) -> str:
+    """Select a backend for the test, restoring the previous one afterwards."""
+    monkeypatch.setattr(kernels, "_ACTIVE", kernels.active())
+    kernels.set_backend(request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_detect_conflicts(backend: str, seed: int) -> None:
+    groups, starts, ends = _intervals(seed)
+    report = detect_conflicts(groups, starts, ends)
+    members = _by_group(groups, starts, ends)
+    assert report.conflicts == sum(map(count_conflicts, members.values()))
+    assert report.overlap_hours == pytest.approx(
+        sum(map(_overlap_hours, members.values()))
+    )
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_conflicts_per_owner(backend: str, seed: int) -> None:
+    groups, starts, ends = _intervals(seed)
+    owners = np.random.default_rng(seed).integers(0, 10, size=len(groups))
+    counts = conflicts_per_owner(owners, groups, starts, ends, 10)
+    for owner in range(10):
+        mask = owners == owner
+        members = _by_group(groups[mask], starts[mask], ends[mask])
+        assert counts[owner] == sum(map(count_conflicts, members.values()))
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Unknown or unavailable"):
+        kernels.set_backend("fortran")
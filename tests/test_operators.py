@@ -0,0 +1,94 @@
+"""
+The native variation operators must keep the subject of each position and only
+produce genes of the catalogue of valid assignments.
+"""
+
+import copy
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model.chromosome import Chromosome
+from model.compact import REPRESENTATIONS
+from model.igniters import ENROLLMENT_RANGE, generate_valid_assignments
+from model.operators import cx_uniform_subject, mut_resample_gene, mut_swap_slots
+from model.solver import Solver
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import generate_schedules
+from thesis_problem.data.subjects import SUBJECTS
+
+# Blocks of 1, 2 and 3 hours, so many slot swaps are valid
+SCHEDULES = sorted(
+    {schedule for size in (1, 2, 3) for schedule in generate_schedules(size)}
+)
+CATALOGUE = generate_valid_assignments(
+    SUBJECTS, PROFESSORS, CLASSROOMS, SCHEDULES, prune=False
+)
+
+
+def _chromosome(representation: str, rng: np.random.Generator) -> Chromosome:
+    genes = [
+        int(rng.choice(CATALOGUE.for_subject(subject.name))) for subject in SUBJECTS
+    ]
+    enrollments = rng.integers(
+        ENROLLMENT_RANGE[0], ENROLLMENT_RANGE[1] + 1, size=len(genes)
+    ).tolist()
+    return REPRESENTATIONS[representation].from_ids(CATALOGUE, genes, enrollments)
+
+
+def _assert_feasible_genes(chromosome: Chromosome) -> None:
+    genes = chromosome.decoded()
+    assert [gene.subject.name for gene in genes] == [s.name for s in SUBJECTS]
+    assert all(gene in CATALOGUE for gene in genes)
+
+
+def _enrollments(chromosome: Chromosome) -> tp.List[int]:
+    return [gene.expected_enrollment for gene in chromosome.decoded()]
+
+
+@pytest.mark.parametrize("representation", sorted(REPRESENTATIONS))
+@pytest.mark.parametrize("mutation", (mut_resample_gene, mut_swap_slots))
+def test_mutations_keep_subjects_and_catalogue_genes(
+    representation: str, mutation: tp.Callable[..., tp.Tuple[Chromosome]]
+) -> None:
+    rng = np.random.default_rng(0)
+    changed = 0
+    for _ in range(50):
+        chromosome = _chromosome(representation, rng)
+        before = chromosome.decoded()
+        (mutant,) = mutation(chromosome, CATALOGUE, 0.3, rng)
+        _assert_feasible_genes(mutant)
+        # The expected enrollments stay in their positions
+        assert _enrollments(mutant) == [gene.expected_enrollment for gene in before]
+        changed += mutant.decoded() != before
+    assert changed > 0
+
+
+@pytest.mark.parametrize("representation", sorted(REPRESENTATIONS))
+def test_uniform_crossover_exchanges_genes_of_the_same_subject(
+    representation: str,
+) -> None:
+    rng = np.random.default_rng(1)
+    exchanged = 0
+    for _ in range(50):
+        parents = (_chromosome(representation, rng), _chromosome(representation, rng))
+        genes = [parent.decoded() for parent in parents]
+        child1, child2 = cx_uniform_subject(
+            copy.deepcopy(parents[0]), copy.deepcopy(parents[1]), rng
+        )
+        _assert_feasible_genes(child1)
+        _assert_feasible_genes(child2)
+        # Each position keeps the pair of genes of the parents
+        for position, pair in enumerate(zip(*genes)):
+            assert sorted((child1[position], child2[position])) == sorted(pair)
+        exchanged += child1.decoded() != genes[0]
+    assert exchanged > 0
+
+
+@pytest.mark.parametrize("option, name", (("mutation", "flip"), ("crossover", "one")))
+def test_solver_rejects_unknown_operators(option: str, name: str) -> None:
+    options: tp.Dict[str, tp.Any] = {option: name}
+    with pytest.raises(ValueError, match=f"Unknown {option} '{name}'"):
+        Solver(10, 1, 0.1, **options)
@@ -0,0 +1,42 @@
+"""A run evaluated in a process pool must give the same result as in process."""
+
+import typing as tp
+import pytest
+
+# Local imports
+from model.sampling import AdaptiveSampling
+from model.solver import Solver
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import ALL_SCHEDULES
+from thesis_problem.data.subjects import SUBJECTS
+
+CONFIGURATIONS: tp.Dict[str, tp.Callable[[], tp.Dict[str, tp.Any]]] = {
+    "sampled": lambda: {},
+    "scenario_bank": lambda: {"scenario_bank": "generation"},
+    "adaptive_sampling": lambda: {"adaptive_sampling": AdaptiveSampling()},
+    "both": lambda: {
+        "scenario_bank": "generation",
+        "adaptive_sampling": AdaptiveSampling(),
+    },
+}
+
+
+def _solve(configuration: str, workers: tp.Optional[int]) -> Solver:
+    solver = Solver(
+        20, 5, 0.1, seed=5, workers=workers, **CONFIGURATIONS[configuration]()
+    )
+    solver.set_inputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES)
+    solver.solve()
+    return solver
+
+
+@pytest.mark.parametrize("configuration", sorted(CONFIGURATIONS))
+def test_workers_match_in_process_evaluation(configuration: str) -> None:
+    in_process = _solve(configuration, None)
+    pooled = _solve(configuration, 2)
+    assert pooled.objective_value_result == in_process.objective_value_result
+    assert sorted(ind.objective_value for ind in pooled.pareto_front) == sorted(
+        ind.objective_value for ind in in_process.pareto_front
+    )
+    assert pooled.evaluations == in_process.evaluations
@@ -0,0 +1,77 @@
+"""
+The batched plans of a stacked population must equal the plan of each
+individual, with classes of different lengths that partially overlap.
+"""
+
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model.chromosome import HARD_PENALTY_WEIGHT
+from model.compact import REPRESENTATIONS
+from model.engine import EvaluationPlan
+from model.igniters import ENROLLMENT_RANGE, generate_valid_assignments
+from model.population import population_plans, stack_population
+from model.types import Assignment
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import generate_schedules
+from thesis_problem.data.subjects import SUBJECTS
+
+# Blocks of 1, 2 and 3 hours, so the classes can partially overlap
+SCHEDULES = sorted(
+    {schedule for size in (1, 2, 3) for schedule in generate_schedules(size)}
+)
+CATALOGUE = generate_valid_assignments(
+    SUBJECTS, PROFESSORS, CLASSROOMS, SCHEDULES, prune=False
+)
+
+
+@pytest.mark.parametrize("representation", sorted(REPRESENTATIONS))
+@pytest.mark.parametrize("seed", (0, 1, 2))
+def test_population_plans_match_each_plan(representation: str, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    individuals = []
+    for _ in range(30):
+        genes = [
+            int(rng.choice(CATALOGUE.for_subject(subject.name))) for subject in SUBJECTS
+        ]
+        enrollments = rng.integers(
+            ENROLLMENT_RANGE[0], ENROLLMENT_RANGE[1] + 1, size=len(genes)
+        ).tolist()
+        individuals.append(
+            REPRESENTATIONS[representation].from_ids(CATALOGUE, genes, enrollments)
+        )
+    genes, enrollments = stack_population(individuals, CATALOGUE)
+    plans = population_plans(CATALOGUE, genes, enrollments, HARD_PENALTY_WEIGHT)
+    assert len(plans) == len(individuals)
+    for ind, plan in zip(individuals, plans):
+        expected = EvaluationPlan.from_encoded(ind.encode(), HARD_PENALTY_WEIGHT)
+        assert plan.hard_penalty == pytest.approx(expected.hard_penalty)
+        np.testing.assert_allclose(plan.weights, expected.weights, atol=1e-12)
+    # The population has blocks of every length and partial overlaps
+    assert {
+        asg.schedule.end - asg.schedule.start
+        for ind in individuals
+        for asg in ind.decoded()
+    } == {1.0, 2.0, 3.0}
+    assert any(_has_partial_overlap(ind.decoded()) for ind in individuals)
+
+
+def _has_partial_overlap(genes: tp.Sequence[Assignment]) -> bool:
+    """Two classes of a classroom or professor overlap in different slots."""
+    for i, first in enumerate(genes):
+        for second in genes[i + 1 :]:
+            if (
+                first.schedule.day == second.schedule.day
+                and first.schedule != second.schedule
+                and (
+                    first.classroom == second.classroom
+                    or first.professor == second.professor
+                )
+                and first.schedule.start < second.schedule.end
+                and second.schedule.start < first.schedule.end
+            ):
+                return True
+    return False
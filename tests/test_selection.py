@@ -0,0 +1,100 @@
+"""
+The NumPy non-dominated sorting must select exactly as DEAP: the same fronts,
+in the same order, with the same crowding distances, even when many
+individuals share their objective values.
+"""
+
+import typing as tp
+import numpy as np
+import pytest
+from deap import base, tools
+
+# Local imports
+from model.selection import sel_nsga2, sort_nondominated
+
+
+class _Fitness(base.Fitness):
+    weights = (-1.0, -1.0, -1.0)
+
+
+class _Individual(list):
+    """An individual identified by its position in the population."""
+
+    def __init__(self, position: int, values: tp.Tuple[float, ...]):
+        super().__init__([position])
+        self.fitness = _Fitness(values)
+
+
+def _population(rng: np.random.Generator, ties: bool) -> tp.List[_Individual]:
+    """A random population. With `ties`, the objectives take a few integer
+    levels, so many individuals are equal or equal in some objective.
+    """
+    size = int(rng.integers(1, 120))
+    if ties:
+        levels = int(rng.integers(1, 6))
+        values = rng.integers(0, levels, size=(size, 3)).astype(np.float64)
+    else:
+        values = rng.random((size, 3))
+    return [
+        _Individual(position, tuple(row.tolist()))
+        for position, row in enumerate(values)
+    ]
+
+
+def _crowding(population: tp.List[_Individual]) -> tp.List[tp.Optional[float]]:
+    """Take the crowding distances left by a selection on the individuals."""
+    distances = []
+    for ind in population:
+        distances.append(getattr(ind.fitness, "crowding_dist", None))
+        ind.fitness.__dict__.pop("crowding_dist", None)
+    return distances
+
+
+def _positions(individuals: tp.Iterable[_Individual]) -> tp.List[int]:
+    return [ind[0] for ind in individuals]
+
+
+@pytest.mark.parametrize("ties", (True, False))
+@pytest.mark.parametrize("seed", range(5))
+def test_sel_nsga2_matches_deap(ties: bool, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    for _ in range(40):
+        population = _population(rng, ties)
+        k = int(rng.integers(1, len(population) + 1))
+        expected = _positions(tools.selNSGA2(population, k))
+        expected_crowding = _crowding(population)
+        assert _positions(sel_nsga2(population, k)) == expected
+        assert _crowding(population) == expected_crowding
+
+
+@pytest.mark.parametrize("first_front_only", (True, False))
+@pytest.mark.parametrize("seed", range(5))
+def test_sort_nondominated_matches_deap(first_front_only: bool, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    for _ in range(40):
+        population = _population(rng, ties=True)
+        k = int(rng.integers(1, len(population) + 1))
+        expected = tools.sortNondominated(population, k, first_front_only)
+        fronts = sort_nondominated(population, k, first_front_only)
+        assert [_positions(front) for front in fronts] == [
+            _positions(front) for front in expected
+        ]
+
+
+@pytest.mark.parametrize("ties", (True, False))
+def test_sel_nsga2_matches_deap_across_blocks(ties: bool) -> None:
+    """A population larger than the blocks of the dominance matrix."""
+    rng = np.random.default_rng(7)
+    values = (
+        rng.integers(0, 8, size=(1500, 3)).astype(np.float64)
+        if ties
+        else rng.random((1500, 3))
+    )
+    population = [
+        _Individual(position, tuple(row.tolist()))
+        for position, row in enumerate(values)
+    ]
+    expected = _positions(tools.selNSGA2(population, 750))
+    expected_crowding = _crowding(population)
+    assert _positions(sel_nsga2(population, 750)) == expected
+    assert _crowding(population) == expected_crowding
@@ -0,0 +1,43 @@
+"""Telemetry of a Solver run resumed from a checkpoint."""
+
+import csv
+import json
+import typing as tp
+
+# Local imports
+from model.solver import Solver
+from model.telemetry import CsvSink, JsonlSink, MemorySink, Telemetry
+from thesis_problem.data.classrooms import CLASSROOMS
+from thesis_problem.data.professors import PROFESSORS
+from thesis_problem.data.schedules import ALL_SCHEDULES
+from thesis_problem.data.subjects import SUBJECTS
+
+
+def _solver(telemetry: Telemetry, **kwargs: tp.Any) -> Solver:
+    solver = Solver(20, 12, 0.1, seed=3, telemetry=telemetry, **kwargs)
+    solver.set_inputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES)
+    return solver
+
+
+def test_resume_rewrites_the_generations_after_the_checkpoint(tmp_path) -> None:
+    checkpoint = str(tmp_path / "run.npz")
+    jsonl, csv_path = str(tmp_path / "run.jsonl"), str(tmp_path / "run.csv")
+    memory = MemorySink()
+    sinks = [memory, JsonlSink(jsonl), CsvSink(csv_path)]
+    # The run goes past the checkpoint of the generation 10 before stopping
+    _solver(Telemetry(sinks), checkpoint_path=checkpoint).solve()
+    # A new process resumes it with a telemetry without reference point
+    _solver(Telemetry(sinks)).resume(checkpoint)
+    expected = list(range(13))
+    assert [metrics.generation for metrics in memory.records] == expected
+    with open(jsonl, encoding="utf-8") as file:
+        assert [json.loads(line)["generation"] for line in file] == expected
+    with open(csv_path, encoding="utf-8", newline="") as file:
+        assert [int(row["generation"]) for row in csv.DictReader(file)] == expected
+    # The hypervolumes after the checkpoint are measured with the reference
+    # point of the original run
+    straight = MemorySink()
+    _solver(Telemetry([straight])).solve()
+    assert [metrics.hypervolume for metrics in memory.records] == [
+        metrics.hypervolume for metrics in straight.records
+    ]
@@ -0,0 +1,113 @@
+"""Exact values of the hypervolume and of the stagnation of a few small fronts."""
+
+import itertools
+import json
+import typing as tp
+import numpy as np
+import pytest
+
+# Local imports
+from model.termination import (
+    HypervolumeStagnation,
+    RunState,
+    TimeBudget,
+    hypervolume,
+)
+
+REFERENCE = np.ones(3)
+
+
+def _union_volume(front: np.ndarray, reference: np.ndarray) -> float:
+    """Hypervolume by inclusion-exclusion over the boxes of the points."""
+    points = [point for point in front if (point < reference).all()]
+    volume = 0.0
+    for size in range(1, len(points) + 1):
+        for subset in itertools.combinations(points, size):
+            corner = np.max(subset, axis=0)
+            volume += (-1) ** (size + 1) * float(np.prod(reference - corner))
+    return volume
+
+
+@pytest.mark.parametrize(
+    "front, expected",
+    (
+        ([[0.0, 0.0, 0.0]], 1.0),
+        ([[0.5, 0.5, 0.5]], 0.125),
+        ([[0.0, 0.5, 0.5], [0.5, 0.0, 0.5]], 0.375),
+        ([[0.0, 0.0, 0.5], [0.5, 0.5, 0.0]], 0.625),
+        # Dominated points and points beyond the reference add nothing
+        ([[0.5, 0.5, 0.5], [0.75, 0.5, 0.5], [2.0, 0.0, 0.0]], 0.125),
+        ([[1.0, 0.0, 0.0]], 0.0),
+    ),
+)
+def test_hypervolume_of_small_fronts(
+    front: tp.List[tp.List[float]], expected: float
+) -> None:
+    assert hypervolume(np.array(front), REFERENCE) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_hypervolume_matches_inclusion_exclusion(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    for _ in range(20):
+        front = rng.random((int(rng.integers(1, 8)), 3)) * 1.2
+        assert hypervolume(front, REFERENCE) == pytest.approx(
+            _union_volume(front, REFERENCE)
+        )
+
+
+def _state(generation: int, front: tp.List[tp.List[float]]) -> RunState:
+    return RunState(generation, 0, np.array(front, dtype=np.float64))
+
+
+def test_stagnation_stops_after_the_window() -> None:
+    criterion = HypervolumeStagnation(window=3, tolerance=0.05)
+    front = [[0.0, 1.0, 1.0], [1.0, 0.0, 0.0]]
+    assert [criterion.should_stop(_state(gen, front)) for gen in range(5)] == [
+        False,
+        False,
+        False,
+        True,
+        True,
+    ]
+
+
+def test_stagnation_compares_with_the_anchor() -> None:
+    # A single point is normalized by its own magnitude: the anchor is the origin
+    # of the box, with a hypervolume of 1.1 ** 3 up to the reference
+    criterion = HypervolumeStagnation(window=2, tolerance=0.05)
+    assert not criterion.should_stop(_state(0, [[10.0, 10.0, 10.0]]))
+    assert criterion.get_state() == {
+        "generation": 0,
+        "low": [10.0, 10.0, 10.0],
+        "span": [10.0, 10.0, 10.0],
+        "volume": pytest.approx(1.331),
+    }
+    # 1.11 * 1.1 * 1.1 - 1.331 = 0.0121 is below the tolerance
+    assert not criterion.should_stop(_state(1, [[9.9, 10.0, 10.0]]))
+    # The improvements add up against the anchor: 1.15 * 1.21 - 1.331 = 0.0605
+    assert not criterion.should_stop(_state(2, [[9.5, 10.0, 10.0]]))
+    assert criterion.get_state()["generation"] == 2
+    assert not criterion.should_stop(_state(3, [[9.5, 10.0, 10.0]]))
+    assert criterion.should_stop(_state(4, [[9.5, 10.0, 10.0]]))
+
+
+def test_stagnation_state_round_trip() -> None:
+    rng = np.random.default_rng(0)
+    fronts = [rng.random((5, 3)) * (20 - gen) for gen in range(20)]
+    criterion = HypervolumeStagnation(window=4, tolerance=0.2)
+    for gen in range(10):
+        criterion.should_stop(RunState(gen, 0, fronts[gen]))
+    restored = HypervolumeStagnation(window=4, tolerance=0.2)
+    restored.set_state(json.loads(json.dumps(criterion.get_state())))
+    for gen in range(10, 20):
+        state = RunState(gen, 0, fronts[gen])
+        assert restored.should_stop(state) == criterion.should_stop(state)
+
+
+def test_time_budget_keeps_the_elapsed_time() -> None:
+    criterion = TimeBudget(60.0)
+    criterion.set_state({"elapsed": 59.9})
+    assert criterion.get_state()["elapsed"] >= 59.9
+    criterion.set_state({"elapsed": 60.0})
+    assert criterion.should_stop(_state(0, [[0.0, 0.0, 0.0]]))
@@ -1,7 +1,13 @@
 """Run the thesis scenario into the solver"""
 
-import numpy as np
-from model.solver import Solver
+import argparse
+from model.experiments import (
+    ExperimentConfig,
+    ExperimentRunner,
+    ProblemInputs,
+    ReplicaResult,
+)
+from model.islands import IslandModel
 # from model.utils import print_calendar_view, to_latex_table
 
 # Local imports
@@ -11,41 +17,81 @@ from thesis_problem.data.classrooms import CLASSROOMS
 from thesis_problem.data.schedules import ALL_SCHEDULES
 
 
-def __get_mean(data: list[tuple[float, float, float]]) -> float:
-    return np.mean([x[0] for x in data])  # type: ignore
+def __parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the thesis scenario into the solver"
+    )
+    parser.add_argument(
+        "--experiments", type=int, default=30, help="Number of independent runs"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes (all CPUs by default)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Base seed of the batch")
+    parser.add_argument(
+        "--results", default=None, help="JSONL file where each run is streamed"
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Skip the runs stored in the results file"
+    )
+    parser.add_argument(
+        "--islands",
+        type=int,
+        default=None,
+        help="Run a single island model with this number of islands instead",
+    )
+    parser.add_argument(
+        "--topology", default="ring", help="Migration topology of the islands"
+    )
+    return parser.parse_args()
 
 
-def __get_std(data: list[tuple[float, float, float]]) -> float:
-    return np.std([x[0] for x in data])  # type: ignore
+def __report(result: ReplicaResult) -> None:
+    print(
+        f"Experiment {result.replica + 1} finished in {result.elapsed:.1f}s."
+        + f" Objective value: {result.objective_value}"
+    )
 
 
 if __name__ == "__main__":
-    solutions = []
-    valid_solutions: int = 0
+    args = __parse_args()
+    if args.islands is not None:
+        # Evolve the islands in parallel, exchanging their elite individuals
+        model = IslandModel(
+            ExperimentConfig(
+                population_size=50, max_generations=200, mutation_rate=0.1
+            ),
+            ProblemInputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES),
+            args.islands,
+            topology=args.topology,
+        )
+        island_result = model.run(seed=args.seed)
+        print(
+            f"Island model finished in {island_result.elapsed:.1f}s."
+            + f" Objective value: {island_result.objective_value}"
+        )
+        raise SystemExit(0)
     # Repeat the experiment 30 times to have a good statistical analysis
-    for i in range(0, 30):
-        print(f"Running experiment {i + 1}...")
-        # Step 1: Initialize the solver with parameters
-        solver = Solver(population_size=50, max_generations=200, mutation_rate=0.1)
-        # Step 2: Add the data from the Thesis problem
-        solver.set_inputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES)
-        # Step 3: Run the solver
-        solver.solve(verbose=False)
-        # Step 4: Get and process the results
-        result = solver.results()
-        # Append the objective result to the solutions list
-        solutions.append(solver.objective_value_result)
-        # Check if the solution is valid
-        if all(x < 1e9 for x in solutions[-1]):
-            valid_solutions += 1
-        # print("Final Pareto Front")
-        # print_calendar_view(result)
-        # print("\n")
-        # print(to_latex_table(result))
+    runner = ExperimentRunner(
+        ExperimentConfig(population_size=50, max_generations=200, mutation_rate=0.1),
+        ProblemInputs(SUBJECTS, CLASSROOMS, PROFESSORS, ALL_SCHEDULES),
+        workers=args.workers,
+        results_path=args.results,
+    )
+    summary = runner.run(
+        args.experiments, base_seed=args.seed, resume=args.resume, on_result=__report
+    )
+    # print("Final Pareto Front")
+    # print_calendar_view(result)
+    # print("\n")
+    # print(to_latex_table(result))
     # Print the mean and standard deviation of the objective values
-    print(f"Mean: {__get_mean(solutions)}")
-    print(f"Std: {__get_std(solutions)}")
+    print(f"Mean: {summary.mean[0]}")
+    print(f"Std: {summary.std[0]}")
     # Print the number of valid solutions
-    print(f"Valid solutions: {valid_solutions}")
+    print(f"Valid solutions: {summary.valid_solutions}")
     # Print the number of invalid solutions
-    print(f"Invalid solutions: {30 - valid_solutions}")
+    print(f"Invalid solutions: {summary.invalid_solutions}")
@@ -0,0 +1,250 @@
+"""Benchmark the model over synthetic instances of growing scale.
+
+Each stage is timed `repeat` times on the same seeded instance and population,
+and the results are appended to a JSONL file with the commit they were measured
+on, so a later run can be compared against them with `--baseline`:
+
+    python -m thesis_problem.benchmark --scales 1 10 --output bench.jsonl
+    python -m thesis_problem.benchmark --scales 1 10 --baseline bench.jsonl
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import typing as tp
+import numpy as np
+from deap import base
+
+# Local imports
+from model.experiments import ProblemInputs
+from model.igniters import (
+    evaluator_generator,
+    generate_valid_assignments,
+    individuals_generator,
+)
+from model.solver import Solver
+from thesis_problem.data.synthetic import SyntheticConfig, generate_instance
+
+# Stages of the benchmark, in the order they run
+STAGES = (
+    "generate_valid_assignments",
+    "generate_individuals",
+    "objective_value",
+    "solve",
+)
+
+
+class BenchmarkResult(tp.NamedTuple):
+    """Timings of a stage at one scale."""
+
+    scale: float
+    classroom_scale: float
+    stage: str
+    # Size of the instance
+    subjects: int
+    assignments: int
+    # Seconds of each repetition
+    times: tp.List[float]
+    commit: str
+
+    @property
+    def median(self) -> float:
+        """Median time of the repetitions."""
+        return statistics.median(self.times)
+
+    def to_json(self) -> str:
+        """Dump the result as a line of the results file."""
+        return json.dumps(
+            dict(
+                self._asdict(),
+                median=self.median,
+                python=platform.python_version(),
+                numpy=np.__version__,
+            )
+        )
+
+
+def _commit() -> str:
+    """The current git commit, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _timed(func: tp.Callable[[], tp.Any], repeat: int) -> tp.List[float]:
+    """Seconds of each call to `func`."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def benchmark_scale(  # pylint: disable=R0913
+    inputs: ProblemInputs,
+    *,
+    repeat: int = 3,
+    population_size: int = 50,
+    generations: int = 5,
+    seed: int = 0,
+    stages: tp.Sequence[str] = STAGES,
+) -> tp.Dict[str, tp.Tuple[tp.List[float], int]]:
+    """Time the stages of the model on one instance.
+
+    Args:
+        inputs: The instance.
+        repeat: Repetitions of each stage.
+        population_size: Individuals generated and evaluated, and population of
+            the Solver.
+        generations: Generations of the Solver.
+        seed: Seed of the individuals and the Solver.
+        stages: The stages to time (see `STAGES`).
+
+    Returns:
+        dict: The times of each stage and the number of assignments.
+    """
+    subjects, classrooms, professors, schedules = inputs
+    catalogue = generate_valid_assignments(subjects, professors, classrooms, schedules)
+    results: tp.Dict[str, tp.Tuple[tp.List[float], int]] = {}
+    if "generate_valid_assignments" in stages:
+        results["generate_valid_assignments"] = (
+            _timed(
+                lambda: generate_valid_assignments(
+                    subjects, professors, classrooms, schedules
+                ),
+                repeat,
+            ),
+            len(catalogue),
+        )
+    toolbox = base.Toolbox()
+    evaluator_generator(toolbox, 0.3, np.random.default_rng(seed))
+    individuals_generator(subjects, catalogue, toolbox, np.random.default_rng(seed))
+    if "generate_individuals" in stages:
+        results["generate_individuals"] = (
+            _timed(lambda: toolbox.population(n=population_size), repeat),  # type: ignore
+            len(catalogue),
+        )
+    if "objective_value" in stages:
+        population = toolbox.population(n=population_size)  # type: ignore
+
+        def evaluate_all() -> None:
+            for ind in population:
+                ind.invalidate()
+                ind.objective_value  # pylint: disable=W0104
+
+        results["objective_value"] = (_timed(evaluate_all, repeat), len(catalogue))
+    if "solve" in stages:
+
+        def solve() -> None:
+            solver = Solver(population_size, generations, 0.1, seed=seed)
+            solver.set_inputs(subjects, classrooms, professors, schedules)
+            solver.solve()
+
+        results["solve"] = (_timed(solve, repeat), len(catalogue))
+    return results
+
+
+def __parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the model over synthetic instances of growing scale."
+    )
+    parser.add_argument(
+        "--scales",
+        type=float,
+        nargs="+",
+        default=[1.0, 10.0],
+        help="Scales of the instances, relative to the thesis data",
+    )
+    parser.add_argument(
+        "--classroom-scale",
+        type=float,
+        default=None,
+        help="Scale of the classrooms (the instance scale by default)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Repetitions of each stage"
+    )
+    parser.add_argument(
+        "--population", type=int, default=50, help="Individuals of each stage"
+    )
+    parser.add_argument(
+        "--generations", type=int, default=5, help="Generations of the Solver stage"
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        default=list(STAGES),
+        choices=STAGES,
+        help="Stages to time",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the instances")
+    parser.add_argument(
+        "--output", default=None, help="JSONL file to append the results"
+    )
+    parser.add_argument(
+        "--baseline", default=None, help="JSONL file with results to compare against"
+    )
+    return parser.parse_args()
+
+
+def __load_baseline(path: str) -> tp.Dict[tp.Tuple[float, float, str], float]:
+    """Median time of each (scale, classroom scale, stage) of a results file,
+    keeping the last measure of each one.
+    """
+    baseline = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            key = (record["scale"], record["classroom_scale"], record["stage"])
+            baseline[key] = record["median"]
+    return baseline
+
+
+if __name__ == "__main__":
+    args = __parse_args()
+    commit = _commit()
+    baseline = {} if args.baseline is None else __load_baseline(args.baseline)
+    for scale in args.scales:
+        classroom_scale = (
+            scale if args.classroom_scale is None else args.classroom_scale
+        )
+        config = SyntheticConfig(seed=args.seed).scaled(scale, classroom_scale)
+        timings = benchmark_scale(
+            generate_instance(config),
+            repeat=args.repeat,
+            population_size=args.population,
+            generations=args.generations,
+            seed=args.seed,
+            stages=args.stages,
+        )
+        for stage, (times, assignments) in timings.items():
+            result = BenchmarkResult(
+                scale,
+                classroom_scale,
+                stage,
+                config.subjects,
+                assignments,
+                times,
+                commit,
+            )
+            line = (
+                f"scale {scale:g} ({assignments} assignments) {stage}:"
+                + f" {result.median:.4f}s"
+            )
+            reference = baseline.get((scale, classroom_scale, stage))
+            if reference:
+                line += f" ({reference / result.median:.2f}x vs baseline)"
+            print(line)
+            if args.output is not None:
+                with open(args.output, "a", encoding="utf-8") as file:
+                    file.write(result.to_json() + "\n")
@@ -107,5 +107,6 @@ for i in range(1, 3):
     )
     CLASSROOMS.add(classroom)
 
-# At the very end, convert the classrooms to a tuple
-CLASSROOMS: tuple[Classroom] = tuple(CLASSROOMS)  # type: ignore
+# At the very end, convert the classrooms to a tuple.
+# Sort them by name, since the order of a set changes between runs.
+CLASSROOMS: tuple[Classroom] = tuple(sorted(CLASSROOMS, key=lambda room: room.name))  # type: ignore
@@ -0,0 +1,195 @@
+"""
+Generate synthetic instances of the problem, to measure the performance of the
+model at larger scales than the thesis data.
+
+An instance is fully determined by its `SyntheticConfig` (including the seed),
+so the same configuration always gives the same subjects, professors and
+classrooms, and the timings of different commits can be compared.
+"""
+
+import math
+import typing as tp
+from dataclasses import dataclass, replace
+import numpy as np
+
+# Local imports
+from model.experiments import ProblemInputs
+from model.types import Classroom, Professor, Schedule, Subject, SubjectType
+from thesis_problem.data.schedules import generate_schedules
+
+# Opening hours of the campus
+DAY_START = 7.0
+DAY_END = 22.0
+DAYS = (1, 2, 3, 4, 5)
+# Probability of each subject type
+SUBJECT_TYPES = (SubjectType.THEORY, SubjectType.LABORATORY, SubjectType.MIX)
+SUBJECT_TYPE_WEIGHTS = (0.5, 0.2, 0.3)
+# Capacities of the classrooms. All of them can host some enrollment of
+# `model.igniters.ENROLLMENT_RANGE` without wasting more than half of the room.
+THEORY_CAPACITIES = (25, 30, 40)
+LABORATORY_CAPACITIES = (20, 25)
+
+
+@dataclass(slots=True, frozen=True)
+class SyntheticConfig:
+    """Size and density of a synthetic instance. The defaults match the scale
+    of the thesis data.
+    """
+
+    subjects: int = 27
+    professors: int = 18
+    classrooms: int = 20
+    # Fraction of the days a professor is available, and of the hours of
+    # each of those days
+    availability_density: float = 0.6
+    # Hours of each block of the schedules grid
+    block_size: int = 2
+    # Number of subjects each professor can teach
+    subjects_per_professor: int = 3
+    # Fraction of laboratories among the classrooms
+    laboratory_fraction: float = 0.2
+    seed: int = 0
+
+    def scaled(
+        self, factor: float, classroom_factor: tp.Optional[float] = None
+    ) -> "SyntheticConfig":
+        """The same instance with `factor` times the subjects and professors.
+
+        Args:
+            factor: Scale of the subjects and professors.
+            classroom_factor: Scale of the classrooms, `factor` by default. As
+                every subject can use every suitable classroom, the catalogue of
+                assignments grows with the product of both scales.
+        """
+        if classroom_factor is None:
+            classroom_factor = factor
+        return replace(
+            self,
+            subjects=max(1, round(self.subjects * factor)),
+            professors=max(1, round(self.professors * factor)),
+            classrooms=max(1, round(self.classrooms * classroom_factor)),
+        )
+
+
+def _classrooms(
+    config: SyntheticConfig, rng: np.random.Generator
+) -> tp.List[Classroom]:
+    """The theory classrooms and laboratories. There is at least one of each."""
+    n_laboratories = min(
+        max(1, round(config.classrooms * config.laboratory_fraction)),
+        max(1, config.classrooms - 1),
+    )
+    classrooms = []
+    for idx in range(config.classrooms):
+        laboratory = idx < n_laboratories
+        capacities = LABORATORY_CAPACITIES if laboratory else THEORY_CAPACITIES
+        classrooms.append(
+            Classroom(
+                name=f"Laboratorio {idx + 1}" if laboratory else f"Salón {idx + 1}",
+                capacity=int(rng.choice(capacities)),
+                start_hour=DAY_START,
+                end_hour=DAY_END,
+                type=SubjectType.LABORATORY if laboratory else SubjectType.THEORY,
+            )
+        )
+    return classrooms
+
+
+def _subjects(
+    config: SyntheticConfig,
+    classrooms: tp.Sequence[Classroom],
+    rng: np.random.Generator,
+) -> tp.List[Subject]:
+    """The subjects, with a preferred classroom of a compatible type."""
+    types = rng.choice(len(SUBJECT_TYPES), size=config.subjects, p=SUBJECT_TYPE_WEIGHTS)
+    subjects = []
+    for idx, type_idx in enumerate(types.tolist()):
+        subject_type = SUBJECT_TYPES[type_idx]
+        preferred = [
+            room.name
+            for room in classrooms
+            if subject_type == SubjectType.MIX or room.type == subject_type
+        ]
+        subjects.append(
+            Subject(
+                name=f"Materia {idx + 1}",
+                hours=float(rng.choice((3.0, 4.5))),
+                type=subject_type,
+                preffered_classroom=str(rng.choice(preferred)),
+            )
+        )
+    return subjects
+
+
+def _availability(
+    config: SyntheticConfig, rng: np.random.Generator
+) -> tp.Tuple[Schedule, ...]:
+    """Available windows of a professor: a window aligned to the blocks on each
+    available day, with at least one available day.
+    """
+    days = [day for day in DAYS if rng.random() < config.availability_density]
+    if not days:
+        days = [int(rng.choice(DAYS))]
+    n_blocks = int((DAY_END - DAY_START) // config.block_size)
+    window = max(1, math.ceil(n_blocks * config.availability_density))
+    schedules = []
+    for day in days:
+        first = int(rng.integers(0, n_blocks - window + 1))
+        start = DAY_START + first * config.block_size
+        schedules.append(
+            Schedule(day=day, start=start, end=start + window * config.block_size)
+        )
+    return tuple(schedules)
+
+
+def _professors(
+    config: SyntheticConfig, subjects: tp.Sequence[Subject], rng: np.random.Generator
+) -> tp.List[Professor]:
+    """The professors. Every subject is taught by at least one of them."""
+    teaches: tp.List[tp.Set[str]] = [set() for _ in range(config.professors)]
+    # Spread the subjects first, so none is left without a professor
+    for idx, subject in enumerate(subjects):
+        teaches[idx % config.professors].add(subject.name)
+    for subjects_of_professor in teaches:
+        missing = config.subjects_per_professor - len(subjects_of_professor)
+        if missing > 0:
+            picks = rng.choice(
+                len(subjects), size=min(missing, len(subjects)), replace=False
+            )
+            subjects_of_professor.update(subjects[pick].name for pick in picks.tolist())
+    return [
+        Professor(
+            name=f"Prof. {idx + 1}",
+            subjects=tuple(sorted(subjects_of_professor)),
+            schedules=_availability(config, rng),
+            max_hours_per_week=12,
+        )
+        for idx, subjects_of_professor in enumerate(teaches)
+    ]
+
+
+def generate_instance(config: SyntheticConfig = SyntheticConfig()) -> ProblemInputs:
+    """Generate a synthetic instance of the problem.
+
+    Args:
+        config: The size, density and seed of the instance.
+
+    Returns:
+        ProblemInputs: The subjects, classrooms, professors and schedules.
+    """
+    if min(config.subjects, config.professors, config.classrooms) <= 0:
+        raise ValueError("The instance needs subjects, professors and classrooms")
+    if not 0.0 < config.availability_density <= 1.0:
+        raise ValueError("The availability density must be between 0 and 1")
+    if not 0 < config.block_size <= DAY_END - DAY_START:
+        raise ValueError("The block size must fit in a day")
+    rng = np.random.default_rng(config.seed)
+    classrooms = _classrooms(config, rng)
+    subjects = _subjects(config, classrooms, rng)
+    professors = _professors(config, subjects, rng)
+    return ProblemInputs(
+        subjects=tuple(subjects),
+        classrooms=tuple(classrooms),
+        professors=tuple(professors),
+        schedules=tuple(generate_schedules(config.block_size)),
+    )